@@ -0,0 +1,160 @@
+"""
+Compressed transfer negotiation and per-endpoint bandwidth accounting
+"""
+
+import importlib.util
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+from urllib3.exceptions import DecodeError, ProtocolError, ReadTimeoutError, SSLError
+
+from clock import Clock, SystemClock
+from transport import TransportResponse
+
+logger = logging.getLogger(__name__)
+
+# Known Zuvio endpoints by URL path prefix
+ENDPOINTS = [
+    ('/irs/submitLogin', 'login'),
+    ('/course/listStudentCurrentCourses', 'courses'),
+    ('/student5/irs/rollcall/', 'rollcall'),
+    ('/app_v2/makeRollcall', 'checkin'),
+]
+
+
+def accept_encoding() -> str:
+    """Get the Accept-Encoding value for the decoders available to urllib3"""
+    encodings = ['gzip', 'deflate']
+    if importlib.util.find_spec('brotli') or importlib.util.find_spec('brotlicffi'):
+        encodings.append('br')
+    return ', '.join(encodings)
+
+
+def endpoint_name(url: str) -> str:
+    """Map a request URL to a stable endpoint name"""
+    path = urlparse(url).path
+    for prefix, name in ENDPOINTS:
+        if path.startswith(prefix):
+            return name
+    return re.sub(r'/\d+', '/{id}', path) or '/'
+
+
+@dataclass
+class EndpointUsage:
+    """Traffic counters for one endpoint"""
+    requests: int = 0
+    wire_bytes: int = 0
+    decoded_bytes: int = 0
+
+    @property
+    def ratio(self) -> float:
+        """Get decoded bytes per byte on the wire"""
+        return self.decoded_bytes / self.wire_bytes if self.wire_bytes else 0.0
+
+
+class BandwidthMeter:
+    """Count response body bytes on the wire versus decoded, per endpoint and day
+
+    Attach it to a requests session or a transport.Transport; the previous
+    day's report is logged the first time a response arrives on a new day.
+    """
+
+    def __init__(self, clock: Optional[Clock] = None):
+        self.clock = clock or SystemClock()
+        self.days: Dict[date, Dict[str, EndpointUsage]] = {}
+        self._current_day: Optional[date] = None
+        self._lock = threading.Lock()
+
+    def attach(self, session) -> None:
+        """Negotiate compression and count every response of a session
+
+        requests sessions and the transports in transport.py expose
+        response hooks; anything else is not counted.
+        """
+        session.headers['Accept-Encoding'] = accept_encoding()
+        if hasattr(session, 'hooks'):
+            session.hooks['response'].append(self._on_response)
+        else:
+            logger.warning(f"{type(session).__name__} 不支援回應掛鉤，頻寬統計已停用")
+
+    def _on_response(self, response, *args, **kwargs):
+        raw = getattr(response, 'raw', None)
+        if not getattr(response, '_content_consumed', True) and hasattr(raw, 'tell'):
+            # Read through urllib3 directly: its streaming path does not count
+            # chunked bodies, while read() tracks every byte pulled off the wire
+            response._content = self._read_body(raw)
+            response._content_consumed = True
+            wire_bytes = raw.tell()
+        else:
+            # Reported by the httpx and aiohttp transports
+            wire_bytes = response.wire_bytes if isinstance(response, TransportResponse) else None
+        content = response.content or b''
+        if not wire_bytes:
+            length = response.headers.get('Content-Length')
+            wire_bytes = int(length) if length and str(length).isdigit() else len(content)
+        self.record(endpoint_name(response.url), wire_bytes, len(content))
+        return response
+
+    @staticmethod
+    def _read_body(raw) -> bytes:
+        # Translate urllib3 errors the same way requests does when it reads a body
+        try:
+            return raw.read(decode_content=True) or b''
+        except ProtocolError as e:
+            raise requests.exceptions.ChunkedEncodingError(e)
+        except DecodeError as e:
+            raise requests.exceptions.ContentDecodingError(e)
+        except ReadTimeoutError as e:
+            raise requests.exceptions.ConnectionError(e)
+        except SSLError as e:
+            raise requests.exceptions.SSLError(e)
+
+    def record(self, endpoint: str, wire_bytes: int, decoded_bytes: int) -> None:
+        """Add one response to today's counters"""
+        today = self.clock.now().date()
+        with self._lock:
+            previous = self._current_day
+            self._current_day = today
+            usage = self.days.setdefault(today, {}).setdefault(endpoint, EndpointUsage())
+            usage.requests += 1
+            usage.wire_bytes += wire_bytes
+            usage.decoded_bytes += decoded_bytes
+        if previous and previous != today:
+            logger.info("\n" + self.report(previous))
+
+    def totals(self, day: date) -> EndpointUsage:
+        """Get the combined counters of all endpoints for a day"""
+        total = EndpointUsage()
+        with self._lock:
+            for usage in self.days.get(day, {}).values():
+                total.requests += usage.requests
+                total.wire_bytes += usage.wire_bytes
+                total.decoded_bytes += usage.decoded_bytes
+        return total
+
+    def report(self, day: Optional[date] = None) -> str:
+        """Format the bandwidth report for a day (today by default)"""
+        day = day or self.clock.now().date()
+        with self._lock:
+            usages = dict(self.days.get(day, {}))
+        lines: List[str] = [
+            f"頻寬使用報告 {day.isoformat()}",
+            f"{'endpoint':<12} {'requests':>9} {'wire(B)':>12} {'decoded(B)':>12} {'ratio':>6}",
+        ]
+        for endpoint, usage in sorted(usages.items()):
+            lines.append(
+                f"{endpoint:<12} {usage.requests:>9} {usage.wire_bytes:>12} "
+                f"{usage.decoded_bytes:>12} {usage.ratio:>6.1f}"
+            )
+        total = self.totals(day)
+        lines.append(
+            f"{'total':<12} {total.requests:>9} {total.wire_bytes:>12} "
+            f"{total.decoded_bytes:>12} {total.ratio:>6.1f}"
+        )
+        return "\n".join(lines)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Fault-injection benchmark scenarios for ZuvioAutoChecker
+
+Runs the real check-in loop against the local stub server once per fault
+profile and reports request volume and detection latency (seconds from
+a rollcall opening to the server accepting the check-in).
+"""
+
+import argparse
+import contextlib
+import logging
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+# Add parent directory to path to import main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import CourseService, Location, UserCredentials, ZuvioAutoChecker
+from scheduler import UniformPollScheduler
+from stub_server import PROFILES, FaultProfile, StubZuvioServer, make_courses
+
+
+@dataclass
+class ScenarioResult:
+    """Outcome of running the checker against one fault profile"""
+    profile: str
+    requests: Dict[str, int]
+    faults: Dict[str, int]
+    rollcalls: int
+    latencies: List[float] = field(default_factory=list)
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+    @property
+    def missed(self) -> int:
+        return self.rollcalls - len(self.latencies)
+
+
+def run_scenario(profile: FaultProfile, courses: int = 5, duration: float = 20.0,
+                 poll_min: float = 0.2, poll_max: float = 0.5, timeout: float = 2.0,
+                 rollcall_length: float = 3.0, seed: int = 0) -> ScenarioResult:
+    """Run the check-in loop for `duration` seconds against a stub with the given profile"""
+    stub = StubZuvioServer(make_courses(courses), profile, seed=seed)
+    spacing = max(0.0, duration - rollcall_length - 2) / max(1, courses)
+    for index, course in enumerate(stub.courses):
+        stub.schedule_rollcall(course['course_id'], 1 + index * spacing, rollcall_length)
+
+    stub.start()
+    try:
+        scheduler = UniformPollScheduler(poll_min, poll_max, rng=random.Random(seed))
+        checker = ZuvioAutoChecker(scheduler=scheduler, base_url=stub.base_url)
+        checker.auth_service.timeout = timeout
+        auth_token = checker.auth_service.login(UserCredentials("bench@example.com", "bench"))
+        checker.course_service = CourseService(
+            checker.auth_service.session, base_url=stub.base_url, timeout=timeout
+        )
+        course_list = None
+        for _ in range(5):
+            course_list = checker.course_service.get_courses(auth_token)
+            if course_list:
+                break
+        if not course_list:
+            course_list = stub.courses
+
+        location = Location(latitude="22.725946571118374", longitude="120.31566086504968")
+        loop = threading.Thread(
+            target=checker.run_checkin_loop, args=(auth_token, course_list, location), daemon=True
+        )
+        with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+            loop.start()
+            time.sleep(duration)
+            checker.running = False
+            loop.join(timeout + poll_max + 1)
+    finally:
+        stub.stop()
+
+    result = ScenarioResult(
+        profile=profile.name,
+        requests=dict(stub.stats.requests),
+        faults=dict(stub.stats.faults),
+        rollcalls=len(stub.rollcalls)
+    )
+    for rollcall in stub.rollcalls:
+        if rollcall.checked_in_at is not None:
+            result.latencies.append(rollcall.checked_in_at - rollcall.opens_at)
+    return result
+
+
+def format_results(results: List[ScenarioResult]) -> str:
+    """Format scenario results as a text table"""
+    lines = [
+        f"{'profile':<15} {'requests':>9} {'rollcall':>9} {'faults':>7} "
+        f"{'detected':>9} {'mean(s)':>8} {'max(s)':>8}"
+    ]
+    for result in results:
+        mean = statistics.mean(result.latencies) if result.latencies else float('nan')
+        worst = max(result.latencies) if result.latencies else float('nan')
+        lines.append(
+            f"{result.profile:<15} {result.total_requests:>9} {result.requests.get('rollcall', 0):>9} "
+            f"{sum(result.faults.values()):>7} {len(result.latencies):>4}/{result.rollcalls:<4} "
+            f"{mean:>8.2f} {worst:>8.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(description='Run ZuvioAutoChecker against each stub fault profile')
+    parser.add_argument('--profiles', nargs='+', choices=sorted(PROFILES), default=list(PROFILES),
+                        help='Fault profiles to run')
+    parser.add_argument('--courses', type=int, default=5, help='Number of simulated courses')
+    parser.add_argument('--duration', type=float, default=20.0, help='Seconds to run each scenario')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    # Faults are expected; keep the checker's error logging out of the report
+    logging.disable(logging.CRITICAL)
+    results = []
+    for name in args.profiles:
+        results.append(run_scenario(PROFILES[name], args.courses, args.duration, seed=args.seed))
+        print(format_results(results[-1:]).splitlines()[-1], flush=True)
+    print()
+    print(format_results(results))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Event loop comparison for the async client
+
+Polls every course of the local stub server concurrently through
+ZuvioClient on each available event loop implementation and reports
+throughput and per-request latency percentiles.
+
+ZuvioClient sends every request from a worker thread via
+asyncio.to_thread over a blocking transport, so the loop never touches
+the sockets: the numbers compare to_thread dispatch and thread hand-off
+on each loop, not event-loop network I/O overhead.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import List
+
+# Add parent directory to path to import main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import event_loops
+from client import ZuvioClient
+from zuvio_api import UserCredentials
+from run_history import percentile
+from stub_server import PROFILES, StubZuvioServer, make_courses
+
+
+@dataclass
+class LoopResult:
+    """Measurements of one event loop implementation"""
+    loop: str
+    latencies: List[float]
+    elapsed: float
+
+    @property
+    def throughput(self) -> float:
+        return len(self.latencies) / self.elapsed if self.elapsed else 0.0
+
+
+async def measure(base_url: str, course_ids: List[str], rounds: int, concurrency: int) -> LoopResult:
+    """Poll every course `rounds` times, `concurrency` requests at a time"""
+    async with ZuvioClient(base_url=base_url, timeout=5, pool_size=concurrency) as client:
+        await client.login(UserCredentials("bench@example.com", "bench"))
+        latencies: List[float] = []
+
+        async def poll(course_id: str) -> None:
+            started = time.perf_counter()
+            await client.check_rollcall(course_id)
+            latencies.append(time.perf_counter() - started)
+
+        # Warm up the connection pool before measuring
+        await asyncio.gather(*(client.check_rollcall(course_id) for course_id in course_ids[:concurrency]))
+        began = time.perf_counter()
+        for _ in range(rounds):
+            await asyncio.gather(*(poll(course_id) for course_id in course_ids))
+        elapsed = time.perf_counter() - began
+    return LoopResult(loop='', latencies=latencies, elapsed=elapsed)
+
+
+def run_loop(loop: str, base_url: str, course_ids: List[str], rounds: int, concurrency: int) -> LoopResult:
+    """Run the measurement on one event loop implementation"""
+    result = event_loops.run(measure(base_url, course_ids, rounds, concurrency), loop)
+    result.loop = loop
+    return result
+
+
+def format_results(results: List[LoopResult]) -> str:
+    """Format loop results as a text table"""
+    lines = [f"{'loop':<10} {'requests':>9} {'req/s':>9} {'p50(ms)':>9} {'p99(ms)':>9} {'max(ms)':>9}"]
+    for result in results:
+        lines.append(
+            f"{result.loop:<10} {len(result.latencies):>9} {result.throughput:>9.1f} "
+            f"{percentile(result.latencies, 50) * 1000:>9.2f} {percentile(result.latencies, 99) * 1000:>9.2f} "
+            f"{max(result.latencies) * 1000:>9.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(description='Compare event loop implementations against the stub server')
+    parser.add_argument('--loops', nargs='+', choices=['asyncio', 'uvloop'], default=['asyncio', 'uvloop'],
+                        help='Event loops to compare')
+    parser.add_argument('--courses', type=int, default=200, help='Number of simulated courses')
+    parser.add_argument('--rounds', type=int, default=5, help='Times every course is polled')
+    parser.add_argument('--concurrency', type=int, default=20, help='Concurrent requests (pool size)')
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='healthy', help='Stub fault profile')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    available = event_loops.available_event_loops()
+    results = []
+    with StubZuvioServer(make_courses(args.courses), PROFILES[args.profile], seed=0) as stub:
+        course_ids = [course['course_id'] for course in stub.courses]
+        for loop in args.loops:
+            if loop not in available:
+                print(f"{loop:<10} not installed, skipped")
+                continue
+            results.append(run_loop(loop, stub.base_url, course_ids, args.rounds, args.concurrency))
+    print(format_results(results))
+    print("note: requests run in worker threads (asyncio.to_thread); this measures thread dispatch, "
+          "not event-loop socket I/O")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
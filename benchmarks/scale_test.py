@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Scale and soak test for ZuvioAutoChecker
+
+Runs the real check-in loop against the local stub server with an
+increasing number of simulated courses and reports how cycle time, CPU,
+memory and open-to-check-in latency grow with the course count.
+"""
+
+import argparse
+import contextlib
+import csv
+import logging
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+# Add parent directory to path to import main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clock import SystemClock
+from main import CourseService, Location, UserCredentials, ZuvioAutoChecker
+from resource_budget import current_rss_kb
+from scheduler import UniformPollScheduler
+from stub_server import PROFILES, StubZuvioServer, make_courses
+
+CSV_COLUMNS = [
+    'courses', 'cycles', 'cycle_mean_s', 'cycle_max_s', 'cpu_s', 'cpu_percent',
+    'rss_start_kb', 'rss_end_kb', 'requests', 'detected', 'rollcalls',
+    'latency_mean_s', 'latency_max_s'
+]
+
+
+class CycleClock(SystemClock):
+    """System clock that records how long each loop cycle worked before sleeping"""
+
+    def __init__(self):
+        self.cycles: List[float] = []
+        self._cycle_start: Optional[float] = None
+
+    def sleep(self, seconds: float) -> None:
+        if self._cycle_start is not None:
+            self.cycles.append(time.monotonic() - self._cycle_start)
+        time.sleep(seconds)
+        self._cycle_start = time.monotonic()
+
+    def start(self) -> None:
+        self._cycle_start = time.monotonic()
+
+
+@dataclass
+class ScaleResult:
+    """Measurements of one run at a given course count"""
+    courses: int
+    duration: float
+    cycles: List[float]
+    cpu_seconds: float
+    rss_start: int
+    rss_end: int
+    requests: int
+    rollcalls: int
+    latencies: List[float] = field(default_factory=list)
+
+    @property
+    def cpu_percent(self) -> float:
+        return 100.0 * self.cpu_seconds / self.duration if self.duration else 0.0
+
+    def row(self) -> List:
+        def mean(values):
+            return round(statistics.mean(values), 4) if values else ''
+
+        def worst(values):
+            return round(max(values), 4) if values else ''
+
+        return [
+            self.courses, len(self.cycles), mean(self.cycles), worst(self.cycles),
+            round(self.cpu_seconds, 3), round(self.cpu_percent, 1), self.rss_start, self.rss_end,
+            self.requests, len(self.latencies), self.rollcalls,
+            mean(self.latencies), worst(self.latencies)
+        ]
+
+
+def run_size(courses: int, duration: float = 30.0, rollcalls: int = 10, rollcall_length: float = 10.0,
+             poll_min: float = 0.5, poll_max: float = 1.0, timeout: float = 5.0, seed: int = 0) -> ScaleResult:
+    """Run the check-in loop for `duration` seconds against a stub with `courses` courses
+
+    CPU time is measured on the loop thread only, so the in-process stub
+    server does not count against the checker; RSS covers the whole process.
+    """
+    stub = StubZuvioServer(make_courses(courses), PROFILES['healthy'], seed=seed)
+    rng = random.Random(seed)
+    targets = rng.sample(stub.courses, min(rollcalls, courses))
+    spacing = max(0.0, duration - rollcall_length - 2) / max(1, len(targets))
+    for index, course in enumerate(targets):
+        stub.schedule_rollcall(course['course_id'], 2 + index * spacing, rollcall_length)
+
+    clock = CycleClock()
+    cpu = {}
+    # 0 where the platform cannot report the current RSS
+    rss_start = current_rss_kb() or 0
+    stub.start()
+    try:
+        scheduler = UniformPollScheduler(poll_min, poll_max, rng=random.Random(seed))
+        checker = ZuvioAutoChecker(clock=clock, scheduler=scheduler, base_url=stub.base_url)
+        checker.auth_service.timeout = timeout
+        auth_token = checker.auth_service.login(UserCredentials("bench@example.com", "bench"))
+        checker.course_service = CourseService(
+            checker.auth_service.session, base_url=stub.base_url, timeout=timeout
+        )
+        course_list = checker.course_service.get_courses(auth_token) or stub.courses
+        location = Location(latitude="22.725946571118374", longitude="120.31566086504968")
+
+        def loop():
+            started = time.thread_time()
+            clock.start()
+            try:
+                checker.run_checkin_loop(auth_token, course_list, location)
+            finally:
+                cpu['seconds'] = time.thread_time() - started
+
+        thread = threading.Thread(target=loop, daemon=True)
+        with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+            began = time.monotonic()
+            thread.start()
+            time.sleep(duration)
+            checker.running = False
+            thread.join()
+            elapsed = time.monotonic() - began
+    finally:
+        stub.stop()
+
+    result = ScaleResult(
+        courses=courses,
+        duration=elapsed,
+        cycles=clock.cycles,
+        cpu_seconds=cpu.get('seconds', 0.0),
+        rss_start=rss_start,
+        rss_end=current_rss_kb() or 0,
+        requests=stub.stats.total_requests,
+        rollcalls=len(stub.rollcalls)
+    )
+    for rollcall in stub.rollcalls:
+        if rollcall.checked_in_at is not None:
+            result.latencies.append(rollcall.checked_in_at - rollcall.opens_at)
+    return result
+
+
+def format_results(results: List[ScaleResult]) -> str:
+    """Format the scaling curve as a text table"""
+    lines = [
+        f"{'courses':>8} {'cycles':>7} {'cycle(s)':>9} {'max(s)':>8} {'cpu%':>6} "
+        f"{'rss(MB)':>8} {'requests':>9} {'detected':>9} {'lat(s)':>7} {'max(s)':>7}"
+    ]
+    for result in results:
+        cycle_mean = statistics.mean(result.cycles) if result.cycles else float('nan')
+        cycle_max = max(result.cycles) if result.cycles else float('nan')
+        latency_mean = statistics.mean(result.latencies) if result.latencies else float('nan')
+        latency_max = max(result.latencies) if result.latencies else float('nan')
+        lines.append(
+            f"{result.courses:>8} {len(result.cycles):>7} {cycle_mean:>9.3f} {cycle_max:>8.3f} "
+            f"{result.cpu_percent:>6.1f} {result.rss_end / 1024:>8.1f} {result.requests:>9} "
+            f"{len(result.latencies):>4}/{result.rollcalls:<4} {latency_mean:>7.2f} {latency_max:>7.2f}"
+        )
+    return "\n".join(lines)
+
+
+def write_csv(results: List[ScaleResult], path: str) -> None:
+    """Write the scaling curve as CSV"""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_COLUMNS)
+        for result in results:
+            writer.writerow(result.row())
+
+
+def main():
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(description='Measure how ZuvioAutoChecker scales with the number of courses')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000], help='Course counts to run')
+    parser.add_argument('--duration', type=float, default=30.0,
+                        help='Seconds to run each size (use a long value for a soak test)')
+    parser.add_argument('--rollcalls', type=int, default=10, help='Rollcalls opened during each run')
+    parser.add_argument('--rollcall-length', type=float, default=10.0, help='Seconds each rollcall stays open')
+    parser.add_argument('--output', default='scale_results.csv', help='CSV file for the scaling curve')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    results = []
+    for size in args.sizes:
+        results.append(run_size(size, args.duration, args.rollcalls, args.rollcall_length, seed=args.seed))
+        print(format_results(results[-1:]).splitlines()[-1], flush=True)
+    print()
+    print(format_results(results))
+    if args.output:
+        write_csv(results, args.output)
+        print(f"\nScaling curve written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+HTTP transport matrix
+
+Polls every course of the local stub server through CourseService on
+each available transport and reports polls per second, client CPU per
+request and latency percentiles. The stub runs in a child process so
+the CPU figures only cover the client side.
+
+The stub serves plain HTTP/1.1, so `httpx-h2` measures the overhead of
+an HTTP/2-capable client there; multiplexing itself only kicks in
+against a TLS server such as the real Zuvio endpoints.
+"""
+
+import argparse
+import importlib.util
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+# Add parent directory to path to import main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from zuvio_api import AuthService, CourseService, UserCredentials
+from run_history import percentile
+from stub_server import PROFILES, StubZuvioServer, make_courses
+from transport import create_transport
+
+# (label, transport, http2, required modules)
+VARIANTS: List[Tuple[str, str, bool, Tuple[str, ...]]] = [
+    ('requests', 'requests', False, ()),
+    ('httpx', 'httpx', False, ('httpx',)),
+    ('httpx-h2', 'httpx', True, ('httpx', 'h2')),
+    ('aiohttp', 'aiohttp', False, ('aiohttp',)),
+]
+
+
+@dataclass
+class TransportResult:
+    """Measurements of one transport"""
+    transport: str
+    latencies: List[float]
+    elapsed: float
+    cpu: float
+    failures: int
+
+    @property
+    def polls_per_second(self) -> float:
+        return len(self.latencies) / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def cpu_ms_per_request(self) -> float:
+        return self.cpu * 1000 / len(self.latencies) if self.latencies else 0.0
+
+
+def serve_stub(course_count: int, profile: str, conn) -> None:
+    """Run the stub server until the parent closes the pipe"""
+    logging.disable(logging.CRITICAL)
+    with StubZuvioServer(make_courses(course_count), PROFILES[profile], seed=0) as stub:
+        conn.send((stub.base_url, [course['course_id'] for course in stub.courses]))
+        try:
+            conn.recv()
+        except EOFError:
+            pass
+
+
+def measure(label: str, name: str, http2: bool, base_url: str, course_ids: List[str],
+            rounds: int, concurrency: int) -> TransportResult:
+    """Poll every course `rounds` times, `concurrency` polls at a time"""
+    transport = create_transport(name, pool_size=concurrency, http2=http2)
+    try:
+        auth_service = AuthService(base_url, timeout=5, transport=transport)
+        auth_service.login(UserCredentials("bench@example.com", "bench"))
+        course_service = CourseService(transport, base_url=base_url, timeout=5)
+        latencies: List[float] = []
+        failures = 0
+
+        def poll(course_id: str) -> Optional[float]:
+            started = time.perf_counter()
+            try:
+                course_service.fetch_rollcall_page(course_id)
+            except Exception:
+                return None
+            return time.perf_counter() - started
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            # Warm up the connection pool before measuring
+            list(executor.map(poll, course_ids[:concurrency]))
+            began, cpu_began = time.perf_counter(), time.process_time()
+            for _ in range(rounds):
+                for latency in executor.map(poll, course_ids):
+                    if latency is None:
+                        failures += 1
+                    else:
+                        latencies.append(latency)
+            elapsed, cpu = time.perf_counter() - began, time.process_time() - cpu_began
+    finally:
+        transport.close()
+    return TransportResult(label, latencies, elapsed, cpu, failures)
+
+
+def format_results(results: List[TransportResult]) -> str:
+    """Format transport results as a text table"""
+    lines = [
+        f"{'transport':<10} {'requests':>9} {'failed':>7} {'polls/s':>9} {'cpu(ms)':>8} "
+        f"{'p50(ms)':>9} {'p99(ms)':>9} {'max(ms)':>9}"
+    ]
+    for result in results:
+        latencies = result.latencies or [0.0]
+        lines.append(
+            f"{result.transport:<10} {len(result.latencies):>9} {result.failures:>7} "
+            f"{result.polls_per_second:>9.1f} {result.cpu_ms_per_request:>8.3f} "
+            f"{percentile(latencies, 50) * 1000:>9.2f} {percentile(latencies, 99) * 1000:>9.2f} "
+            f"{max(latencies) * 1000:>9.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    """Benchmark entry point"""
+    labels = [variant[0] for variant in VARIANTS]
+    parser = argparse.ArgumentParser(description='Compare HTTP transports against the stub server')
+    parser.add_argument('--transports', nargs='+', choices=labels, default=labels, help='Transports to compare')
+    parser.add_argument('--courses', type=int, default=200, help='Number of simulated courses')
+    parser.add_argument('--rounds', type=int, default=5, help='Times every course is polled')
+    parser.add_argument('--concurrency', type=int, default=20, help='Concurrent polls (pool size)')
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='healthy', help='Stub fault profile')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    parent_conn, child_conn = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=serve_stub, args=(args.courses, args.profile, child_conn), daemon=True)
+    server.start()
+    try:
+        base_url, course_ids = parent_conn.recv()
+        results = []
+        for label, name, http2, modules in VARIANTS:
+            if label not in args.transports:
+                continue
+            missing = [module for module in modules if importlib.util.find_spec(module) is None]
+            if missing:
+                print(f"{label:<10} {', '.join(missing)} not installed, skipped")
+                continue
+            results.append(measure(label, name, http2, base_url, course_ids, args.rounds, args.concurrency))
+    finally:
+        parent_conn.send(None)
+        server.join(timeout=5)
+    print(format_results(results))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
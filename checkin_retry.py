@@ -0,0 +1,55 @@
+"""
+Retry policy for check-ins that never got an answer from the server
+
+A failure the server reports (e.g. outside the allowed area) is final:
+retrying only repeats the POST and the notification. Transport failures
+(timeouts, dropped connections, 5xx and 429 responses) are retried with
+exponential backoff, up to `max_attempts` per rollcall.
+"""
+
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+# failure_cause() values that mean the request itself failed
+TRANSIENT_CAUSES = ('timeout', 'connection', 'request', 'http_429')
+
+
+def is_transient(cause: Optional[str]) -> bool:
+    """Whether a check-in failure cause is worth retrying"""
+    return cause in TRANSIENT_CAUSES or (cause or '').startswith('http_5')
+
+
+class CheckinRetries:
+    """Attempts and next retry time per rollcall ID"""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 5.0, max_delay: float = 60.0):
+        if max_attempts < 1:
+            raise ValueError("At least one check-in attempt is needed")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._pending: Dict[str, Tuple[int, datetime]] = {}
+        self._lock = threading.Lock()
+
+    def ready(self, rollcall_id: str, now: datetime) -> bool:
+        """Whether a check-in may be attempted now"""
+        with self._lock:
+            pending = self._pending.get(rollcall_id)
+        return pending is None or now >= pending[1]
+
+    def record_failure(self, rollcall_id: str, now: datetime) -> Optional[datetime]:
+        """Count a transient failure; returns when to retry, or None once attempts are used up"""
+        with self._lock:
+            attempts = self._pending.get(rollcall_id, (0, now))[0] + 1
+            if attempts >= self.max_attempts:
+                self._pending.pop(rollcall_id, None)
+                return None
+            retry_at = now + timedelta(seconds=min(self.max_delay, self.base_delay * 2 ** (attempts - 1)))
+            self._pending[rollcall_id] = (attempts, retry_at)
+            return retry_at
+
+    def clear(self, rollcall_id: str) -> None:
+        """Forget a rollcall once its check-in reached a final outcome"""
+        with self._lock:
+            self._pending.pop(rollcall_id, None)
@@ -0,0 +1,133 @@
+"""
+Embeddable async client for the Zuvio endpoints
+
+ZuvioClient exposes login, course listing, rollcall watching and check-in
+as coroutines over one pooled transport (a requests session by default),
+so other tools can integrate without spawning the interactive program.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+
+from clock import Clock, SystemClock
+from course_rules import CourseFilter
+from scheduler import PollScheduler, UniformPollScheduler
+from transport import create_transport
+from zuvio_api import (
+    REQUEST_TIMEOUT, ZUVIO_BASE_URL, AuthService, AuthToken, CourseService,
+    Location, UserCredentials
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RollcallEvent:
+    """A rollcall found open while watching"""
+    course: Dict
+    rollcall_id: str
+    detected_at: datetime
+
+
+class ZuvioClient:
+    """Async facade over AuthService and CourseService sharing one pooled session
+
+    Blocking HTTP calls run in worker threads; at most `pool_size` run at
+    once, matching the connection pool size.
+    """
+
+    def __init__(self, base_url: str = ZUVIO_BASE_URL, timeout: float = REQUEST_TIMEOUT,
+                 course_filter: Optional[CourseFilter] = None, pool_size: int = 10,
+                 clock: Optional[Clock] = None, transport=None):
+        # Size the connection pool to match the concurrency limit
+        self.auth_service = AuthService(base_url, timeout, transport or create_transport(pool_size=pool_size))
+        self.course_service = CourseService(self.auth_service.session, course_filter, base_url, timeout)
+        self.clock = clock or SystemClock()
+        self.auth_token: Optional[AuthToken] = None
+        self._slots = asyncio.Semaphore(pool_size)
+
+    @property
+    def session(self):
+        return self.auth_service.session
+
+    async def _call(self, func, *args):
+        async with self._slots:
+            return await asyncio.to_thread(func, *args)
+
+    async def login(self, credentials: UserCredentials) -> Optional[AuthToken]:
+        """Log in and keep the token for later calls"""
+        auth_token = await self._call(self.auth_service.login, credentials)
+        if auth_token:
+            self.auth_token = auth_token
+        return auth_token
+
+    async def list_courses(self) -> Optional[List[Dict]]:
+        """Get the filtered course list"""
+        return await self._call(self.course_service.get_courses, self._require_token())
+
+    async def check_rollcall(self, course_id: str) -> Optional[str]:
+        """Get the open rollcall ID of a course, if any"""
+        return await self._call(self.course_service.check_rollcall_availability, course_id)
+
+    async def check_in(self, rollcall_id: str, location: Location) -> Tuple[bool, str]:
+        """Check in to an open rollcall"""
+        return await self._call(
+            self.course_service.perform_checkin, self._require_token(), rollcall_id, location
+        )
+
+    async def watch_rollcalls(self, courses: Optional[List[Dict]] = None,
+                              scheduler: Optional[PollScheduler] = None) -> AsyncIterator[RollcallEvent]:
+        """Poll courses and yield each newly opened rollcall once
+
+        Courses due in a cycle are polled concurrently; the scheduler
+        decides which courses are due and how long to wait between cycles.
+        """
+        if courses is None:
+            courses = await self.list_courses() or []
+        scheduler = scheduler or UniformPollScheduler()
+        seen: Set[str] = set()
+
+        while True:
+            now = self.clock.now()
+            due = scheduler.due_courses(list(courses), now)
+            results = await asyncio.gather(
+                *(self.check_rollcall(course['course_id']) for course in due)
+            )
+            for course, rollcall_id in zip(due, results):
+                scheduler.record_poll(course['course_id'], now, rollcall_id is not None)
+                if rollcall_id and rollcall_id not in seen:
+                    seen.add(rollcall_id)
+                    yield RollcallEvent(course=course, rollcall_id=rollcall_id, detected_at=self.clock.now())
+            await asyncio.sleep(scheduler.next_delay(now))
+
+    async def close(self) -> None:
+        """Close the pooled session"""
+        await asyncio.to_thread(self.session.close)
+
+    async def __aenter__(self) -> 'ZuvioClient':
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    def _require_token(self) -> AuthToken:
+        if not self.auth_token:
+            raise RuntimeError("ZuvioClient.login() must succeed before this call")
+        return self.auth_token
+
+
+async def auto_check_in(client: ZuvioClient, courses: List[Dict], location: Location,
+                        scheduler: Optional[PollScheduler] = None,
+                        on_result: Optional[Callable[[RollcallEvent, bool, str], None]] = None) -> None:
+    """Check in to every rollcall that opens in `courses`; the client must be logged in
+
+    Results are logged and passed to `on_result`; `main.py watch` prints them.
+    """
+    async for event in client.watch_rollcalls(courses, scheduler):
+        success, message = await client.check_in(event.rollcall_id, location)
+        logger.info(f"{event.course['course_name']} - {message}")
+        if on_result:
+            on_result(event, success, message)
@@ -0,0 +1,58 @@
+"""
+Clock abstraction for the check-in loop and schedulers
+"""
+
+import time
+from datetime import datetime, timedelta
+
+
+class Clock:
+    """Source of wall time, monotonic time and sleeping"""
+
+    def now(self) -> datetime:
+        """Get current wall-clock time"""
+        raise NotImplementedError
+
+    def monotonic(self) -> float:
+        """Get monotonic seconds for measuring durations"""
+        raise NotImplementedError
+
+    def sleep(self, seconds: float) -> None:
+        """Block for the given number of seconds"""
+        raise NotImplementedError
+
+
+class SystemClock(Clock):
+    """Clock backed by the real system time"""
+
+    def now(self) -> datetime:
+        return datetime.now()
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+
+class SimulatedClock(Clock):
+    """Virtual clock whose time only moves when sleep() or advance() is called"""
+
+    def __init__(self, start: datetime):
+        self.start = start
+        self._elapsed = 0.0
+
+    def now(self) -> datetime:
+        return self.start + timedelta(seconds=self._elapsed)
+
+    def monotonic(self) -> float:
+        return self._elapsed
+
+    def sleep(self, seconds: float) -> None:
+        self.advance(seconds)
+
+    def advance(self, seconds: float) -> None:
+        """Move virtual time forward without blocking"""
+        if seconds < 0:
+            raise ValueError("Cannot move a simulated clock backwards")
+        self._elapsed += seconds
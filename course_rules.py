@@ -0,0 +1,97 @@
+"""
+Declarative course selection rules
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Pattern
+
+logger = logging.getLogger(__name__)
+
+# Course fields matched by each rule kind
+RULE_FIELDS = {
+    'id': 'course_id',
+    'name': 'course_name',
+    'teacher': 'teacher_name',
+}
+
+# Zuvio's own announcement "courses" are never worth polling
+DEFAULT_EXCLUDE = "teacher:Zuvio"
+
+
+@dataclass(frozen=True)
+class CourseRule:
+    """A single compiled rule such as `id:12345` or `name:^體育`"""
+    kind: str
+    value: str
+    pattern: Optional[Pattern] = None
+
+    @classmethod
+    def parse(cls, text: str) -> 'CourseRule':
+        """Parse and compile a `kind:value` rule"""
+        kind, sep, value = text.partition(':')
+        kind = kind.strip().lower()
+        value = value.strip()
+        if not sep or kind not in RULE_FIELDS or not value:
+            raise ValueError(f"Invalid course rule: {text!r}")
+        if kind == 'id':
+            return cls(kind, value)
+        try:
+            return cls(kind, value, re.compile(value, re.IGNORECASE))
+        except re.error as e:
+            raise ValueError(f"Invalid pattern in course rule {text!r}: {e}") from e
+
+    def matches(self, course: Dict) -> bool:
+        """Check whether a course matches this rule"""
+        field_value = str(course.get(RULE_FIELDS[self.kind], ''))
+        if self.pattern is None:
+            return field_value == self.value
+        return self.pattern.search(field_value) is not None
+
+
+class CourseFilter:
+    """Include/exclude rules compiled once and applied to every fetched course list
+
+    With no include rules every course is included; exclude rules always win.
+    """
+
+    def __init__(self, include: Optional[List[CourseRule]] = None,
+                 exclude: Optional[List[CourseRule]] = None):
+        self.include = include or []
+        self.exclude = exclude or []
+
+    @classmethod
+    def from_text(cls, include: str = "", exclude: str = DEFAULT_EXCLUDE) -> 'CourseFilter':
+        """Build a filter from newline-separated rule lists, skipping invalid rules"""
+        return cls(cls._parse_rules(include), cls._parse_rules(exclude))
+
+    @staticmethod
+    def _parse_rules(text: str) -> List[CourseRule]:
+        rules = []
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rules.append(CourseRule.parse(line))
+            except ValueError as e:
+                logger.error(f"忽略無效的課程規則: {e}")
+        return rules
+
+    def matches(self, course: Dict) -> bool:
+        """Check whether a course should be polled"""
+        if self.include and not any(rule.matches(course) for rule in self.include):
+            return False
+        return not any(rule.matches(course) for rule in self.exclude)
+
+    def apply(self, courses: List[Dict]) -> List[Dict]:
+        """Get the courses that pass the filter"""
+        return [course for course in courses if self.matches(course)]
+
+    def fingerprint(self) -> Dict[str, List[str]]:
+        """Get the rules as text, for telling whether two filters select the same courses"""
+        return {
+            'include': [f"{rule.kind}:{rule.value}" for rule in self.include],
+            'exclude': [f"{rule.kind}:{rule.value}" for rule in self.exclude],
+        }
@@ -0,0 +1,61 @@
+"""
+Course records and JSON decoding for course list responses
+"""
+
+import json
+from typing import Any, Dict
+
+try:
+    # Several times faster on large course lists; also raises a json.JSONDecodeError subclass
+    from orjson import loads as decode_json
+except ImportError:
+    decode_json = json.loads
+
+
+class Course:
+    """A monitored course
+
+    Slotted to keep the polled set small, and hashed and compared by
+    course_id so courses can key dicts and sets directly. Read access by
+    field name (`course['course_id']`, `course.get(...)`) matches the
+    plain dicts used by tests and simulations.
+    """
+
+    __slots__ = ('course_id', 'course_name', 'teacher_name')
+    _FIELDS = frozenset(__slots__)
+
+    def __init__(self, course_id: str, course_name: str = '', teacher_name: str = ''):
+        self.course_id = course_id
+        self.course_name = course_name
+        self.teacher_name = teacher_name
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Course':
+        """Build a course from an entry of the course list API, ignoring unused fields"""
+        return cls(
+            str(data['course_id']),
+            data.get('course_name') or '',
+            data.get('teacher_name') or ''
+        )
+
+    def to_dict(self) -> Dict[str, str]:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __getitem__(self, key: str) -> str:
+        if key not in self._FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self._FIELDS else default
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Course):
+            return NotImplemented
+        return self.course_id == other.course_id
+
+    def __hash__(self) -> int:
+        return hash(self.course_id)
+
+    def __repr__(self) -> str:
+        return f"Course({self.course_id!r}, {self.course_name!r}, {self.teacher_name!r})"
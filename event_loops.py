@@ -0,0 +1,58 @@
+"""
+Event loop selection for the async client
+
+`uvloop` is optional; asking for it when it is not installed falls back
+to the stdlib loop with a warning.
+"""
+
+import asyncio
+import importlib
+import importlib.util
+import logging
+from typing import Any, Callable, Coroutine, Tuple
+
+logger = logging.getLogger(__name__)
+
+EVENT_LOOPS = ('auto', 'asyncio', 'uvloop')
+
+
+def available_event_loops() -> Tuple[str, ...]:
+    """Get the event loop implementations that can be used here"""
+    if importlib.util.find_spec('uvloop'):
+        return 'asyncio', 'uvloop'
+    return ('asyncio',)
+
+
+def select_event_loop(name: str = 'auto') -> Tuple[str, Callable[[], asyncio.AbstractEventLoop]]:
+    """Resolve an event loop name to (implementation, loop factory)
+
+    'auto' prefers uvloop when it is installed.
+    """
+    if name not in EVENT_LOOPS:
+        raise ValueError(f"Unknown event loop: {name}")
+    if name in ('auto', 'uvloop'):
+        try:
+            uvloop = importlib.import_module('uvloop')
+            return 'uvloop', uvloop.new_event_loop
+        except ImportError:
+            if name == 'uvloop':
+                logger.warning("未安裝 uvloop，改用 asyncio 事件迴圈")
+    return 'asyncio', asyncio.new_event_loop
+
+
+def run(main: Coroutine[Any, Any, Any], loop: str = 'auto') -> Any:
+    """Run a coroutine to completion on the selected event loop"""
+    name, factory = select_event_loop(loop)
+    logger.info(f"使用 {name} 事件迴圈")
+    if hasattr(asyncio, 'Runner'):
+        with asyncio.Runner(loop_factory=factory) as runner:
+            return runner.run(main)
+
+    # Python < 3.11 has no Runner; swap the loop policy for the duration of the run
+    policy = asyncio.get_event_loop_policy()
+    if name == 'uvloop':
+        asyncio.set_event_loop_policy(importlib.import_module('uvloop').EventLoopPolicy())
+    try:
+        return asyncio.run(main)
+    finally:
+        asyncio.set_event_loop_policy(policy)
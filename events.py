@@ -0,0 +1,131 @@
+"""
+Newline-delimited JSON event stream of check-in loop activity
+
+Events are queued without blocking and written in batches by a
+background thread to a file, a named pipe or a Unix socket
+(`unix:/path/to.sock`), so slow or absent consumers never hold up the
+loop. Events that do not fit in the queue, or cannot be written, are
+counted in `dropped`.
+"""
+
+import json
+import logging
+import os
+import queue
+import socket
+import threading
+from typing import Dict, List, Optional
+
+from clock import Clock, SystemClock
+from secure_input import set_file_permissions
+
+logger = logging.getLogger(__name__)
+
+UNIX_PREFIX = "unix:"
+
+
+class EventStream:
+    """Buffered, non-blocking NDJSON writer"""
+
+    def __init__(self, target: str, clock: Optional[Clock] = None, max_pending: int = 10000,
+                 batch_size: int = 500, retry_interval: float = 1.0):
+        self.target = target
+        self.clock = clock or SystemClock()
+        self.batch_size = batch_size
+        self.retry_interval = retry_interval
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._sink = None
+        self._failing = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'EventStream':
+        """Start the background writer thread"""
+        if self._thread and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="event-stream", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Flush queued events and stop the writer thread"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        self._close_sink()
+
+    def emit(self, event: str, **fields) -> None:
+        """Queue an event without blocking"""
+        record = {'ts': self.clock.now().isoformat(), 'event': event}
+        record.update(fields)
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            try:
+                batch: List[Dict] = [self._queue.get(timeout=0.2)]
+            except queue.Empty:
+                if self._stop.is_set():
+                    return
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _write(self, batch: List[Dict]) -> None:
+        data = "".join(
+            json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=str) + "\n"
+            for record in batch
+        ).encode('utf-8')
+        try:
+            if self._sink is None:
+                self._sink = self._open()
+            self._sink.write(data)
+            self._sink.flush()
+        except OSError as e:
+            self.dropped += len(batch)
+            if not self._failing:
+                logger.warning(f"寫入事件串流失敗 ({self.target}): {e}")
+            self._failing = True
+            self._close_sink()
+            # Wait before reconnecting; events keep queueing (or dropping) meanwhile
+            self._stop.wait(self.retry_interval)
+            return
+        if self._failing:
+            logger.info(f"事件串流已恢復 ({self.target})")
+        self._failing = False
+
+    def _open(self):
+        if self.target.startswith(UNIX_PREFIX):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.target[len(UNIX_PREFIX):])
+            except OSError:
+                sock.close()
+                raise
+            sink = sock.makefile('wb')
+            # The file object keeps the connection open
+            sock.close()
+            return sink
+        # Opening a named pipe blocks until a reader appears; this runs on the writer thread
+        sink = open(self.target, 'ab')
+        if os.path.isfile(self.target):
+            set_file_permissions(self.target)
+        return sink
+
+    def _close_sink(self) -> None:
+        if self._sink is not None:
+            try:
+                self._sink.close()
+            except OSError:
+                pass
+            self._sink = None
@@ -0,0 +1,160 @@
+"""
+Per-course rollcall open history and open-time probability model
+"""
+
+import json
+import logging
+import math
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from secure_input import set_file_permissions
+
+logger = logging.getLogger(__name__)
+
+WEEK_SECONDS = 7 * 24 * 3600
+
+
+def week_offset(when: datetime) -> float:
+    """Get seconds since Monday 00:00 of the week containing `when`"""
+    midnight = when.replace(hour=0, minute=0, second=0, microsecond=0)
+    return when.weekday() * 86400 + (when - midnight).total_seconds()
+
+
+def _week_distance(a: float, b: float) -> float:
+    """Get the circular distance between two week offsets"""
+    diff = abs(a - b) % WEEK_SECONDS
+    return min(diff, WEEK_SECONDS - diff)
+
+
+def _normal_cdf(x: float) -> float:
+    return 0.5 * (1 + math.erf(x / math.sqrt(2)))
+
+
+class RollcallHistory:
+    """Observed rollcall open times per course, optionally persisted as JSON"""
+
+    def __init__(self, path: Optional[str] = None, max_observations: int = 20,
+                 spread: float = 300.0):
+        self.path = path
+        self.max_observations = max_observations
+        # Standard deviation (seconds) of each observation's Gaussian kernel
+        self.spread = spread
+        self.opens: Dict[str, List[datetime]] = {}
+        # First time each course was polled, so new courses are not judged stale
+        self.first_seen: Dict[str, datetime] = {}
+        self._last_closed: Dict[str, datetime] = {}
+        self._open: Dict[str, bool] = {}
+        self.load()
+
+    def load(self) -> None:
+        """Load history file"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.opens = {
+                course_id: [datetime.fromisoformat(value) for value in values]
+                for course_id, values in data.get('opens', {}).items()
+            }
+            self.first_seen = {
+                course_id: datetime.fromisoformat(value)
+                for course_id, value in data.get('first_seen', {}).items()
+            }
+        except (OSError, ValueError) as e:
+            logger.warning(f"讀取點名歷史失敗: {e}")
+            self.opens = {}
+            self.first_seen = {}
+
+    def save(self) -> None:
+        """Save history file with restricted permissions"""
+        if not self.path:
+            return
+        data = {
+            'opens': {
+                course_id: [value.isoformat() for value in values]
+                for course_id, values in self.opens.items()
+            },
+            'first_seen': {
+                course_id: value.isoformat()
+                for course_id, value in self.first_seen.items()
+            }
+        }
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        set_file_permissions(self.path)
+
+    def record_open(self, course_id: str, when: datetime) -> None:
+        """Record that a course's rollcall was open at `when`"""
+        values = self.opens.setdefault(course_id, [])
+        values.append(when)
+        del values[:-self.max_observations]
+        self.save()
+
+    def observe(self, course_id: str, now: datetime, rollcall_open: bool) -> None:
+        """Record a poll result, learning the open time when a rollcall first appears
+
+        The open time is estimated as the midpoint between the last closed
+        poll and the first open one. Repeating an observation is harmless.
+        """
+        if course_id not in self.first_seen:
+            self.first_seen[course_id] = now
+            if not rollcall_open:
+                self.save()
+        if rollcall_open and not self._open.get(course_id):
+            last_closed = self._last_closed.get(course_id)
+            opened_at = last_closed + (now - last_closed) / 2 if last_closed else now
+            self.record_open(course_id, opened_at)
+        if not rollcall_open:
+            self._last_closed[course_id] = now
+        self._open[course_id] = rollcall_open
+
+    def last_activity(self, course_id: str) -> Optional[datetime]:
+        """Get the last recorded open time, or when the course was first seen"""
+        opens = self.opens.get(course_id)
+        if opens:
+            return opens[-1]
+        return self.first_seen.get(course_id)
+
+    def offsets(self, course_id: str) -> List[float]:
+        """Get observed open times as week offsets"""
+        return [week_offset(value) for value in self.opens.get(course_id, [])]
+
+    def open_probability(self, course_id: str, start: datetime, end: datetime) -> float:
+        """Probability that the course's weekly rollcall opens within [start, end)
+
+        Each observation contributes a Gaussian kernel centred on its week
+        offset; the result is the mixture's mass over the interval.
+        """
+        offsets = self.offsets(course_id)
+        if not offsets or end <= start:
+            return 0.0
+        span = (end - start).total_seconds()
+        if span >= WEEK_SECONDS:
+            return 1.0
+        begin = week_offset(start)
+        mass = 0.0
+        for offset in offsets:
+            # Align the observation with the week containing `start`
+            centre = begin + ((offset - begin + WEEK_SECONDS / 2) % WEEK_SECONDS) - WEEK_SECONDS / 2
+            mass += (_normal_cdf((begin + span - centre) / self.spread)
+                     - _normal_cdf((begin - centre) / self.spread))
+        return min(1.0, mass / len(offsets))
+
+    def is_hot(self, course_id: str, when: datetime, sigmas: float = 2.0) -> bool:
+        """Check whether `when` lies inside a predicted open window"""
+        target = week_offset(when)
+        margin = sigmas * self.spread
+        return any(_week_distance(target, offset) <= margin for offset in self.offsets(course_id))
+
+    def next_hot_start(self, course_id: str, after: datetime, sigmas: float = 2.0) -> Optional[datetime]:
+        """Get the start of the next predicted open window after `after`"""
+        offsets = self.offsets(course_id)
+        if not offsets:
+            return None
+        base = week_offset(after)
+        margin = sigmas * self.spread
+        delays = [((offset - margin) - base) % WEEK_SECONDS for offset in offsets]
+        return after + timedelta(seconds=min(delays))
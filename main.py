@@ -2,64 +2,88 @@
 Zuvio 自動簽到系統
 """
 
-import random
-import json
-import time
+import argparse
+import contextlib
 import os
+import sys
 import logging
-import re
 import getpass
-from datetime import datetime
-from typing import Optional, Dict, List, Tuple
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Iterator, Optional, Dict, List, Tuple, TypeVar
 from dataclasses import dataclass
 
-import requests
-from bs4 import BeautifulSoup
 import configparser
 from secure_input import get_hidden_password, set_file_permissions
+from clock import Clock, SystemClock
+from scheduler import (
+    DemotingScheduler, PollScheduler, PredictiveScheduler, ThrottlingScheduler, UniformPollScheduler
+)
+from resource_budget import ResourceBudget
+from history import RollcallHistory
+from refresher import CourseRefresher, update_courses
+from checkin_retry import CheckinRetries, is_transient
+from course_rules import CourseFilter, DEFAULT_EXCLUDE
+from bandwidth import BandwidthMeter
+from run_history import RunHistory, build_report, format_csv, format_text, load_records
+from session_health import SessionMonitor
+from metrics import Metrics
+from pipeline import PollingPipeline
+from events import EventStream
+from notifier import CommandBackend, Notifier, WebhookBackend
+from transport import create_transport
+from snapshot import StateSnapshot
+from status_line import StatusLine
+from client import ZuvioClient, auto_check_in
+# Re-exported so existing `from main import ...` callers keep working
+from zuvio_api import (  # noqa: F401
+    REQUEST_TIMEOUT, ZUVIO_BASE_URL, AuthService, AuthToken, CourseService,
+    Location, UserCredentials, failure_cause
+)
+import event_loops
 
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('zuvio.log', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
-
-@dataclass
-class UserCredentials:
-    """User credentials data class"""
-    account: str
-    password: str
-    
-    @property
-    def email(self) -> str:
-        """Get complete email address"""
-        if '@' not in self.account:
-            email = f"{self.account}@nkust.edu.tw"
-            logger.info(f"Auto-appended default domain: {email}")
-            return email
-        logger.info(f"使用完整 mail：{self.account}")
-        return self.account
+T = TypeVar('T')
 
 
 @dataclass
-class Location:
-    """Location information data class"""
-    latitude: str
-    longitude: str
+class ScheduleSettings:
+    """Polling schedule settings"""
+    policy: str = "uniform"
+    min_interval: float = 1.0
+    max_interval: float = 5.0
+    cold_interval: float = 60.0
+    history_file: str = "rollcall_history.json"
+    course_refresh_interval: float = 1800.0
+    stale_weeks: float = 3.0
+    stale_interval: float = 120.0
+    run_history_file: str = "run_history.jsonl"
+    session_check_interval: float = 600.0
+    session_refresh_lead: float = 300.0
+    pipeline: bool = False
+    fetch_workers: int = 4
+    queue_size: int = 16
+    event_loop: str = "auto"
+    max_cpu_percent: float = 0.0
+    max_rss_mb: float = 0.0
+    throttle_interval: float = 60.0
+    event_stream: str = ""
+    snapshot_file: str = "runtime_state.snap"
+    snapshot_interval: float = 300.0
+    transport: str = "requests"
+    http2: bool = False
 
 
 @dataclass
-class AuthToken:
-    """Authentication token data class"""
-    user_id: str
-    access_token: str
+class NotifySettings:
+    """Check-in result notification settings"""
+    webhook_url: str = ""
+    command: str = ""
+    batch_window: float = 2.0
+    max_retries: int = 5
 
 
 class ConfigManager:
@@ -68,26 +92,134 @@ class ConfigManager:
     def __init__(self, config_file: str = "config.ini"):
         self.config_file = config_file
         self.config = configparser.ConfigParser()
+        self._course_filter: Optional[CourseFilter] = None
+        # (mtime_ns, size) of the file as last loaded or written
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._batch_depth = 0
+        self._dirty = False
+        self._reload_listeners: List[Callable[[], None]] = []
+        self._reload_pending = False
+        # Last settings that parsed, kept when an edit does not: name -> value
+        self._last_good: Dict[str, object] = {}
+        # Getters may run on the session monitor's thread as well as the loop's
+        self._lock = threading.RLock()
         self.load_config()
     
     def load_config(self) -> None:
         """Load configuration file"""
+        stamp = self._file_stamp()
+        # Fill a new parser and swap it in, so readers never see a half-loaded one
+        config = configparser.ConfigParser()
         if os.path.exists(self.config_file):
-            self.config.read(self.config_file, encoding='utf-8')
+            config.read(self.config_file, encoding='utf-8')
+        with self._lock:
+            self.config = config
+            self._course_filter = None
+            self._stamp = stamp
+    
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.config_file)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _current(self) -> configparser.ConfigParser:
+        """Re-read the configuration file if its mtime or size changed, and get the loaded parser
+        
+        Getters read from the returned parser, which a later reload replaces
+        instead of modifying.
+        """
+        with self._lock:
+            stamp = self._file_stamp()
+            if not self._batch_depth and stamp != self._stamp:
+                try:
+                    self.load_config()
+                except (configparser.Error, UnicodeDecodeError) as e:
+                    # e.g. a typo or a half-saved editor write; retried once the file changes again
+                    self._stamp = stamp
+                    logger.warning(f"設定檔格式錯誤，沿用先前的設定: {e}")
+                    return self.config
+                self._reload_pending = True
+                logger.info("偵測到設定檔變更，已重新載入")
+            return self.config
+    
+    def _keep_good(self, name: str, parse: Callable[[], T], default: T) -> T:
+        """Parse one group of settings, falling back to the last value that parsed when an edit is invalid"""
+        try:
+            value = parse()
+        except ValueError as e:
+            logger.warning(f"設定 [{name}] 的值無效，沿用先前的設定: {e}")
+            return self._last_good.get(name, default)
+        self._last_good[name] = value
+        return value
+    
+    def reload_if_changed(self) -> bool:
+        """Re-read the configuration file if it changed and call the reload listeners
+        
+        Listeners run on the calling thread, so only the check-in loop calls
+        this; a reload made by a getter is announced on the next call.
+        """
+        with self._lock:
+            self._current()
+            pending, self._reload_pending = self._reload_pending, False
+        if pending:
+            for listener in list(self._reload_listeners):
+                try:
+                    listener()
+                except Exception as e:
+                    logger.error(f"套用設定檔變更失敗: {e}")
+        return pending
+    
+    def add_reload_listener(self, listener: Callable[[], None]) -> None:
+        """Call listener from reload_if_changed after the configuration file is reloaded"""
+        self._reload_listeners.append(listener)
+    
+    @contextlib.contextmanager
+    def batch(self) -> Iterator['ConfigManager']:
+        """Coalesce the saves made inside the block into one write when it exits"""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+        if self._batch_depth == 0 and self._dirty:
+            self.save_config()
     
     def save_config(self) -> None:
-        """Save configuration file with restricted permissions"""
-        with open(self.config_file, 'w', encoding='utf-8') as f:
-            self.config.write(f)
-        # Set restricted permissions (owner read/write only)
-        set_file_permissions(self.config_file)
+        """Save configuration file atomically with restricted permissions
+        
+        The file is written to a temporary file in the same directory and
+        renamed over the old one, so a crash never leaves it truncated.
+        """
+        if self._batch_depth:
+            self._dirty = True
+            return
+        
+        directory = os.path.dirname(os.path.abspath(self.config_file))
+        fd, temp_path = tempfile.mkstemp(prefix='.config-', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                self.config.write(f)
+                f.flush()
+                os.fsync(f.fileno())
+            # Set restricted permissions (owner read/write only) before the file is visible
+            set_file_permissions(temp_path)
+            os.replace(temp_path, self.config_file)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(temp_path)
+            raise
+        self._dirty = False
+        self._stamp = self._file_stamp()
     
     def get_user_credentials(self) -> Optional[UserCredentials]:
         """Get user credentials"""
-        if 'user' not in self.config.sections():
+        config = self._current()
+        if 'user' not in config.sections():
             return None
         
-        user_section = self.config['user']
+        user_section = config['user']
         return UserCredentials(
             account=user_section.get('account', ''),
             password=user_section.get('password', '')
@@ -104,10 +236,11 @@ class ConfigManager:
     
     def get_location(self) -> Optional[Location]:
         """Get location information"""
-        if 'location' not in self.config.sections():
+        config = self._current()
+        if 'location' not in config.sections():
             return None
         
-        location_section = self.config['location']
+        location_section = config['location']
         return Location(
             latitude=location_section.get('lat', ''),
             longitude=location_section.get('lng', '')
@@ -121,163 +254,123 @@ class ConfigManager:
         self.config['location']['lat'] = location.latitude
         self.config['location']['lng'] = location.longitude
         self.save_config()
-
-
-class AuthService:
-    """Authentication service class"""
-    
-    def __init__(self):
-        self.session = requests.Session()
-        self.login_url = "https://irs.zuvio.com.tw/irs/submitLogin"
     
-    def login(self, credentials: UserCredentials) -> Optional[AuthToken]:
-        """Perform login"""
-        try:
-            data = {
-                'email': credentials.email,
-                'password': credentials.password,
-                'current_language': "zh-TW"
-            }
-            
-            logger.info("嘗試登入...")
-            response = self.session.post(self.login_url, data=data)
-            response.raise_for_status()
-            
-            return self._extract_tokens(response.content)
-            
-        except requests.RequestException as e:
-            logger.error(f"登入請求失敗: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"登入過程中發生錯誤: {e}")
-            return None
-    
-    def _extract_tokens(self, html_content: bytes) -> Optional[AuthToken]:
-        """Extract authentication tokens from HTML response"""
-        try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            scripts = soup.find_all("script", string=re.compile('var accessToken = "(.*?)";'))
-            
-            if not scripts:
-                logger.error("無法找到認證Token")
-                return None
-            
-            script_content = str(scripts[0])
-            user_id = script_content.split('var user_id = ')[1].split(";")[0].strip('"')
-            access_token = script_content.split('var accessToken = "')[1].split("\";")[0]
-            
-            logger.info("成功取得認證Token")
-            return AuthToken(user_id=user_id, access_token=access_token)
-            
-        except Exception as e:
-            logger.error(f"提取認證Token失敗: {e}")
-            return None
-
-
-class CourseService:
-    """Course management service class"""
-    
-    def __init__(self, session: requests.Session):
-        self.session = session
-        self.signed_courses: set = set()
-    
-    def get_courses(self, auth_token: AuthToken) -> Optional[List[Dict]]:
-        """Get course list"""
-        try:
-            url = f"https://irs.zuvio.com.tw/course/listStudentCurrentCourses?user_id={auth_token.user_id}&accessToken={auth_token.access_token}"
-            
-            response = self.session.get(url)
-            response.raise_for_status()
-            
-            course_data = response.json()
-            
-            if not course_data.get('status'):
-                logger.error("取得課程資料失敗")
-                return None
-            
-            # Filter out Zuvio official activities
-            valid_courses = [
-                course for course in course_data.get('courses', [])
-                if "Zuvio" not in course.get('teacher_name', '')
-            ]
-            
-            logger.info(f"成功取得 {len(valid_courses)} 門課程")
-            return valid_courses
-            
-        except requests.RequestException as e:
-            logger.error(f"取得課程資料請求失敗: {e}")
-            return None
-        except json.JSONDecodeError as e:
-            logger.error(f"解析課程資料失敗: {e}")
-            return None
+    def get_schedule_settings(self) -> ScheduleSettings:
+        """Get polling schedule settings, falling back to defaults"""
+        config = self._current()
+        defaults = ScheduleSettings()
+        if 'schedule' not in config.sections():
+            return defaults
+        
+        schedule_section = config['schedule']
+        return self._keep_good('schedule', lambda: ScheduleSettings(
+            policy=schedule_section.get('policy', defaults.policy),
+            min_interval=schedule_section.getfloat('min_interval', defaults.min_interval),
+            max_interval=schedule_section.getfloat('max_interval', defaults.max_interval),
+            cold_interval=schedule_section.getfloat('cold_interval', defaults.cold_interval),
+            history_file=schedule_section.get('history_file', defaults.history_file),
+            course_refresh_interval=schedule_section.getfloat(
+                'course_refresh_interval', defaults.course_refresh_interval
+            ),
+            stale_weeks=schedule_section.getfloat('stale_weeks', defaults.stale_weeks),
+            stale_interval=schedule_section.getfloat('stale_interval', defaults.stale_interval),
+            run_history_file=schedule_section.get('run_history_file', defaults.run_history_file),
+            session_check_interval=schedule_section.getfloat(
+                'session_check_interval', defaults.session_check_interval
+            ),
+            session_refresh_lead=schedule_section.getfloat('session_refresh_lead', defaults.session_refresh_lead),
+            pipeline=schedule_section.getboolean('pipeline', defaults.pipeline),
+            fetch_workers=schedule_section.getint('fetch_workers', defaults.fetch_workers),
+            queue_size=schedule_section.getint('queue_size', defaults.queue_size),
+            event_loop=schedule_section.get('event_loop', defaults.event_loop),
+            max_cpu_percent=schedule_section.getfloat('max_cpu_percent', defaults.max_cpu_percent),
+            max_rss_mb=schedule_section.getfloat('max_rss_mb', defaults.max_rss_mb),
+            throttle_interval=schedule_section.getfloat('throttle_interval', defaults.throttle_interval),
+            event_stream=schedule_section.get('event_stream', defaults.event_stream),
+            snapshot_file=schedule_section.get('snapshot_file', defaults.snapshot_file),
+            snapshot_interval=schedule_section.getfloat('snapshot_interval', defaults.snapshot_interval),
+            transport=schedule_section.get('transport', defaults.transport),
+            http2=schedule_section.getboolean('http2', defaults.http2)
+        ), defaults)
     
-    def check_rollcall_availability(self, course_id: str) -> Optional[str]:
-        """Check if course has rollcall available"""
-        try:
-            url = f"https://irs.zuvio.com.tw/student5/irs/rollcall/{course_id}"
-            
-            response = self.session.get(url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            scripts = soup.find_all("script", string=re.compile("var rollcall_id = '(.*?)';"))
-            
-            if not scripts:
-                return None
-            
-            script_content = str(scripts[0])
-            rollcall_id = script_content.split("var rollcall_id = '")[1].split("';")[0]
-            
-            return rollcall_id if rollcall_id else None
-            
-        except Exception as e:
-            logger.error(f"檢查簽到可用性失敗 (課程ID: {course_id}): {e}")
-            return None
+    def get_notify_settings(self) -> NotifySettings:
+        """Get notification settings; no backend is configured by default"""
+        config = self._current()
+        defaults = NotifySettings()
+        if 'notify' not in config.sections():
+            return defaults
+        
+        notify_section = config['notify']
+        return self._keep_good('notify', lambda: NotifySettings(
+            webhook_url=notify_section.get('webhook_url', defaults.webhook_url),
+            command=notify_section.get('command', defaults.command),
+            batch_window=notify_section.getfloat('batch_window', defaults.batch_window),
+            max_retries=notify_section.getint('max_retries', defaults.max_retries)
+        ), defaults)
     
-    def perform_checkin(self, auth_token: AuthToken, rollcall_id: str, location: Location) -> Tuple[bool, str]:
-        """Perform check-in"""
-        try:
-            url = "https://irs.zuvio.com.tw/app_v2/makeRollcall"
-            
-            data = {
-                'user_id': auth_token.user_id,
-                'accessToken': auth_token.access_token,
-                'rollcall_id': rollcall_id,
-                'device': 'WEB',
-                'lat': location.latitude,
-                'lng': location.longitude
-            }
-            
-            response = self.session.post(url, data=data)
-            response.raise_for_status()
-            
-            result = response.json()
-            
-            if result.get('status'):
-                logger.info(f"簽到成功 (Rollcall ID: {rollcall_id})")
-                return True, "簽到成功！"
-            else:
-                error_msg = result.get('msg', '未知錯誤')
-                logger.warning(f"簽到失敗: {error_msg}")
-                return False, f"簽到失敗：{error_msg}"
-                
-        except requests.RequestException as e:
-            logger.error(f"簽到請求失敗: {e}")
-            return False, f"簽到請求失敗：{e}"
-        except json.JSONDecodeError as e:
-            logger.error(f"解析簽到回應失敗: {e}")
-            return False, f"解析簽到回應失敗：{e}"
+    def get_course_filter(self) -> CourseFilter:
+        """Get course selection rules, compiled once per configuration load"""
+        with self._lock:
+            config = self._current()
+            if self._course_filter is None:
+                if 'courses' in config.sections():
+                    courses_section = config['courses']
+                    self._course_filter = self._keep_good('courses', lambda: CourseFilter.from_text(
+                        include=courses_section.get('include', ''),
+                        exclude=courses_section.get('exclude', DEFAULT_EXCLUDE)
+                    ), CourseFilter.from_text())
+                else:
+                    self._course_filter = CourseFilter.from_text()
+            return self._course_filter
 
 
 class ZuvioAutoChecker:
     """Zuvio auto check-in main class"""
     
-    def __init__(self):
+    # How long a checked-in course is skipped before it is polled again
+    checkin_cooldown = timedelta(hours=12)
+
+    def __init__(self, clock: Optional[Clock] = None, scheduler: Optional[PollScheduler] = None,
+                 base_url: str = ZUVIO_BASE_URL):
         self.config_manager = ConfigManager()
-        self.auth_service = AuthService()
+        self.base_url = base_url
+        self.auth_service = AuthService(base_url)
         self.course_service = None
+        self.auth_token: Optional[AuthToken] = None
+        # Check-in location; edits to config.ini replace it while running
+        self.location: Optional[Location] = None
+        self.course_refresher: Optional[CourseRefresher] = None
+        self.run_history: Optional[RunHistory] = None
+        self.schedule_settings: Optional[ScheduleSettings] = None
+        self.rollcall_history: Optional[RollcallHistory] = None
+        self.session_monitor: Optional[SessionMonitor] = None
+        self.courses: List[Dict] = []
+        self.pipeline: Optional[PollingPipeline] = None
+        self.events: Optional[EventStream] = None
+        self.notifiers: List[Notifier] = []
+        self.snapshot: Optional[StateSnapshot] = None
+        # Course ID -> time of the last final check-in outcome
+        self.checked_in: Dict[str, datetime] = {}
+        self.checkin_retries = CheckinRetries()
+        self.clock = clock or SystemClock()
+        self.metrics = Metrics(self.clock)
+        self.scheduler = scheduler or UniformPollScheduler()
+        self.scheduler_configured = scheduler is not None
+        self.bandwidth = BandwidthMeter(self.clock)
+        self.bandwidth.attach(self.auth_service.session)
         self.running = True
     
+    def setup_transport(self) -> None:
+        """Switch the HTTP client when the config asks for one other than requests"""
+        settings = self.config_manager.get_schedule_settings()
+        if settings.transport == 'requests':
+            return
+        self.auth_service = AuthService(
+            self.base_url, transport=create_transport(settings.transport, http2=settings.http2)
+        )
+        self.bandwidth.attach(self.auth_service.session)
+        logger.info(f"使用 {settings.transport} HTTP 傳輸")
+    
     def setup_user_credentials(self) -> UserCredentials:
         """Setup user credentials"""
         credentials = self.config_manager.get_user_credentials()
@@ -350,6 +443,173 @@ class ZuvioAutoChecker:
         
         return location
     
+    def create_scheduler(self) -> PollScheduler:
+        """Create the polling scheduler configured in config.ini"""
+        settings = self.config_manager.get_schedule_settings()
+        history = RollcallHistory(settings.history_file)
+        self.rollcall_history = history
+        
+        if settings.policy == 'predictive':
+            scheduler = PredictiveScheduler(
+                history, settings.min_interval, settings.max_interval, settings.cold_interval
+            )
+        else:
+            if settings.policy != 'uniform':
+                logger.warning(f"未知的排程策略 {settings.policy}，改用 uniform")
+            scheduler = UniformPollScheduler(settings.min_interval, settings.max_interval)
+        
+        if settings.stale_weeks > 0:
+            scheduler = DemotingScheduler(
+                scheduler, history, timedelta(weeks=settings.stale_weeks), settings.stale_interval
+            )
+        
+        budget = ResourceBudget(settings.max_cpu_percent, settings.max_rss_mb, clock=self.clock)
+        if budget.enabled:
+            scheduler = ThrottlingScheduler(
+                scheduler, history, budget, settings.throttle_interval, on_change=self.on_throttle_change
+            )
+        # Only once every part was built, so a rejected edit is tried again after the next one
+        self.schedule_settings = settings
+        return scheduler
+    
+    def apply_config_changes(self) -> None:
+        """Apply course rules and schedule settings edited in config.ini while running"""
+        if self.course_service:
+            self.course_service.set_course_filter(self.config_manager.get_course_filter())
+            if self.course_refresher:
+                added, removed = self.course_refresher.refresh_once()
+            else:
+                # No background refresher; re-fetch under the new rules here
+                latest = self.course_service.get_courses(self.auth_token)
+                added, removed = update_courses(self.courses, latest) if latest is not None else ([], [])
+            logger.info(f"已套用新的課程規則：新增 {len(added)} 門，移除 {len(removed)} 門")
+        
+        location = self.config_manager.get_location()
+        if location and location != self.location:
+            self.location = location
+            if self.pipeline:
+                self.pipeline.location = location
+            logger.info("已套用新的簽到位置")
+        
+        if not self.scheduler_configured and self.config_manager.get_schedule_settings() != self.schedule_settings:
+            self.scheduler = self.create_scheduler()
+            if self.pipeline:
+                self.pipeline.scheduler = self.scheduler
+            logger.info("已套用新的輪詢排程設定")
+    
+    def on_throttle_change(self, throttling: bool, budget: ResourceBudget) -> None:
+        """Publish throttling changes as backoff events"""
+        self.emit('backoff', reason='resource_budget', active=throttling,
+                  cpu_percent=round(budget.cpu_percent, 1),
+                  rss_mb=round(budget.rss_mb, 1) if budget.rss_mb is not None else None)
+    
+    def start_course_refresher(self, courses: List[Dict]) -> None:
+        """Start refreshing the polled course list in place on the configured interval"""
+        interval = self.config_manager.get_schedule_settings().course_refresh_interval
+        if interval <= 0:
+            return
+        
+        self.course_refresher = CourseRefresher(
+            self.course_service, lambda: self.auth_token, courses, interval
+        )
+        self.course_refresher.start()
+    
+    def relogin(self) -> bool:
+        """Log in again with the saved credentials and replace the shared token"""
+        credentials = self.config_manager.get_user_credentials()
+        auth_token = self.auth_service.login(credentials) if credentials else None
+        self.emit('auth_refresh', success=auth_token is not None)
+        if not auth_token:
+            return False
+        self.auth_token = auth_token
+        return True
+    
+    def emit(self, event: str, **fields) -> None:
+        """Publish an event to the event stream and check-in results to the notifiers"""
+        if self.events:
+            self.events.emit(event, **fields)
+        if event == 'checkin':
+            for notifier in self.notifiers:
+                notifier.notify(dict(fields, checked_in_at=self.clock.now().isoformat()))
+    
+    def start_notifiers(self) -> None:
+        """Start a notifier for each configured backend"""
+        settings = self.config_manager.get_notify_settings()
+        backends = []
+        if settings.webhook_url:
+            backends.append(WebhookBackend(settings.webhook_url))
+        if settings.command:
+            backends.append(CommandBackend(settings.command))
+        self.notifiers = [
+            Notifier(backend, batch_window=settings.batch_window, max_retries=settings.max_retries).start()
+            for backend in backends
+        ]
+    
+    def probe_session(self) -> Optional[bool]:
+        """Check the session against the rollcall page of a polled course"""
+        if not self.courses:
+            return None
+        return self.auth_service.check_session(
+            f"{self.base_url}/student5/irs/rollcall/{self.courses[0]['course_id']}"
+        )
+    
+    def next_rollcall_window(self, now: datetime) -> Optional[datetime]:
+        """Get the earliest predicted rollcall window start across polled courses"""
+        if not self.rollcall_history:
+            return None
+        starts = [self.rollcall_history.next_hot_start(course['course_id'], now) for course in list(self.courses)]
+        starts = [start for start in starts if start is not None]
+        return min(starts) if starts else None
+    
+    def start_session_monitor(self, courses: List[Dict]) -> None:
+        """Start probing the session on the configured interval"""
+        settings = self.config_manager.get_schedule_settings()
+        if settings.session_check_interval <= 0:
+            return
+        
+        self.courses = courses
+        self.session_monitor = SessionMonitor(
+            self.probe_session, self.relogin, settings.session_check_interval,
+            self.next_rollcall_window, settings.session_refresh_lead, self.clock
+        )
+        self.session_monitor.start()
+    
+    def on_cycle(self) -> None:
+        """Per-cycle housekeeping: apply config edits and save a due state snapshot"""
+        # Cheap mtime/size check; listeners apply edited settings
+        self.config_manager.reload_if_changed()
+        if self.snapshot:
+            self.snapshot.save_if_due(self.snapshot_state, self.clock.now())
+    
+    def snapshot_state(self) -> Dict:
+        """Collect the learned runtime state for a warm restart"""
+        return {
+            'scheduler': self.scheduler.snapshot_state(),
+            'checked_in': {course_id: when.isoformat() for course_id, when in dict(self.checked_in).items()},
+            'courses': self.course_service.snapshot_state() if self.course_service else {},
+            'run_history': self.run_history.snapshot_state() if self.run_history else {},
+        }
+    
+    def restore_snapshot(self) -> bool:
+        """Load the last valid snapshot into the scheduler, cooldowns and caches"""
+        state = self.snapshot.load(self.clock.now()) if self.snapshot else None
+        if state is None:
+            return False
+        try:
+            self.scheduler.restore_state(state.get('scheduler', {}))
+            self.checked_in.update(
+                {course_id: datetime.fromisoformat(when) for course_id, when in state.get('checked_in', {}).items()}
+            )
+            if self.course_service:
+                self.course_service.restore_state(state.get('courses', {}))
+            if self.run_history:
+                self.run_history.restore_state(state.get('run_history', {}))
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            logger.warning(f"套用狀態快照失敗，以初始狀態啟動: {e}")
+            return False
+        logger.info("已從狀態快照恢復執行狀態")
+        return True
+    
     def display_courses(self, courses: List[Dict]) -> None:
         """Display course list"""
         print(f"今天是 {datetime.today().strftime('%Y/%m/%d')}")
@@ -360,39 +620,100 @@ class ZuvioAutoChecker:
     
     def run_checkin_loop(self, auth_token: AuthToken, courses: List[Dict], location: Location) -> None:
         """Execute check-in loop"""
-        already_checked = []
+        self.auth_token = auth_token
+        self.location = location
+        status = StatusLine(self.metrics, self.clock)
         
         while self.running:
+            status.start_cycle()
+            self.on_cycle()
             has_course_available = False
-            
-            for course in courses:
-                if course in already_checked:
+            now = self.clock.now()
+            
+            # Snapshot the list; the course refresher may replace its contents
+            for course in self.scheduler.due_courses(list(courses), now):
+                course_id = course['course_id']
+                checked_at = self.checked_in.get(course_id)
+                if checked_at and now - checked_at < self.checkin_cooldown:
+                    self.scheduler.defer(course_id, checked_at + self.checkin_cooldown)
                     continue
                 
-                rollcall_id = self.course_service.check_rollcall_availability(course['course_id'])
+                if self.events:
+                    self.events.emit('poll_started', course_id=course_id)
+                started = self.clock.monotonic()
+                rollcall_id = self.course_service.check_rollcall_availability(course_id)
+                elapsed = self.clock.monotonic() - started
+                status.course_polled(course.get('course_name') or course_id, elapsed)
+                if self.events:
+                    self.events.emit(
+                        'poll_finished', course_id=course_id, rollcall_open=rollcall_id is not None,
+                        error=self.course_service.last_error, duration_ms=round(elapsed * 1000, 1)
+                    )
+                self.scheduler.record_poll(course_id, now, rollcall_id is not None)
+                if self.run_history:
+                    self.run_history.record_poll(
+                        course_id, now, rollcall_id, self.course_service.last_error
+                    )
                 
                 if rollcall_id:
+                    self.emit('rollcall_detected', course_id=course_id,
+                              course_name=course['course_name'], rollcall_id=rollcall_id)
+                    if not self.checkin_retries.ready(rollcall_id, now):
+                        continue
+                    # The session monitor may have replaced the token since the loop started
                     success, message = self.course_service.perform_checkin(
-                        auth_token, rollcall_id, location
+                        self.auth_token, rollcall_id, self.location
                     )
+                    has_course_available = True
+                    if not success and is_transient(self.course_service.last_checkin_error):
+                        retry_at = self.checkin_retries.record_failure(rollcall_id, self.clock.now())
+                        if retry_at:
+                            self.emit('backoff', course_id=course_id, reason='checkin_retry',
+                                      until=retry_at.isoformat())
+                            continue
+                    self.checkin_retries.clear(rollcall_id)
+                    
+                    self.emit('checkin', course_id=course_id, course_name=course['course_name'],
+                              rollcall_id=rollcall_id, success=success, message=message)
+                    if self.run_history:
+                        self.run_history.record_checkin(
+                            course, rollcall_id, self.clock.now(), success, message,
+                            self.course_service.last_checkin_error
+                        )
                     
                     print(f"{course['course_name']} - {message}")
-                    has_course_available = True
                     
-                    # Add checked-in courses to the already checked list
-                    already_checked.append(course)
+                    # Skip the course until the cooldown expires; a failure the server reported is final
+                    self.checked_in[course_id] = self.clock.now()
+                    self.emit('backoff', course_id=course_id, reason='cooldown',
+                              until=(self.checked_in[course_id] + self.checkin_cooldown).isoformat())
             
             if not has_course_available:
-                current_time = datetime.now().strftime('%H:%M:%S')
-                print(f"{current_time} 尚未有課程開放簽到", end='\r')
+                status.draw(self.clock.now())
             
-            # Random wait 1-5 seconds
-            time.sleep(random.randint(1, 5))
+            delay = self.scheduler.next_delay(now)
+            status.record_sleep(delay)
+            self.clock.sleep(delay)
+    
+    def run_pipeline(self, auth_token: AuthToken, courses: List[Dict], location: Location) -> None:
+        """Execute the check-in loop as a staged pipeline with bounded queues"""
+        settings = self.config_manager.get_schedule_settings()
+        self.auth_token = auth_token
+        self.location = location
+        self.pipeline = PollingPipeline(
+            self.course_service, self.scheduler, location, lambda: self.auth_token,
+            clock=self.clock, fetch_workers=settings.fetch_workers, queue_size=settings.queue_size,
+            cooldown=self.checkin_cooldown, run_history=self.run_history, metrics=self.metrics,
+            describe_error=failure_cause, on_cycle=self.on_cycle, emit=self.emit, checked=self.checked_in,
+            retries=self.checkin_retries
+        )
+        self.pipeline.run(courses, lambda: self.running)
     
     def run(self) -> None:
         """Execute main program"""
         try:
             logger.info("啟動 Zuvio 自動簽到系統")
+            self.setup_transport()
             
             # Setup user credentials
             credentials = self.setup_user_credentials()
@@ -402,12 +723,34 @@ class ZuvioAutoChecker:
             if not auth_token:
                 print("登入測試失敗，程式結束")
                 return
+            self.auth_token = auth_token
             
             # After successful login, setup location information
             location = self.setup_location()
             
+            if not self.scheduler_configured:
+                self.scheduler = self.create_scheduler()
+            
+            settings = self.config_manager.get_schedule_settings()
+            if settings.run_history_file:
+                self.run_history = RunHistory(settings.run_history_file)
+            if settings.event_stream:
+                self.events = EventStream(settings.event_stream, self.clock).start()
+            self.start_notifiers()
+            
             # Initialize course service
-            self.course_service = CourseService(self.auth_service.session)
+            self.course_service = CourseService(
+                self.auth_service.session, self.config_manager.get_course_filter(), self.base_url,
+                metrics=self.metrics
+            )
+            
+            # Warm restart: restore what the last run learned before fetching courses
+            if settings.snapshot_file:
+                self.snapshot = StateSnapshot(
+                    settings.snapshot_file, {'user_id': auth_token.user_id, 'base_url': self.base_url},
+                    settings.snapshot_interval
+                )
+                self.restore_snapshot()
             
             # Get course list
             courses = self.course_service.get_courses(auth_token)
@@ -418,9 +761,18 @@ class ZuvioAutoChecker:
             # Display course list
             self.display_courses(courses)
             
+            # Keep the course list current in the background
+            self.courses = courses
+            self.start_course_refresher(courses)
+            self.start_session_monitor(courses)
+            self.config_manager.add_reload_listener(self.apply_config_changes)
+            
             # Start check-in loop
             print("\n開始監控簽到...")
-            self.run_checkin_loop(auth_token, courses, location)
+            if self.config_manager.get_schedule_settings().pipeline:
+                self.run_pipeline(auth_token, courses, location)
+            else:
+                self.run_checkin_loop(auth_token, courses, location)
             
         except KeyboardInterrupt:
             logger.info("使用者中斷程式")
@@ -428,11 +780,111 @@ class ZuvioAutoChecker:
         except Exception as e:
             logger.error(f"程式執行過程中發生未預期的錯誤: {e}")
             print(f"程式執行失敗：{e}")
+        finally:
+            if self.course_refresher:
+                self.course_refresher.stop()
+            if self.session_monitor:
+                self.session_monitor.stop()
+            if self.run_history:
+                self.run_history.flush(self.clock.now())
+            if self.snapshot:
+                self.snapshot.save(self.snapshot_state(), self.clock.now())
+            logger.info("\n" + self.bandwidth.report())
+            for notifier in self.notifiers:
+                notifier.close()
+            if self.events:
+                self.events.close()
+
 
+def watch(config_manager: Optional[ConfigManager] = None, event_loop: Optional[str] = None) -> int:
+    """Non-interactive check-in using saved settings and the async client"""
+    
+    config_manager = config_manager or ConfigManager()
+    credentials = config_manager.get_user_credentials()
+    location = config_manager.get_location()
+    if not credentials or not location:
+        print("尚未設定帳號或位置資訊，請先執行 python main.py 完成設定")
+        return 1
+    
+    settings = config_manager.get_schedule_settings()
+    
+    def print_result(event, success: bool, message: str) -> None:
+        print(f"{event.course['course_name']} - {message}")
+    
+    async def run_client() -> int:
+        transport = create_transport(settings.transport, http2=settings.http2)
+        async with ZuvioClient(course_filter=config_manager.get_course_filter(), transport=transport) as client:
+            if not await client.login(credentials):
+                print("登入失敗")
+                return 1
+            courses = await client.list_courses()
+            if not courses:
+                print("無法取得課程資料")
+                return 1
+            print(f"開始監控 {len(courses)} 門課程的簽到...")
+            await auto_check_in(client, courses, location, on_result=print_result)
+            return 0
+    
+    return event_loops.run(run_client(), event_loop or settings.event_loop)
 
-def main():
+
+def report(history_file: Optional[str] = None, output_format: str = 'text',
+           table: str = 'courses', output: Optional[str] = None) -> int:
+    """Print detection-latency analytics computed from the run history"""
+    history_file = history_file or ConfigManager().get_schedule_settings().run_history_file
+    records = load_records(history_file)
+    if not records:
+        print(f"找不到執行歷史：{history_file}")
+        return 1
+    
+    run_report = build_report(records)
+    content = format_csv(run_report, table) if output_format == 'csv' else format_text(run_report)
+    if output:
+        with open(output, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+        print(f"報告已輸出至 {output}")
+    else:
+        print(content)
+    return 0
+
+
+def setup_logging() -> None:
+    """Log to zuvio.log and the console
+    
+    Only the command-line entry point calls this, so importing the module
+    (e.g. through client) leaves the host program's logging alone.
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('zuvio.log', encoding='utf-8'),
+            logging.StreamHandler()
+        ]
+    )
+
+
+def main(argv: Optional[List[str]] = None):
     """Main function"""
+    parser = argparse.ArgumentParser(description='Zuvio 自動簽到系統')
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.add_parser('run', help='互動式設定並開始監控簽到（預設）')
+    watch_parser = subparsers.add_parser('watch', help='使用已儲存的設定，以非互動模式監控簽到')
+    watch_parser.add_argument('--loop', choices=event_loops.EVENT_LOOPS,
+                              help='事件迴圈實作（預設讀取 config.ini，auto 會優先使用 uvloop）')
+    report_parser = subparsers.add_parser('report', help='從執行歷史計算簽到延遲與請求效率')
+    report_parser.add_argument('--history', help='執行歷史檔案（預設讀取 config.ini 設定）')
+    report_parser.add_argument('--format', choices=['text', 'csv'], default='text', help='輸出格式')
+    report_parser.add_argument('--table', choices=['courses', 'failures'], default='courses',
+                               help='CSV 輸出的資料表')
+    report_parser.add_argument('--output', help='輸出檔案（預設輸出至終端機）')
+    args = parser.parse_args(argv or [])
+    
     try:
+        if args.command == 'watch':
+            return watch(event_loop=args.loop)
+        if args.command == 'report':
+            return report(args.history, args.format, args.table, args.output)
         app = ZuvioAutoChecker()
         app.run()
     except KeyboardInterrupt:
@@ -442,4 +894,5 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    setup_logging()
+    sys.exit(main(sys.argv[1:]))
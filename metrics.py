@@ -0,0 +1,75 @@
+"""
+In-process metrics for the check-in loop
+"""
+
+import contextlib
+import threading
+from typing import Callable, Dict, Iterator, Optional
+
+from clock import Clock, SystemClock
+
+
+class Metrics:
+    """Thread-safe counters and gauges
+
+    Gauges are either set directly or sampled from a callable (e.g. a
+    queue's qsize) each time a snapshot is taken. Timers add elapsed
+    monotonic seconds from `clock` to a counter.
+    """
+
+    def __init__(self, clock: Optional[Clock] = None):
+        self.clock = clock or SystemClock()
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+        self._samplers: Dict[str, Callable[[], float]] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, amount: float = 1) -> None:
+        """Add to a counter"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    @contextlib.contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        """Add the seconds spent in the block to a counter, even if it raises"""
+        started = self.clock.monotonic()
+        try:
+            yield
+        finally:
+            self.inc(name, self.clock.monotonic() - started)
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """Set a gauge to a value"""
+        with self._lock:
+            self._gauges[name] = value
+
+    def max_gauge(self, name: str, value: float) -> None:
+        """Raise a high-water-mark gauge to value if it is larger"""
+        with self._lock:
+            if value > self._gauges.get(name, float('-inf')):
+                self._gauges[name] = value
+
+    def register(self, name: str, sampler: Callable[[], float]) -> None:
+        """Sample a gauge from a callable whenever a snapshot is taken"""
+        with self._lock:
+            self._samplers[name] = sampler
+
+    def get(self, name: str) -> float:
+        """Get the current value of a counter or gauge"""
+        return self.snapshot().get(name, 0)
+
+    def snapshot(self) -> Dict[str, float]:
+        """Get all counters and gauges"""
+        with self._lock:
+            values = dict(self._counters)
+            values.update(self._gauges)
+            samplers = dict(self._samplers)
+        for name, sampler in samplers.items():
+            values[name] = sampler()
+        return values
+
+    def format(self) -> str:
+        """Format a snapshot as space-separated name=value pairs"""
+        return " ".join(
+            f"{name}={value:g}" for name, value in sorted(self.snapshot().items())
+        )
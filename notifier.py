@@ -0,0 +1,145 @@
+"""
+Check-in result notifications
+
+Results are queued without blocking and delivered by a background
+worker, so a slow or failing endpoint never holds up polling. Results
+arriving within `batch_window` seconds of each other are sent together;
+failed deliveries are retried with exponential backoff and dropped
+after `max_retries`.
+"""
+
+import json
+import logging
+import queue
+import shlex
+import subprocess
+import threading
+from typing import Dict, List, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+def format_summary(results: List[Dict]) -> str:
+    """Format a batch of check-in results as one line per result"""
+    return "\n".join(f"{result['course_name']} - {result['message']}" for result in results)
+
+
+class WebhookBackend:
+    """POST each batch as JSON to a URL
+
+    The body is `{"text": <summary>, "results": [...]}`, which chat
+    webhooks display as-is and scripts can parse.
+    """
+
+    def __init__(self, url: str, timeout: float = 10.0, session: Optional[requests.Session] = None):
+        self.url = url
+        self.timeout = timeout
+        self.session = session or requests.Session()
+
+    def __str__(self) -> str:
+        return f"webhook {self.url}"
+
+    def send(self, results: List[Dict]) -> None:
+        response = self.session.post(
+            self.url, json={'text': format_summary(results), 'results': results}, timeout=self.timeout
+        )
+        response.raise_for_status()
+
+
+class CommandBackend:
+    """Run a local command with each batch as a JSON array on stdin"""
+
+    def __init__(self, command: str, timeout: float = 30.0):
+        self.args = shlex.split(command)
+        if not self.args:
+            raise ValueError("Notification command must not be empty")
+        self.timeout = timeout
+
+    def __str__(self) -> str:
+        return f"command {self.args[0]}"
+
+    def send(self, results: List[Dict]) -> None:
+        subprocess.run(
+            self.args, input=json.dumps(results, ensure_ascii=False).encode('utf-8'),
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=self.timeout, check=True
+        )
+
+
+class Notifier:
+    """Deliver check-in results to one backend from a background worker"""
+
+    def __init__(self, backend, batch_window: float = 2.0, max_batch: int = 50, max_retries: int = 5,
+                 retry_base: float = 1.0, retry_max: float = 60.0, max_pending: int = 1000):
+        self.backend = backend
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.sent = 0
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'Notifier':
+        """Start the background worker"""
+        if self._thread and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="notifier", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Deliver what is queued (one attempt each) and stop the worker"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def notify(self, result: Dict) -> None:
+        """Queue a check-in result without blocking"""
+        try:
+            self._queue.put_nowait(result)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            try:
+                batch = [self._queue.get(timeout=0.2)]
+            except queue.Empty:
+                if self._stop.is_set():
+                    return
+                continue
+            # Gather the rest of a burst; a check-in often opens for several courses at once
+            self._stop.wait(self.batch_window)
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._deliver(batch)
+
+    def _deliver(self, batch: List[Dict]) -> None:
+        attempt = 0
+        while True:
+            try:
+                self.backend.send(batch)
+                self.sent += len(batch)
+                return
+            except (requests.RequestException, subprocess.SubprocessError, OSError) as e:
+                attempt += 1
+                if attempt > self.max_retries or self._stop.is_set():
+                    self.dropped += len(batch)
+                    logger.error(f"通知傳送失敗，已放棄 {len(batch)} 筆結果 ({self.backend}): {e}")
+                    return
+                delay = min(self.retry_max, self.retry_base * 2 ** (attempt - 1))
+                logger.warning(f"通知傳送失敗 ({self.backend})，{delay:.0f} 秒後重試: {e}")
+                if self._stop.wait(delay):
+                    self.dropped += len(batch)
+                    logger.error(f"程式結束，未送出 {len(batch)} 筆通知 ({self.backend})")
+                    return
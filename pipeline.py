@@ -0,0 +1,338 @@
+"""
+Staged polling pipeline with bounded queues
+
+fetch -> extract -> check-in -> report, each stage on its own thread(s)
+connected by bounded queues. Downstream stages apply backpressure by
+blocking; the dispatcher never blocks, so polls that do not fit in the
+fetch queue are dropped (and retried next cycle) and polls of a course
+still in flight are merged into the pending one.
+"""
+
+import logging
+import queue
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Set
+
+from checkin_retry import CheckinRetries, is_transient
+from clock import Clock, SystemClock
+from metrics import Metrics
+from status_line import StatusLine
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('fetch', 'extract', 'checkin', 'report')
+
+
+@dataclass
+class PollJob:
+    """A scheduled rollcall poll"""
+    course: Dict
+    polled_at: datetime
+
+
+@dataclass
+class PollResult:
+    """Outcome of one rollcall poll"""
+    course: Dict
+    polled_at: datetime
+    content: Optional[bytes] = None
+    rollcall_id: Optional[str] = None
+    error: Optional[str] = None
+    # Seconds spent fetching the rollcall page
+    duration: float = 0.0
+
+
+@dataclass
+class CheckinResult:
+    """Outcome of one check-in attempt"""
+    course: Dict
+    rollcall_id: str
+    success: bool
+    message: str
+    checked_in_at: datetime
+    # Set when a transient failure will be retried; the outcome is not final yet
+    retry_at: Optional[datetime] = None
+    # Classified failure cause for run history; None after a success
+    cause: Optional[str] = None
+
+
+class PollingPipeline:
+    """Run the check-in loop as bounded stages
+
+    `course_service` provides fetch_rollcall_page, extract_rollcall_id and
+    perform_checkin. The scheduler and cooldown state are only touched
+    under one lock, by the dispatcher and the report stage.
+    """
+
+    def __init__(self, course_service, scheduler, location, get_auth_token: Callable,
+                 clock: Optional[Clock] = None, fetch_workers: int = 4, queue_size: int = 16,
+                 cooldown: timedelta = timedelta(hours=12), run_history=None,
+                 metrics: Optional[Metrics] = None,
+                 describe_error: Callable[[Exception], str] = lambda e: type(e).__name__,
+                 on_cycle: Optional[Callable[[], object]] = None,
+                 emit: Optional[Callable[..., None]] = None,
+                 checked: Optional[Dict[str, datetime]] = None, stats_interval: float = 300.0,
+                 retries: Optional[CheckinRetries] = None):
+        if fetch_workers < 1 or queue_size < 1:
+            raise ValueError("Pipeline needs at least one fetch worker and a queue size of at least 1")
+        self.course_service = course_service
+        self.scheduler = scheduler
+        self.location = location
+        self.get_auth_token = get_auth_token
+        self.clock = clock or SystemClock()
+        self.fetch_workers = fetch_workers
+        self.cooldown = cooldown
+        self.run_history = run_history
+        self.metrics = metrics or Metrics(self.clock)
+        self.describe_error = describe_error
+        self.on_cycle = on_cycle
+        self.emit = emit or (lambda event, **fields: None)
+        self.retries = retries or CheckinRetries()
+        # Seconds between queue and poll statistics in the log
+        self.stats_interval = stats_interval
+        self.status = StatusLine(self.metrics, self.clock)
+        self.queues: Dict[str, queue.Queue] = {name: queue.Queue(maxsize=queue_size) for name in STAGES}
+        for name, stage_queue in self.queues.items():
+            self.metrics.register(f"queue.{name}.depth", stage_queue.qsize)
+        # Course ID -> time of the last check-in; may be shared with the caller
+        self._checked: Dict[str, datetime] = checked if checked is not None else {}
+        self._in_flight: Set[str] = set()
+        self._last_queued: Dict[str, datetime] = {}
+        self._checked_in = False
+        self._dropping = False
+        self._lock = threading.Lock()
+        self._stops: Dict[str, threading.Event] = {}
+        self._threads: Dict[str, List[threading.Thread]] = {}
+
+    def start(self) -> None:
+        """Start the stage threads"""
+        handlers = {
+            'fetch': self._fetch, 'extract': self._extract,
+            'checkin': self._check_in, 'report': self._report
+        }
+        for name in STAGES:
+            stop = threading.Event()
+            count = self.fetch_workers if name == 'fetch' else 1
+            threads = [
+                threading.Thread(target=self._run_stage, args=(name, handlers[name], stop),
+                                 name=f"pipeline-{name}-{index}", daemon=True)
+                for index in range(count)
+            ]
+            self._stops[name] = stop
+            self._threads[name] = threads
+            for thread in threads:
+                thread.start()
+
+    def stop(self) -> None:
+        """Stop the stages in order, letting each drain what upstream already produced
+
+        Polls still waiting for a fetch worker are discarded.
+        """
+        fetch_queue = self.queues['fetch']
+        while True:
+            try:
+                fetch_queue.get_nowait()
+            except queue.Empty:
+                break
+            fetch_queue.task_done()
+        for name in STAGES:
+            if name not in self._stops:
+                continue
+            self._stops[name].set()
+            for thread in self._threads[name]:
+                thread.join()
+        self._stops.clear()
+        self._threads.clear()
+        self.log_stats()
+
+    def log_stats(self) -> None:
+        """Log queue depths, high-water marks and poll counts"""
+        logger.info(f"輪詢管線統計: {self.metrics.format()}")
+
+    def wait_idle(self) -> None:
+        """Block until every queued poll has passed through all stages"""
+        for name in STAGES:
+            self.queues[name].join()
+
+    def run(self, courses: List[Dict], is_running: Callable[[], bool]) -> None:
+        """Dispatch due polls every cycle until is_running() turns False"""
+        self.start()
+        stats_logged = self.clock.monotonic()
+        try:
+            while is_running():
+                self.status.start_cycle()
+                if self.on_cycle:
+                    self.on_cycle()
+                now = self.clock.now()
+                self.dispatch(courses, now)
+                if self.clock.monotonic() - stats_logged >= self.stats_interval:
+                    self.log_stats()
+                    stats_logged = self.clock.monotonic()
+
+                with self._lock:
+                    checked_in, self._checked_in = self._checked_in, False
+                    delay = self.scheduler.next_delay(now)
+                if not checked_in:
+                    self.status.draw(self.clock.now())
+                self.status.record_sleep(delay)
+                self.clock.sleep(delay)
+        finally:
+            self.stop()
+
+    def dispatch(self, courses: List[Dict], now: datetime) -> int:
+        """Queue polls for the due courses without blocking; returns the number queued"""
+        # Snapshot the list; the course refresher may replace its contents
+        with self._lock:
+            due = self.scheduler.due_courses(list(courses), now)
+        # Least recently queued first, so drops rotate instead of starving the tail of the list
+        due.sort(key=lambda course: self._last_queued.get(course['course_id'], datetime.min))
+
+        queued = dropped = 0
+        fetch_queue = self.queues['fetch']
+        for course in due:
+            course_id = course['course_id']
+            with self._lock:
+                checked_at = self._checked.get(course_id)
+                if checked_at and now - checked_at < self.cooldown:
+                    self.scheduler.defer(course_id, checked_at + self.cooldown)
+                    continue
+                if course_id in self._in_flight:
+                    self.metrics.inc('polls.merged')
+                    continue
+                self._in_flight.add(course_id)
+            try:
+                fetch_queue.put_nowait(PollJob(course, now))
+            except queue.Full:
+                with self._lock:
+                    self._in_flight.discard(course_id)
+                self.emit('backoff', course_id=course_id, reason='queue_full')
+                dropped += 1
+                continue
+            self._last_queued[course_id] = now
+            queued += 1
+
+        self.metrics.inc('polls.dispatched', queued)
+        self.metrics.max_gauge('queue.fetch.max_depth', fetch_queue.qsize())
+        if dropped:
+            self.metrics.inc('polls.dropped', dropped)
+            if not self._dropping:
+                logger.warning(f"輪詢佇列已滿，本輪略過 {dropped} 次輪詢")
+        self._dropping = bool(dropped)
+        return queued
+
+    def _run_stage(self, name: str, handle: Callable, stop: threading.Event) -> None:
+        source = self.queues[name]
+        while True:
+            try:
+                item = source.get(timeout=0.1)
+            except queue.Empty:
+                if stop.is_set():
+                    return
+                continue
+            try:
+                handle(item)
+            except Exception as e:
+                logger.error(f"輪詢管線 {name} 階段失敗: {e}")
+            finally:
+                source.task_done()
+
+    def _put(self, name: str, item) -> None:
+        # Blocking put: a slow downstream stage holds back the stages feeding it
+        self.queues[name].put(item)
+        self.metrics.max_gauge(f"queue.{name}.max_depth", self.queues[name].qsize())
+
+    def _fetch(self, job: PollJob) -> None:
+        course_id = job.course['course_id']
+        self.emit('poll_started', course_id=course_id)
+        started = self.clock.monotonic()
+        try:
+            content = self.course_service.fetch_rollcall_page(course_id)
+            result = PollResult(job.course, job.polled_at, content=content)
+        except Exception as e:
+            logger.error(f"檢查簽到可用性失敗 (課程ID: {course_id}): {e}")
+            result = PollResult(job.course, job.polled_at, error=self.describe_error(e))
+        result.duration = self.clock.monotonic() - started
+        self.status.course_polled(job.course.get('course_name') or course_id, result.duration)
+        self._put('extract', result)
+
+    def _extract(self, result: PollResult) -> None:
+        if result.content is not None:
+            try:
+                with self.metrics.timed('time.parse'):
+                    result.rollcall_id = self.course_service.extract_rollcall_id(result.content)
+            except Exception as e:
+                logger.error(f"解析點名頁面失敗 (課程ID: {result.course['course_id']}): {e}")
+                result.error = self.describe_error(e)
+            # Release the page body as soon as it is parsed
+            result.content = None
+        # Report the poll before the check-in so history sees them in order
+        self._put('report', result)
+        if result.rollcall_id:
+            self.emit('rollcall_detected', course_id=result.course['course_id'],
+                      course_name=result.course['course_name'], rollcall_id=result.rollcall_id)
+            self._put('checkin', result)
+
+    def _check_in(self, result: PollResult) -> None:
+        if not self.retries.ready(result.rollcall_id, self.clock.now()):
+            with self._lock:
+                self._in_flight.discard(result.course['course_id'])
+            return
+        try:
+            success, message = self.course_service.perform_checkin(
+                self.get_auth_token(), result.rollcall_id, self.location
+            )
+            cause = self.course_service.last_checkin_error
+        except Exception as e:
+            # Still report a result, or the course would stay in flight and never be polled again
+            logger.error(f"簽到失敗 (課程ID: {result.course['course_id']}): {e}")
+            success, message, cause = False, f"簽到失敗：{e}", self.describe_error(e)
+        now = self.clock.now()
+        retry_at = None
+        if not success and is_transient(cause):
+            retry_at = self.retries.record_failure(result.rollcall_id, now)
+        if retry_at is None:
+            self.retries.clear(result.rollcall_id)
+        self._put('report', CheckinResult(
+            result.course, result.rollcall_id, success, message, now, retry_at, cause
+        ))
+
+    def _report(self, item) -> None:
+        course_id = item.course['course_id']
+        if isinstance(item, PollResult):
+            with self._lock:
+                self.scheduler.record_poll(course_id, item.polled_at, item.rollcall_id is not None)
+                # A course with an open rollcall stays in flight until its check-in is reported
+                if not item.rollcall_id:
+                    self._in_flight.discard(course_id)
+            self.emit('poll_finished', course_id=course_id, rollcall_open=item.rollcall_id is not None,
+                      error=item.error, duration_ms=round(item.duration * 1000, 1))
+            self.metrics.inc('polls.completed')
+            if item.error:
+                self.metrics.inc('polls.failed')
+            if self.run_history:
+                self.run_history.record_poll(course_id, item.polled_at, item.rollcall_id, item.error)
+            return
+
+        if item.retry_at:
+            with self._lock:
+                self._in_flight.discard(course_id)
+            self.emit('backoff', course_id=course_id, reason='checkin_retry', until=item.retry_at.isoformat())
+            return
+
+        with self._lock:
+            # Skip the course until the cooldown expires; a failure the server reported is final
+            self._checked[course_id] = item.checked_in_at
+            self._in_flight.discard(course_id)
+            self._checked_in = True
+        self.metrics.inc('checkins')
+        self.emit('checkin', course_id=course_id, course_name=item.course['course_name'],
+                  rollcall_id=item.rollcall_id, success=item.success, message=item.message)
+        self.emit('backoff', course_id=course_id, reason='cooldown',
+                  until=(item.checked_in_at + self.cooldown).isoformat())
+        if self.run_history:
+            self.run_history.record_checkin(
+                item.course, item.rollcall_id, item.checked_in_at, item.success, item.message, item.cause
+            )
+        print(f"{item.course['course_name']} - {item.message}")
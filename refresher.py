@@ -0,0 +1,85 @@
+"""
+Background course-list refresh for the check-in loop
+"""
+
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CourseRefresher:
+    """Periodically re-fetch the course list and update the polled set in place
+
+    The running list is replaced with a single slice assignment, so the
+    check-in loop keeps polling unchanged courses without a gap.
+    """
+
+    def __init__(self, course_service, get_auth_token: Callable, courses: List[Dict],
+                 interval: float):
+        if interval <= 0:
+            raise ValueError("Refresh interval must be positive")
+        self.course_service = course_service
+        self.get_auth_token = get_auth_token
+        self.courses = courses
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the background refresh thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="course-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background refresh thread"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh_once()
+            except Exception as e:
+                logger.error(f"更新課程清單失敗: {e}")
+
+    def refresh_once(self) -> Tuple[List[Dict], List[Dict]]:
+        """Fetch the course list and apply the diff; returns (added, removed)"""
+        latest = self.course_service.get_courses(self.get_auth_token())
+        if latest is None:
+            # Keep polling the current set when the fetch fails
+            return [], []
+        return self.apply(latest)
+
+    def apply(self, latest: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """Diff a fetched course list against the running set and update it in place"""
+        return update_courses(self.courses, latest)
+
+
+def update_courses(courses: List[Dict], latest: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+    """Diff a fetched course list against `courses` and update it in place; returns (added, removed)"""
+    latest_by_id = {course['course_id']: course for course in latest}
+    current = list(courses)
+    current_ids = {course['course_id'] for course in current}
+
+    removed = [course for course in current if course['course_id'] not in latest_by_id]
+    added = [course for course in latest if course['course_id'] not in current_ids]
+    if not added and not removed:
+        return [], []
+
+    # Keep surviving courses in their current order, refreshed with the latest details
+    updated = [latest_by_id[course['course_id']] for course in current
+               if course['course_id'] in latest_by_id]
+    courses[:] = updated + added
+
+    for course in added:
+        logger.info(f"新增監控課程: {course.get('course_name', course['course_id'])}")
+    for course in removed:
+        logger.info(f"移除監控課程: {course.get('course_name', course['course_id'])}")
+    return added, removed
@@ -0,0 +1,82 @@
+"""
+Process CPU and memory budget for self-throttling
+"""
+
+import logging
+import time
+from typing import Callable, Optional
+
+from clock import Clock, SystemClock
+
+logger = logging.getLogger(__name__)
+
+
+def current_rss_kb() -> Optional[int]:
+    """Get the current resident set size of this process in KB, or None where it cannot be read
+
+    Only procfs reports the current size. getrusage() reports the peak,
+    which never comes down, so a ceiling checked against it could never
+    clear once crossed; it is not used as a fallback.
+    """
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+class ResourceBudget:
+    """Track this process's CPU percentage and RSS against configured ceilings
+
+    A ceiling of 0 disables that check. CPU usage is averaged over at
+    least `sample_interval` seconds; sample() is cheap to call more often.
+    """
+
+    def __init__(self, max_cpu_percent: float = 0.0, max_rss_mb: float = 0.0,
+                 sample_interval: float = 5.0, clock: Optional[Clock] = None,
+                 cpu_time: Callable[[], float] = time.process_time,
+                 rss_kb: Callable[[], Optional[int]] = current_rss_kb):
+        if max_cpu_percent < 0 or max_rss_mb < 0:
+            raise ValueError("Resource ceilings must not be negative")
+        self.max_cpu_percent = max_cpu_percent
+        self.max_rss_mb = max_rss_mb
+        self.sample_interval = sample_interval
+        self.clock = clock or SystemClock()
+        self.cpu_time = cpu_time
+        self.rss_kb = rss_kb
+        self.cpu_percent = 0.0
+        # None while the platform cannot report the current RSS
+        self.rss_mb: Optional[float] = 0.0
+        self._last_wall = self.clock.monotonic()
+        self._last_cpu = self.cpu_time()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_cpu_percent > 0 or self.max_rss_mb > 0
+
+    def sample(self) -> None:
+        """Update the CPU and RSS readings once `sample_interval` has passed"""
+        wall = self.clock.monotonic()
+        elapsed = wall - self._last_wall
+        if elapsed <= 0 or elapsed < self.sample_interval:
+            return
+        cpu = self.cpu_time()
+        self.cpu_percent = 100.0 * (cpu - self._last_cpu) / elapsed
+        rss = self.rss_kb()
+        if rss is None and self.rss_mb is not None and self.max_rss_mb > 0:
+            logger.warning("無法讀取目前的記憶體用量，略過記憶體上限檢查")
+        self.rss_mb = rss / 1024.0 if rss is not None else None
+        self._last_wall = wall
+        self._last_cpu = cpu
+
+    def pressure(self) -> float:
+        """Get usage relative to the tightest ceiling; above 1.0 means over budget"""
+        ratios = [0.0]
+        if self.max_cpu_percent > 0:
+            ratios.append(self.cpu_percent / self.max_cpu_percent)
+        if self.max_rss_mb > 0 and self.rss_mb is not None:
+            ratios.append(self.rss_mb / self.max_rss_mb)
+        return max(ratios)
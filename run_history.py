@@ -0,0 +1,283 @@
+"""
+Run-history store and detection-latency analytics
+
+The check-in loop appends JSON lines to the history file: one record per
+check-in attempt, one per failed poll, and periodic per-course poll
+counts. `main.py report` turns them into latency percentiles, request
+efficiency and failures by cause.
+"""
+
+import csv
+import io
+import json
+import logging
+import os
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from secure_input import set_file_permissions
+
+logger = logging.getLogger(__name__)
+
+
+class RunHistory:
+    """Append-only JSON-lines history written from the check-in loop
+
+    Poll counts and failures are buffered and written every
+    `flush_interval` seconds; check-in records are written immediately.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 60.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._buffer: List[Dict] = []
+        self._polls: Counter = Counter()
+        self._last_closed: Dict[str, datetime] = {}
+        self._detected: Dict[str, datetime] = {}
+        self._last_flush: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    def record_poll(self, course_id: str, now: datetime, rollcall_id: Optional[str],
+                    error: Optional[str] = None) -> None:
+        """Record one rollcall poll"""
+        with self._lock:
+            self._polls[course_id] += 1
+            if error:
+                self._buffer.append({'type': 'failure', 'course_id': course_id,
+                                     'at': now.isoformat(), 'cause': error})
+            elif rollcall_id:
+                self._detected.setdefault(course_id, now)
+            else:
+                self._last_closed[course_id] = now
+                self._detected.pop(course_id, None)
+        if self._last_flush is None:
+            self._last_flush = now
+        elif (now - self._last_flush).total_seconds() >= self.flush_interval:
+            self.flush(now)
+
+    def record_checkin(self, course: Dict, rollcall_id: str, now: datetime,
+                       success: bool, message: str, cause: Optional[str] = None) -> None:
+        """Record a check-in attempt and write it out immediately
+
+        `cause` classifies a failure (e.g. 'rejected', 'timeout') so the
+        report can group failures whose messages differ.
+        """
+        course_id = course['course_id']
+        with self._lock:
+            last_closed = self._last_closed.get(course_id)
+            detected = self._detected.get(course_id, now)
+            self._buffer.append({
+                'type': 'checkin',
+                'course_id': course_id,
+                'course_name': course.get('course_name', ''),
+                'rollcall_id': rollcall_id,
+                'last_closed_at': last_closed.isoformat() if last_closed else None,
+                'detected_at': detected.isoformat(),
+                'checked_in_at': now.isoformat(),
+                'success': success,
+                'message': message,
+                'cause': None if success else cause or 'unknown',
+            })
+        self.flush(now)
+
+    def snapshot_state(self) -> Dict:
+        """Get the per-course open/close tracking that detection latency is measured from"""
+        with self._lock:
+            return {
+                'last_closed': {course_id: when.isoformat() for course_id, when in self._last_closed.items()},
+                'detected': {course_id: when.isoformat() for course_id, when in self._detected.items()},
+            }
+
+    def restore_state(self, state: Dict) -> None:
+        """Restore tracking saved by snapshot_state()"""
+        last_closed = {k: datetime.fromisoformat(v) for k, v in state.get('last_closed', {}).items()}
+        detected = {k: datetime.fromisoformat(v) for k, v in state.get('detected', {}).items()}
+        with self._lock:
+            self._last_closed.update(last_closed)
+            self._detected.update(detected)
+
+    def flush(self, now: Optional[datetime] = None) -> None:
+        """Write buffered records and poll counts to the history file"""
+        now = now or datetime.now()
+        with self._lock:
+            records = self._buffer
+            self._buffer = []
+            for course_id, count in self._polls.items():
+                records.append({'type': 'polls', 'course_id': course_id,
+                                'at': now.isoformat(), 'count': count})
+            self._polls = Counter()
+            self._last_flush = now
+        if not records:
+            return
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            set_file_permissions(self.path)
+        except OSError as e:
+            logger.error(f"寫入執行歷史失敗: {e}")
+
+
+def load_records(path: str) -> List[Dict]:
+    """Load history records, skipping damaged lines"""
+    records = []
+    if not os.path.exists(path):
+        return records
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                logger.warning("略過損壞的執行歷史紀錄")
+    return records
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Get the linearly interpolated percentile of a list of values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+@dataclass
+class CourseStats:
+    """Aggregated history of one course"""
+    course_id: str
+    course_name: str = ""
+    polls: int = 0
+    checkins: int = 0
+    successes: int = 0
+    latencies: List[float] = field(default_factory=list)
+
+    @property
+    def requests(self) -> int:
+        return self.polls + self.checkins
+
+    @property
+    def requests_per_success(self) -> Optional[float]:
+        return self.requests / self.successes if self.successes else None
+
+    def latency(self, pct: float) -> Optional[float]:
+        return percentile(self.latencies, pct)
+
+
+@dataclass
+class RunReport:
+    """Per-course and overall statistics computed from run history"""
+    courses: Dict[str, CourseStats]
+    failures: Counter
+
+    @property
+    def overall(self) -> CourseStats:
+        total = CourseStats(course_id="ALL", course_name="全部課程")
+        for stats in self.courses.values():
+            total.polls += stats.polls
+            total.checkins += stats.checkins
+            total.successes += stats.successes
+            total.latencies.extend(stats.latencies)
+        return total
+
+
+def _open_to_checkin(record: Dict) -> float:
+    """Estimate seconds the rollcall was open before the check-in
+
+    The rollcall opened between the last closed poll and the detecting
+    poll; the midpoint is used when both are known.
+    """
+    detected = datetime.fromisoformat(record['detected_at'])
+    checked_in = datetime.fromisoformat(record['checked_in_at'])
+    opened = detected
+    if record.get('last_closed_at'):
+        last_closed = datetime.fromisoformat(record['last_closed_at'])
+        opened = last_closed + (detected - last_closed) / 2
+    return max(0.0, (checked_in - opened).total_seconds())
+
+
+def build_report(records: Iterable[Dict]) -> RunReport:
+    """Aggregate history records into a report"""
+    courses: Dict[str, CourseStats] = {}
+    failures: Counter = Counter()
+    for record in records:
+        course_id = record.get('course_id')
+        if not course_id:
+            continue
+        stats = courses.setdefault(course_id, CourseStats(course_id))
+        kind = record.get('type')
+        if kind == 'polls':
+            stats.polls += int(record.get('count', 0))
+        elif kind == 'failure':
+            failures[f"poll:{record.get('cause', 'unknown')}"] += 1
+        elif kind == 'checkin':
+            stats.checkins += 1
+            stats.course_name = record.get('course_name') or stats.course_name
+            if record.get('success'):
+                stats.successes += 1
+                stats.latencies.append(_open_to_checkin(record))
+            else:
+                failures[f"checkin:{record.get('cause') or 'unknown'}"] += 1
+    return RunReport(courses=courses, failures=failures)
+
+
+def _fmt(value: Optional[float], missing: str = "-") -> str:
+    return missing if value is None else f"{value:.1f}"
+
+
+COURSE_COLUMNS = [
+    'course_id', 'course_name', 'requests', 'checkins', 'successes', 'requests_per_success',
+    'latency_p50', 'latency_p90', 'latency_p99', 'latency_max'
+]
+
+
+def _course_row(stats: CourseStats) -> List:
+    return [
+        stats.course_id, stats.course_name, stats.requests, stats.checkins, stats.successes,
+        _fmt(stats.requests_per_success, ""), _fmt(stats.latency(50), ""), _fmt(stats.latency(90), ""),
+        _fmt(stats.latency(99), ""), _fmt(stats.latency(100), "")
+    ]
+
+
+def format_text(report: RunReport) -> str:
+    """Format a report as a text table"""
+    lines = [
+        f"{'課程':<20} {'requests':>9} {'ok/total':>9} {'req/ok':>8} "
+        f"{'p50(s)':>7} {'p90(s)':>7} {'p99(s)':>7} {'max(s)':>7}"
+    ]
+    rows = sorted(report.courses.values(), key=lambda stats: stats.course_id) + [report.overall]
+    for stats in rows:
+        name = (stats.course_name or stats.course_id)[:20]
+        lines.append(
+            f"{name:<20} {stats.requests:>9} {f'{stats.successes}/{stats.checkins}':>9} "
+            f"{_fmt(stats.requests_per_success):>8} {_fmt(stats.latency(50)):>7} "
+            f"{_fmt(stats.latency(90)):>7} {_fmt(stats.latency(99)):>7} {_fmt(stats.latency(100)):>7}"
+        )
+    lines.append("")
+    lines.append("失敗原因：" if report.failures else "失敗原因：無")
+    for cause, count in report.failures.most_common():
+        lines.append(f"  {cause}: {count}")
+    return "\n".join(lines)
+
+
+def format_csv(report: RunReport, table: str = 'courses') -> str:
+    """Format the per-course table (or the failures table) as CSV"""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    if table == 'failures':
+        writer.writerow(['cause', 'count'])
+        for cause, count in report.failures.most_common():
+            writer.writerow([cause, count])
+    else:
+        writer.writerow(COURSE_COLUMNS)
+        for stats in sorted(report.courses.values(), key=lambda stats: stats.course_id):
+            writer.writerow(_course_row(stats))
+        writer.writerow(_course_row(report.overall))
+    return output.getvalue()
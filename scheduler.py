@@ -0,0 +1,251 @@
+"""
+Polling schedulers for the check-in loop
+"""
+
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from history import RollcallHistory
+from resource_budget import ResourceBudget
+
+logger = logging.getLogger(__name__)
+
+
+class PollScheduler:
+    """Polling policy: decides which courses to poll and how long to wait"""
+
+    def due_courses(self, courses: List[Dict], now: datetime) -> List[Dict]:
+        """Get the courses that should be polled in this cycle"""
+        return list(courses)
+
+    def record_poll(self, course_id: str, now: datetime, rollcall_open: bool) -> None:
+        """Record the outcome of a rollcall poll"""
+
+    def defer(self, course_id: str, until: datetime) -> None:
+        """Record that the loop will not poll a course before `until`"""
+
+    def next_delay(self, now: datetime) -> float:
+        """Get seconds to sleep before the next cycle"""
+        raise NotImplementedError
+
+    def snapshot_state(self) -> Dict:
+        """Get the per-course timing worth keeping across a restart
+
+        May be called while another thread records polls.
+        """
+        return {}
+
+    def restore_state(self, state: Dict) -> None:
+        """Restore timing saved by snapshot_state()"""
+
+
+def _dump_times(times: Dict[str, datetime]) -> Dict[str, str]:
+    return {course_id: when.isoformat() for course_id, when in dict(times).items()}
+
+
+def _load_times(times: Dict[str, str]) -> Dict[str, datetime]:
+    return {str(course_id): datetime.fromisoformat(when) for course_id, when in times.items()}
+
+
+class UniformPollScheduler(PollScheduler):
+    """Poll every course each cycle with a random 1-5 second wait"""
+
+    def __init__(self, min_interval: float = 1.0, max_interval: float = 5.0,
+                 rng: Optional[random.Random] = None):
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError("Invalid polling interval range")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.rng = rng or random.Random()
+
+    def next_delay(self, now: datetime) -> float:
+        return self.rng.uniform(self.min_interval, self.max_interval)
+
+
+class PredictiveScheduler(PollScheduler):
+    """Poll heavily around each course's predicted rollcall open times and lightly elsewhere
+
+    A course waits the cold interval only while the history model gives
+    less than `hot_probability` that its rollcall opens during that wait;
+    otherwise it is polled at the uniform rate. A single outlier among
+    many observations carries too little mass to make a window hot.
+    Courses without recorded history are polled like the uniform policy.
+    """
+
+    def __init__(self, history: RollcallHistory, min_interval: float = 1.0,
+                 max_interval: float = 5.0, cold_interval: float = 60.0,
+                 rng: Optional[random.Random] = None, hot_probability: float = 0.01):
+        if min_interval <= 0 or max_interval < min_interval or cold_interval < max_interval:
+            raise ValueError("Invalid polling interval range")
+        if not 0 < hot_probability <= 1:
+            raise ValueError("Invalid hot probability")
+        self.history = history
+        self.hot_probability = hot_probability
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.cold_interval = cold_interval
+        self.rng = rng or random.Random()
+        self._next_poll: Dict[str, datetime] = {}
+
+    def due_courses(self, courses: List[Dict], now: datetime) -> List[Dict]:
+        return [
+            course for course in courses
+            if self._next_poll.get(course['course_id'], now) <= now
+        ]
+
+    def record_poll(self, course_id: str, now: datetime, rollcall_open: bool) -> None:
+        self.history.observe(course_id, now, rollcall_open)
+        self._next_poll[course_id] = now + timedelta(seconds=self.interval_for(course_id, now))
+
+    def defer(self, course_id: str, until: datetime) -> None:
+        self._next_poll[course_id] = until
+
+    def interval_for(self, course_id: str, now: datetime) -> float:
+        """Get seconds until the course should be polled again"""
+        hot = self.rng.uniform(self.min_interval, self.max_interval)
+        if not self.history.offsets(course_id):
+            return hot
+        cold_end = now + timedelta(seconds=self.cold_interval)
+        if self.history.open_probability(course_id, now, cold_end) >= self.hot_probability:
+            return hot
+        return self.cold_interval
+
+    def next_delay(self, now: datetime) -> float:
+        if not self._next_poll:
+            return self.rng.uniform(self.min_interval, self.max_interval)
+        earliest = min(self._next_poll.values())
+        delay = (earliest - now).total_seconds()
+        return min(self.cold_interval, max(self.min_interval, delay))
+
+    def snapshot_state(self) -> Dict:
+        return {'next_poll': _dump_times(self._next_poll)}
+
+    def restore_state(self, state: Dict) -> None:
+        self._next_poll.update(_load_times(state.get('next_poll', {})))
+
+
+class DemotingScheduler(PollScheduler):
+    """Wrap a policy and demote courses without a rollcall in `stale_after` to a slow rate
+
+    A demoted course is promoted back as soon as a rollcall is seen.
+    """
+
+    def __init__(self, inner: PollScheduler, history: RollcallHistory,
+                 stale_after: timedelta, stale_interval: float = 120.0):
+        if stale_interval <= 0:
+            raise ValueError("Invalid stale polling interval")
+        self.inner = inner
+        self.history = history
+        self.stale_after = stale_after
+        self.stale_interval = stale_interval
+        self._resting_until: Dict[str, datetime] = {}
+
+    def is_stale(self, course_id: str, now: datetime) -> bool:
+        """Check whether a course has gone `stale_after` without a rollcall"""
+        last_activity = self.history.last_activity(course_id)
+        return last_activity is not None and now - last_activity >= self.stale_after
+
+    def due_courses(self, courses: List[Dict], now: datetime) -> List[Dict]:
+        return [
+            course for course in self.inner.due_courses(courses, now)
+            if self._resting_until.get(course['course_id'], now) <= now
+        ]
+
+    def record_poll(self, course_id: str, now: datetime, rollcall_open: bool) -> None:
+        self.history.observe(course_id, now, rollcall_open)
+        self.inner.record_poll(course_id, now, rollcall_open)
+        if not rollcall_open and self.is_stale(course_id, now):
+            self._resting_until[course_id] = now + timedelta(seconds=self.stale_interval)
+        else:
+            self._resting_until.pop(course_id, None)
+
+    def defer(self, course_id: str, until: datetime) -> None:
+        self.inner.defer(course_id, until)
+
+    def next_delay(self, now: datetime) -> float:
+        return self.inner.next_delay(now)
+
+    def snapshot_state(self) -> Dict:
+        return {'inner': self.inner.snapshot_state(), 'resting_until': _dump_times(self._resting_until)}
+
+    def restore_state(self, state: Dict) -> None:
+        self.inner.restore_state(state.get('inner', {}))
+        self._resting_until.update(_load_times(state.get('resting_until', {})))
+
+
+class ThrottlingScheduler(PollScheduler):
+    """Wrap a policy and slow down courses outside their predicted windows while over budget
+
+    While the process exceeds its CPU or RSS ceiling, a course polled
+    outside its predicted window rests for `throttle_interval` seconds
+    scaled by how far over budget the process is (at most `max_factor`
+    times). Courses inside a window keep the inner policy's rate.
+    `on_change(throttling, budget)` is called when throttling starts or ends.
+    """
+
+    def __init__(self, inner: PollScheduler, history: RollcallHistory, budget: ResourceBudget,
+                 throttle_interval: float = 60.0, max_factor: float = 10.0,
+                 on_change: Optional[Callable[[bool, ResourceBudget], None]] = None):
+        if throttle_interval <= 0 or max_factor < 1:
+            raise ValueError("Invalid throttling interval")
+        self.inner = inner
+        self.history = history
+        self.budget = budget
+        self.throttle_interval = throttle_interval
+        self.max_factor = max_factor
+        self.on_change = on_change
+        self.throttling = False
+        self._resting_until: Dict[str, datetime] = {}
+
+    def update(self) -> bool:
+        """Sample the budget and switch throttling on or off; returns whether it is on"""
+        self.budget.sample()
+        over = self.budget.pressure() > 1.0
+        if over and not self.throttling:
+            memory = f"{self.budget.rss_mb:.0f}MB" if self.budget.rss_mb is not None else "未知"
+            logger.warning(
+                f"資源使用超出上限（CPU {self.budget.cpu_percent:.0f}%、記憶體 {memory}），"
+                "放慢非點名時段課程的輪詢"
+            )
+        elif not over and self.throttling:
+            logger.info("資源使用恢復正常，解除輪詢節流")
+            self._resting_until.clear()
+        changed = over != self.throttling
+        self.throttling = over
+        if changed and self.on_change:
+            self.on_change(over, self.budget)
+        return over
+
+    def due_courses(self, courses: List[Dict], now: datetime) -> List[Dict]:
+        self.update()
+        return [
+            course for course in self.inner.due_courses(courses, now)
+            if self._resting_until.get(course['course_id'], now) <= now
+        ]
+
+    def record_poll(self, course_id: str, now: datetime, rollcall_open: bool) -> None:
+        self.inner.record_poll(course_id, now, rollcall_open)
+        if not self.throttling or rollcall_open or self.history.is_hot(course_id, now):
+            self._resting_until.pop(course_id, None)
+            return
+
+        factor = min(self.max_factor, self.budget.pressure())
+        until = now + timedelta(seconds=self.throttle_interval * factor)
+        # Never rest past the start of the course's next predicted window
+        next_hot = self.history.next_hot_start(course_id, now)
+        self._resting_until[course_id] = min(until, next_hot) if next_hot else until
+
+    def defer(self, course_id: str, until: datetime) -> None:
+        self.inner.defer(course_id, until)
+
+    def next_delay(self, now: datetime) -> float:
+        return self.inner.next_delay(now)
+
+    def snapshot_state(self) -> Dict:
+        # Throttling rests reflect this process's resource pressure and are not kept
+        return {'inner': self.inner.snapshot_state()}
+
+    def restore_state(self, state: Dict) -> None:
+        self.inner.restore_state(state.get('inner', {}))
@@ -0,0 +1,106 @@
+"""
+Background session health probing for the check-in loop
+"""
+
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from clock import Clock, SystemClock
+
+logger = logging.getLogger(__name__)
+
+
+class SessionMonitor:
+    """Probe the login session on an interval and log in again before it is needed
+
+    `probe` returns True while the session is valid, False once it has
+    expired and None when the answer is unknown (e.g. the network is down).
+    `next_window` returns the start of the next predicted rollcall window;
+    the session is refreshed `lead_time` seconds before it even if the
+    probe still succeeds, so a check-in never waits for a login.
+    """
+
+    def __init__(self, probe: Callable[[], Optional[bool]], relogin: Callable[[], bool],
+                 interval: float, next_window: Optional[Callable[[datetime], Optional[datetime]]] = None,
+                 lead_time: float = 300.0, clock: Optional[Clock] = None):
+        if interval <= 0:
+            raise ValueError("Probe interval must be positive")
+        self.probe = probe
+        self.relogin = relogin
+        self.interval = interval
+        self.next_window = next_window
+        self.lead_time = timedelta(seconds=lead_time)
+        self.clock = clock or SystemClock()
+        self.last_login: datetime = self.clock.now()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the background probe thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="session-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background probe thread"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.next_wait(self.clock.now())):
+            try:
+                self.check_once()
+            except Exception as e:
+                logger.error(f"檢查登入狀態失敗: {e}")
+
+    def next_wait(self, now: datetime) -> float:
+        """Get seconds until the next check: the probe interval, or sooner to refresh before a window
+
+        Waking only every `interval` would miss windows that start between
+        `lead_time` and `interval` seconds after a check.
+        """
+        wait = self.interval
+        start = self.next_window(now) if self.next_window else None
+        if start is not None:
+            refresh_at = start - self.lead_time
+            if self.last_login < refresh_at:
+                wait = min(wait, (refresh_at - now).total_seconds())
+        # Never spin, even when the refresh point has already passed
+        return max(1.0, wait)
+
+    def window_due(self, now: datetime) -> bool:
+        """Check whether a predicted window starts soon and the session predates its lead time"""
+        if not self.next_window:
+            return False
+        start = self.next_window(now)
+        if start is None or start - now > self.lead_time:
+            return False
+        return self.last_login < start - self.lead_time
+
+    def check_once(self) -> str:
+        """Probe the session and log in again if needed; returns the action taken"""
+        now = self.clock.now()
+        if self.window_due(now):
+            logger.info("即將進入預測的點名時段，預先更新登入狀態")
+            return self._relogin(now, "refreshed")
+
+        valid = self.probe()
+        if valid is None:
+            return "unknown"
+        if valid:
+            return "valid"
+        logger.warning("登入狀態已失效，重新登入")
+        return self._relogin(now, "relogin")
+
+    def _relogin(self, now: datetime, action: str) -> str:
+        if not self.relogin():
+            logger.error("重新登入失敗")
+            return "failed"
+        self.last_login = now
+        return action
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Deterministic scheduling simulation for Zuvio Auto Check-in System
+
+Replays rollcall open events against an in-process stand-in for the
+course endpoints while the check-in loop runs on a simulated clock, so a
+week of polling finishes in seconds.
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import statistics
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from clock import SimulatedClock
+from main import AuthToken, Location, ZuvioAutoChecker
+from history import RollcallHistory
+from scheduler import PollScheduler, PredictiveScheduler, UniformPollScheduler
+
+
+@dataclass
+class RollcallWindow:
+    """A rollcall that is open between opens_at and closes_at"""
+    course_id: str
+    rollcall_id: str
+    opens_at: datetime
+    closes_at: datetime
+
+
+@dataclass
+class SimulationResult:
+    """Outcome of replaying one polling policy"""
+    policy: str
+    requests: int
+    latencies: List[float] = field(default_factory=list)
+    missed: int = 0
+
+    @property
+    def detected(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def mean_latency(self) -> float:
+        return statistics.mean(self.latencies) if self.latencies else 0.0
+
+    @property
+    def max_latency(self) -> float:
+        return max(self.latencies) if self.latencies else 0.0
+
+
+class StubCourseService:
+    """In-process stand-in for CourseService driven by a simulated clock"""
+
+    def __init__(self, clock: SimulatedClock, windows: List[RollcallWindow]):
+        self.clock = clock
+        self.requests = 0
+        self.checkins: Dict[str, datetime] = {}
+        self._windows: Dict[str, List[RollcallWindow]] = {}
+        for window in windows:
+            self._windows.setdefault(window.course_id, []).append(window)
+
+    def check_rollcall_availability(self, course_id: str) -> Optional[str]:
+        self.requests += 1
+        now = self.clock.now()
+        for window in self._windows.get(course_id, []):
+            if window.opens_at <= now < window.closes_at:
+                return window.rollcall_id
+        return None
+
+    def perform_checkin(self, auth_token: AuthToken, rollcall_id: str, location: Location) -> Tuple[bool, str]:
+        self.requests += 1
+        self.checkins.setdefault(rollcall_id, self.clock.now())
+        return True, "簽到成功！"
+
+
+class _BoundedClock(SimulatedClock):
+    """Simulated clock that stops the checker once the end time is reached"""
+
+    def __init__(self, start: datetime, end: datetime):
+        super().__init__(start)
+        self.end = end
+        self.checker: Optional[ZuvioAutoChecker] = None
+
+    def sleep(self, seconds: float) -> None:
+        super().sleep(seconds)
+        if self.checker and self.now() >= self.end:
+            self.checker.running = False
+
+
+def generate_week(course_ids: List[str], start: datetime, weeks: int = 1,
+                  seed: int = 0) -> List[RollcallWindow]:
+    """Generate weekly classes whose rollcall opens at a similar offset each week"""
+    rng = random.Random(seed)
+    windows = []
+    for course_id in course_ids:
+        weekday = rng.randrange(5)
+        class_start = rng.choice([8, 9, 10, 13, 14, 15]) * 3600 + 10 * 60
+        usual_offset = rng.uniform(0, 20 * 60)
+        for week in range(weeks):
+            day = start + timedelta(days=7 * week + weekday)
+            offset = max(0.0, rng.gauss(usual_offset, 120))
+            opens_at = day + timedelta(seconds=class_start + offset)
+            windows.append(RollcallWindow(
+                course_id=course_id,
+                rollcall_id=f"{course_id}-w{week}",
+                opens_at=opens_at,
+                closes_at=opens_at + timedelta(minutes=rng.choice([3, 5, 10]))
+            ))
+    return windows
+
+
+def run_simulation(policy: str, scheduler: PollScheduler, courses: List[Dict],
+                   windows: List[RollcallWindow], start: datetime, end: datetime) -> SimulationResult:
+    """Run the check-in loop over [start, end) on a simulated clock"""
+    clock = _BoundedClock(start, end)
+    stub = StubCourseService(clock, windows)
+    checker = ZuvioAutoChecker(clock=clock, scheduler=scheduler)
+    checker.course_service = stub
+    clock.checker = checker
+
+    auth_token = AuthToken(user_id="sim", access_token="sim")
+    location = Location(latitude="0", longitude="0")
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        checker.run_checkin_loop(auth_token, courses, location)
+
+    result = SimulationResult(policy=policy, requests=stub.requests)
+    for window in windows:
+        if window.opens_at >= end:
+            continue
+        checked_at = stub.checkins.get(window.rollcall_id)
+        if checked_at is None:
+            result.missed += 1
+        else:
+            result.latencies.append((checked_at - window.opens_at).total_seconds())
+    return result
+
+
+def compare_policies(policies: Dict[str, Callable[[], PollScheduler]], courses: List[Dict],
+                     windows: List[RollcallWindow], start: datetime, end: datetime) -> List[SimulationResult]:
+    """Replay the same rollcall events against each polling policy"""
+    return [
+        run_simulation(name, factory(), courses, windows, start, end)
+        for name, factory in policies.items()
+    ]
+
+
+def format_results(results: List[SimulationResult]) -> str:
+    """Format simulation results as a text table"""
+    lines = [f"{'policy':<12} {'requests':>10} {'detected':>9} {'missed':>7} {'mean(s)':>9} {'max(s)':>9}"]
+    for result in results:
+        lines.append(
+            f"{result.policy:<12} {result.requests:>10} {result.detected:>9} {result.missed:>7} "
+            f"{result.mean_latency:>9.1f} {result.max_latency:>9.1f}"
+        )
+    return "\n".join(lines)
+
+
+def format_comparison(baseline: SimulationResult, result: SimulationResult) -> str:
+    """Describe request volume and latency changes against a baseline policy"""
+    if baseline.requests:
+        volume_change = 100.0 * (result.requests - baseline.requests) / baseline.requests
+    else:
+        volume_change = 0.0
+    return (
+        f"{result.policy} vs {baseline.policy}: request volume {volume_change:+.1f}%, "
+        f"mean latency {result.mean_latency - baseline.mean_latency:+.1f}s, "
+        f"max latency {result.max_latency - baseline.max_latency:+.1f}s, "
+        f"missed {result.missed - baseline.missed:+d}"
+    )
+
+
+def main():
+    """Simulation entry point"""
+    parser = argparse.ArgumentParser(description='Replay simulated rollcall events against polling policies')
+    parser.add_argument('--courses', type=int, default=5, help='Number of simulated courses')
+    parser.add_argument('--weeks', type=int, default=2, help='Number of weeks to replay')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    start = datetime(2024, 9, 2)
+    end = start + timedelta(weeks=args.weeks)
+    courses = [
+        {'course_id': f"course{i}", 'course_name': f"Course {i}", 'teacher_name': f"Teacher {i}"}
+        for i in range(args.courses)
+    ]
+    windows = generate_week([c['course_id'] for c in courses], start, args.weeks, args.seed)
+
+    policies = {
+        'uniform': lambda: UniformPollScheduler(rng=random.Random(args.seed)),
+        'predictive': lambda: PredictiveScheduler(RollcallHistory(), rng=random.Random(args.seed)),
+    }
+    results = compare_policies(policies, courses, windows, start, end)
+    print(format_results(results))
+    for result in results[1:]:
+        print(format_comparison(results[0], result))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
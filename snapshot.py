@@ -0,0 +1,130 @@
+"""
+Warm-restart snapshots of runtime state
+
+The check-in loop saves what it has learned (scheduler timing, check-in
+cooldowns, the conditional course-list cache, detection-latency
+tracking) periodically and on shutdown, and restores it at startup so a
+restart does not begin cold.
+
+File layout: a 9-byte header (magic, format version, CRC-32 of the
+body) followed by zlib-compressed compact JSON. Snapshots that are
+corrupt, from another format version, too old, or taken for another
+account or server are ignored.
+"""
+
+import contextlib
+import json
+import logging
+import os
+import struct
+import tempfile
+import zlib
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from secure_input import set_file_permissions
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'ZVSS'
+SNAPSHOT_VERSION = 1
+HEADER = struct.Struct('>4sBI')
+
+
+class SnapshotError(ValueError):
+    """A snapshot file that cannot be used"""
+
+
+def encode_snapshot(envelope: Dict[str, Any]) -> bytes:
+    """Serialize a snapshot envelope to the on-disk format"""
+    body = zlib.compress(json.dumps(envelope, separators=(',', ':'), ensure_ascii=False).encode('utf-8'))
+    return HEADER.pack(MAGIC, SNAPSHOT_VERSION, zlib.crc32(body)) + body
+
+
+def decode_snapshot(data: bytes) -> Dict[str, Any]:
+    """Parse and verify the on-disk format"""
+    if len(data) < HEADER.size:
+        raise SnapshotError("檔案不完整")
+    magic, version, checksum = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotError("不是狀態快照檔")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(f"不支援的快照版本 {version}")
+    body = data[HEADER.size:]
+    if zlib.crc32(body) != checksum:
+        raise SnapshotError("校驗碼不符")
+    try:
+        envelope = json.loads(zlib.decompress(body))
+    except (zlib.error, ValueError) as e:
+        raise SnapshotError(f"內容無法解析: {e}") from e
+    if not isinstance(envelope, dict) or not isinstance(envelope.get('state'), dict):
+        raise SnapshotError("內容格式錯誤")
+    return envelope
+
+
+class StateSnapshot:
+    """Snapshot file for one account on one server
+
+    `identity` (e.g. user ID and base URL) is stored with every snapshot
+    and must match on load.
+    """
+
+    def __init__(self, path: str, identity: Dict[str, str], save_interval: float = 300.0,
+                 max_age: timedelta = timedelta(hours=24)):
+        self.path = path
+        self.identity = identity
+        self.save_interval = save_interval
+        self.max_age = max_age
+        self._last_save: Optional[datetime] = None
+
+    def save(self, state: Dict[str, Any], now: datetime) -> bool:
+        """Write the snapshot atomically; returns whether it was written"""
+        envelope = {'saved_at': now.isoformat(), 'identity': self.identity, 'state': state}
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            fd, temp_path = tempfile.mkstemp(prefix='.snapshot-', suffix='.tmp', dir=directory)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(encode_snapshot(envelope))
+                    f.flush()
+                    os.fsync(f.fileno())
+                set_file_permissions(temp_path)
+                os.replace(temp_path, self.path)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.unlink(temp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"儲存狀態快照失敗: {e}")
+            return False
+        self._last_save = now
+        return True
+
+    def save_if_due(self, collect: Callable[[], Dict[str, Any]], now: datetime) -> bool:
+        """Save `collect()` when `save_interval` has passed since the last save"""
+        if self._last_save is None:
+            self._last_save = now
+            return False
+        if (now - self._last_save).total_seconds() < self.save_interval:
+            return False
+        return self.save(collect(), now)
+
+    def load(self, now: datetime) -> Optional[Dict[str, Any]]:
+        """Get the saved state if the snapshot is valid for this run"""
+        try:
+            with open(self.path, 'rb') as f:
+                envelope = decode_snapshot(f.read())
+            saved_at = datetime.fromisoformat(envelope['saved_at'])
+        except FileNotFoundError:
+            return None
+        except (OSError, SnapshotError, KeyError, TypeError, ValueError) as e:
+            logger.warning(f"略過無效的狀態快照 ({self.path}): {e}")
+            return None
+
+        if envelope.get('identity') != self.identity:
+            logger.info("狀態快照屬於其他帳號或伺服器，略過")
+            return None
+        if saved_at > now or now - saved_at > self.max_age:
+            logger.info(f"狀態快照已過期（儲存於 {saved_at:%Y/%m/%d %H:%M}），略過")
+            return None
+        return envelope['state']
@@ -0,0 +1,137 @@
+"""
+Live console status line for the check-in loop
+
+Shows the last cycle's duration split into network, parse and sleep
+time, the slowest course, the course-list cache hit rate and requests
+per minute. Network and parse time are the `time.network` and
+`time.parse` timers that CourseService and the pipeline accumulate in
+Metrics; with the pipeline they are summed across fetch workers, and
+the line also shows the fetch queue depth, its high-water mark and the
+polls dropped because it was full.
+"""
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Deque, Optional, Tuple
+
+from clock import Clock, SystemClock
+from metrics import Metrics
+
+
+@dataclass
+class CycleSummary:
+    """Timing of one complete cycle, from its start to the start of the next"""
+    duration: float
+    network: float
+    parse: float
+    sleep: float
+    slowest_course: Optional[str] = None
+    slowest_seconds: float = 0.0
+
+
+class StatusLine:
+    """Per-cycle summary redrawn in place at most once every `min_interval` seconds"""
+
+    def __init__(self, metrics: Metrics, clock: Optional[Clock] = None, min_interval: float = 1.0,
+                 rate_window: float = 60.0):
+        self.metrics = metrics
+        self.clock = clock or SystemClock()
+        self.min_interval = min_interval
+        self.rate_window = rate_window
+        self.last_cycle: Optional[CycleSummary] = None
+        self._cycle_start: Optional[float] = None
+        self._timers_at_start = (0.0, 0.0)
+        self._sleep = 0.0
+        self._slowest: Tuple[Optional[str], float] = (None, 0.0)
+        self._request_counts: Deque[Tuple[float, float]] = deque()
+        self._last_draw: Optional[float] = None
+        self._width = 0
+        self._lock = threading.Lock()
+
+    def start_cycle(self) -> None:
+        """Close the previous cycle and start timing a new one"""
+        now = self.clock.monotonic()
+        values = self.metrics.snapshot()
+        network, parse = values.get('time.network', 0.0), values.get('time.parse', 0.0)
+        with self._lock:
+            if self._cycle_start is not None:
+                self.last_cycle = CycleSummary(
+                    now - self._cycle_start, network - self._timers_at_start[0],
+                    parse - self._timers_at_start[1], self._sleep, *self._slowest
+                )
+            self._cycle_start = now
+            self._timers_at_start = (network, parse)
+            self._sleep = 0.0
+            self._slowest = (None, 0.0)
+            self._request_counts.append((now, values.get('http.requests', 0)))
+            while len(self._request_counts) > 2 and now - self._request_counts[1][0] >= self.rate_window:
+                self._request_counts.popleft()
+
+    def course_polled(self, course_name: str, seconds: float) -> None:
+        """Record how long polling one course took"""
+        with self._lock:
+            if self._slowest[0] is None or seconds > self._slowest[1]:
+                self._slowest = (course_name, seconds)
+
+    def record_sleep(self, seconds: float) -> None:
+        """Record the wait that ends the current cycle"""
+        with self._lock:
+            self._sleep += seconds
+
+    def requests_per_minute(self) -> Optional[float]:
+        """Get the request rate over roughly the last `rate_window` seconds"""
+        with self._lock:
+            if len(self._request_counts) < 2:
+                return None
+            (first_at, first_count), (last_at, last_count) = self._request_counts[0], self._request_counts[-1]
+        elapsed = last_at - first_at
+        return (last_count - first_count) * 60.0 / elapsed if elapsed > 0 else None
+
+    def cache_hit_rate(self) -> Optional[float]:
+        """Get the share of course-list fetches answered 304 Not Modified"""
+        hits = self.metrics.get('courses.cache_hits')
+        total = hits + self.metrics.get('courses.cache_misses')
+        return hits / total if total else None
+
+    def queue_summary(self) -> Optional[str]:
+        """Describe the pipeline's fetch queue; None when the pipeline is not in use"""
+        values = self.metrics.snapshot()
+        if 'queue.fetch.depth' not in values:
+            return None
+        return (f"佇列 {values['queue.fetch.depth']:.0f}（最高 {values.get('queue.fetch.max_depth', 0):.0f}）"
+                f" 略過 {values.get('polls.dropped', 0):.0f}")
+
+    def render(self, now: datetime) -> str:
+        """Format the status line"""
+        parts = [f"{now.strftime('%H:%M:%S')} 尚未有課程開放簽到"]
+        cycle = self.last_cycle
+        if cycle:
+            parts.append(
+                f"上輪 {cycle.duration:.2f}s（網路 {cycle.network:.2f}s 解析 {cycle.parse:.2f}s 休眠 {cycle.sleep:.2f}s）"
+            )
+            if cycle.slowest_course is not None:
+                parts.append(f"最慢 {cycle.slowest_course} {cycle.slowest_seconds:.2f}s")
+        hit_rate = self.cache_hit_rate()
+        if hit_rate is not None:
+            parts.append(f"快取命中 {hit_rate:.0%}")
+        rate = self.requests_per_minute()
+        if rate is not None:
+            parts.append(f"{rate:.0f} 次請求/分")
+        queue = self.queue_summary()
+        if queue:
+            parts.append(queue)
+        return " | ".join(parts)
+
+    def draw(self, now: datetime) -> bool:
+        """Redraw the line in place unless it was drawn less than `min_interval` ago"""
+        monotonic = self.clock.monotonic()
+        if self._last_draw is not None and monotonic - self._last_draw < self.min_interval:
+            return False
+        self._last_draw = monotonic
+        line = self.render(now)
+        # Pad over what is left of a longer previous line
+        print(line.ljust(self._width), end='\r')
+        self._width = len(line)
+        return True
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Zuvio endpoints with configurable fault profiles
+
+Serves the four endpoints the checker uses (login, course list, rollcall
+page and check-in) and can inject latency, stalled connections,
+truncated bodies, 5xx bursts, login-page redirects and oversized pages.
+"""
+
+import argparse
+import gzip
+import json
+import random
+import sys
+import threading
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from clock import Clock, SystemClock
+
+STUB_USER_ID = "10001"
+STUB_ACCESS_TOKEN = "stub-access-token"
+
+
+@dataclass(frozen=True)
+class FaultProfile:
+    """Misbehaviour injected into every stub response"""
+    name: str = "healthy"
+    # Added latency: none, fixed, uniform, lognormal or exponential
+    latency: str = "none"
+    latency_mean: float = 0.0
+    latency_jitter: float = 0.0
+    # Probability that a connection stalls for stall_seconds and is then dropped
+    stall_rate: float = 0.0
+    stall_seconds: float = 30.0
+    # Probability that only half of the declared body is sent
+    truncate_rate: float = 0.0
+    # Probability that a burst of error_burst_length 5xx responses starts
+    error_burst_rate: float = 0.0
+    error_burst_length: int = 5
+    # Probability that a request is redirected to the login page
+    login_redirect_rate: float = 0.0
+    # Extra bytes of HTML markup added to every rollcall page
+    page_padding: int = 0
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """Draw the added latency for one response in seconds"""
+        if self.latency == "fixed":
+            return self.latency_mean
+        if self.latency == "uniform":
+            return max(0.0, rng.uniform(self.latency_mean - self.latency_jitter,
+                                        self.latency_mean + self.latency_jitter))
+        if self.latency == "lognormal":
+            return rng.lognormvariate(0.0, self.latency_jitter or 0.5) * self.latency_mean
+        if self.latency == "exponential":
+            return rng.expovariate(1.0 / self.latency_mean) if self.latency_mean > 0 else 0.0
+        return 0.0
+
+
+PROFILES: Dict[str, FaultProfile] = {
+    profile.name: profile for profile in [
+        FaultProfile("healthy"),
+        FaultProfile("slow", latency="lognormal", latency_mean=0.1, latency_jitter=0.8),
+        FaultProfile("stalls", stall_rate=0.05, stall_seconds=30.0),
+        FaultProfile("truncated", truncate_rate=0.1),
+        FaultProfile("5xx-bursts", error_burst_rate=0.02, error_burst_length=10),
+        FaultProfile("session-expiry", login_redirect_rate=0.05),
+        FaultProfile("huge-pages", page_padding=512 * 1024),
+        FaultProfile("chaos", latency="exponential", latency_mean=0.1, stall_rate=0.02,
+                     stall_seconds=30.0, truncate_rate=0.05, error_burst_rate=0.01,
+                     login_redirect_rate=0.02, page_padding=128 * 1024),
+    ]
+}
+
+
+@dataclass
+class StubRollcall:
+    """A scheduled rollcall on the stub server"""
+    course_id: str
+    rollcall_id: str
+    opens_at: float
+    closes_at: float
+    checked_in_at: Optional[float] = None
+
+
+@dataclass
+class StubStats:
+    """Requests and faults observed by the stub server"""
+    requests: Dict[str, int] = field(default_factory=dict)
+    faults: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+
+class StubZuvioServer:
+    """Threaded HTTP stand-in for irs.zuvio.com.tw
+
+    Rollcall times are monotonic seconds relative to start(), read from
+    the given clock.
+    """
+
+    def __init__(self, courses: Optional[List[Dict]] = None, profile: Optional[FaultProfile] = None,
+                 host: str = "127.0.0.1", port: int = 0, clock: Optional[Clock] = None,
+                 seed: Optional[int] = None):
+        self.courses = courses if courses is not None else make_courses(5)
+        self.profile = profile or PROFILES["healthy"]
+        self.clock = clock or SystemClock()
+        self.rng = random.Random(seed)
+        self.rollcalls: List[StubRollcall] = []
+        self._by_course: Dict[str, List[StubRollcall]] = {}
+        self._by_id: Dict[str, StubRollcall] = {}
+        self.stats = StubStats()
+        self._burst_left = 0
+        self._pages: Dict[Optional[str], bytes] = {}
+        self._started_at = 0.0
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self.session_expired = False
+        self._server = _QuietHTTPServer((host, port), _make_handler(self))
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'StubZuvioServer':
+        """Start serving in a background thread"""
+        self._started_at = self.clock.monotonic()
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={'poll_interval': 0.05}, name="stub-zuvio", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release stalled connections"""
+        self._stopping.set()
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> 'StubZuvioServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def elapsed(self) -> float:
+        """Get seconds since the server started"""
+        return self.clock.monotonic() - self._started_at
+
+    def schedule_rollcall(self, course_id: str, opens_in: float, duration: float,
+                          rollcall_id: Optional[str] = None) -> StubRollcall:
+        """Open a rollcall `opens_in` seconds after start for `duration` seconds"""
+        with self._lock:
+            rollcall = StubRollcall(
+                course_id=course_id,
+                rollcall_id=rollcall_id or f"{course_id}-r{len(self.rollcalls)}",
+                opens_at=opens_in,
+                closes_at=opens_in + duration
+            )
+            self.rollcalls.append(rollcall)
+            self._by_course.setdefault(course_id, []).append(rollcall)
+            self._by_id[rollcall.rollcall_id] = rollcall
+        return rollcall
+
+    def expire_session(self) -> None:
+        """Redirect every authenticated request to the login page until the next login"""
+        self.session_expired = True
+
+    def open_rollcall(self, course_id: str) -> Optional[StubRollcall]:
+        """Get the rollcall currently open for a course"""
+        now = self.elapsed()
+        with self._lock:
+            for rollcall in self._by_course.get(course_id, []):
+                if rollcall.opens_at <= now < rollcall.closes_at:
+                    return rollcall
+        return None
+
+    def check_in(self, rollcall_id: str) -> bool:
+        """Record a check-in; returns False when the rollcall is not open"""
+        now = self.elapsed()
+        with self._lock:
+            rollcall = self._by_id.get(rollcall_id)
+            if rollcall is None or not rollcall.opens_at <= now < rollcall.closes_at:
+                return False
+            if rollcall.checked_in_at is None:
+                rollcall.checked_in_at = now
+        return True
+
+    def rollcall_page(self, rollcall_id: Optional[str]) -> bytes:
+        """Render a rollcall page, cached because padded pages are large"""
+        page = self._pages.get(rollcall_id)
+        if page is None:
+            page = _rollcall_page(rollcall_id, self.profile.page_padding)
+            self._pages[rollcall_id] = page
+        return page
+
+    def count(self, bucket: Dict[str, int], key: str) -> None:
+        with self._lock:
+            bucket[key] = bucket.get(key, 0) + 1
+
+    def next_fault(self) -> Optional[str]:
+        """Decide which fault, if any, the next response suffers"""
+        profile = self.profile
+        with self._lock:
+            if self._burst_left > 0:
+                self._burst_left -= 1
+                return "5xx"
+            roll = self.rng.random
+            if roll() < profile.error_burst_rate:
+                self._burst_left = max(0, profile.error_burst_length - 1)
+                return "5xx"
+            if roll() < profile.stall_rate:
+                return "stall"
+            if roll() < profile.login_redirect_rate:
+                return "login-redirect"
+            if roll() < profile.truncate_rate:
+                return "truncate"
+        return None
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    """Threaded server that ignores clients hanging up mid-response"""
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+def make_courses(count: int) -> List[Dict]:
+    """Build `count` simulated course records"""
+    return [
+        {'course_id': str(100000 + i), 'course_name': f"模擬課程 {i}", 'teacher_name': f"教師 {i}"}
+        for i in range(count)
+    ]
+
+
+def _make_handler(stub: StubZuvioServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body are written separately; avoid delayed-ACK stalls
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            self._dispatch("GET")
+
+        def do_HEAD(self):
+            self._dispatch("GET")
+
+        def do_POST(self):
+            self._dispatch("POST")
+
+        def _dispatch(self, method: str) -> None:
+            parsed = urlparse(self.path)
+            length = int(self.headers.get('Content-Length') or 0)
+            form = parse_qs(self.rfile.read(length).decode('utf-8')) if length else {}
+
+            if method == "POST" and parsed.path == "/irs/submitLogin":
+                endpoint = "login"
+            elif method == "GET" and parsed.path == "/course/listStudentCurrentCourses":
+                endpoint = "courses"
+            elif method == "GET" and parsed.path.startswith("/student5/irs/rollcall/"):
+                endpoint = "rollcall"
+            elif method == "POST" and parsed.path == "/app_v2/makeRollcall":
+                endpoint = "checkin"
+            elif parsed.path == "/irs/login":
+                self._send(200, _login_page(), "text/html")
+                return
+            else:
+                self._send(404, b"not found", "text/plain")
+                return
+
+            stub.count(stub.stats.requests, endpoint)
+            delay = stub.profile.sample_latency(stub.rng)
+            if delay and stub._stopping.wait(delay):
+                return
+
+            if endpoint == "login":
+                stub.session_expired = False
+            fault = None if endpoint == "login" else stub.next_fault()
+            if fault is None and endpoint != "login" and stub.session_expired:
+                fault = "login-redirect"
+            if fault:
+                stub.count(stub.stats.faults, fault)
+            if fault == "stall":
+                stub._stopping.wait(stub.profile.stall_seconds)
+                self.close_connection = True
+                return
+            if fault == "5xx":
+                self._send(503, b"<html><body>Service Unavailable</body></html>", "text/html")
+                return
+            if fault == "login-redirect":
+                self.send_response(302)
+                self.send_header('Location', '/irs/login')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+
+            if endpoint == "login":
+                body, content_type = _login_result_page(), "text/html"
+            elif endpoint == "courses":
+                body = json.dumps({'status': True, 'courses': stub.courses}).encode('utf-8')
+                content_type = "application/json"
+            elif endpoint == "rollcall":
+                course_id = parsed.path.rsplit('/', 1)[-1]
+                rollcall = stub.open_rollcall(course_id)
+                body = stub.rollcall_page(rollcall.rollcall_id if rollcall else None)
+                content_type = "text/html"
+            else:
+                rollcall_id = form.get('rollcall_id', [''])[0]
+                if stub.check_in(rollcall_id):
+                    result = {'status': True}
+                else:
+                    result = {'status': False, 'msg': '簽到已結束'}
+                body = json.dumps(result, ensure_ascii=False).encode('utf-8')
+                content_type = "application/json"
+
+            self._send(200, body, content_type, truncate=fault == "truncate")
+
+        def _send(self, status: int, body: bytes, content_type: str, truncate: bool = False) -> None:
+            encoding = None
+            if 'gzip' in (self.headers.get('Accept-Encoding') or ''):
+                body = gzip.compress(body, mtime=0)
+                encoding = 'gzip'
+            self.send_response(status)
+            self.send_header('Content-Type', f"{content_type}; charset=utf-8")
+            if encoding:
+                self.send_header('Content-Encoding', encoding)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if self.command == "HEAD":
+                return
+            if truncate:
+                self.wfile.write(body[:len(body) // 2])
+                self.close_connection = True
+            else:
+                self.wfile.write(body)
+
+    return Handler
+
+
+def _login_page() -> bytes:
+    return "<html><body><form action=\"/irs/submitLogin\">登入</form></body></html>".encode('utf-8')
+
+
+def _login_result_page() -> bytes:
+    return (
+        "<html><body><script>"
+        f"var user_id = \"{STUB_USER_ID}\";\n"
+        f"var accessToken = \"{STUB_ACCESS_TOKEN}\";\n"
+        "</script></body></html>"
+    ).encode('utf-8')
+
+
+def _rollcall_page(rollcall_id: Optional[str], padding: int) -> bytes:
+    script = f"<script>var rollcall_id = '{rollcall_id}';</script>" if rollcall_id else ""
+    filler = "<div class=\"filler\"></div>" * (padding // 25)
+    return f"<html><body>{filler}{script}</body></html>".encode('utf-8')
+
+
+def main():
+    """Run the stub server in the foreground"""
+    parser = argparse.ArgumentParser(description='Local stand-in for the Zuvio endpoints')
+    parser.add_argument('--port', type=int, default=8000, help='Port to listen on')
+    parser.add_argument('--courses', type=int, default=5, help='Number of simulated courses')
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='healthy', help='Fault profile')
+    parser.add_argument('--open-every', type=float, default=60.0,
+                        help='Open a rollcall on each course every N seconds')
+    args = parser.parse_args()
+
+    stub = StubZuvioServer(make_courses(args.courses), PROFILES[args.profile], port=args.port)
+    for index, course in enumerate(stub.courses):
+        for cycle in range(100):
+            stub.schedule_rollcall(course['course_id'], index * 5 + cycle * args.open_every, 10)
+    stub.start()
+    print(f"Stub Zuvio server ({args.profile}) listening on {stub.base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        stub.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
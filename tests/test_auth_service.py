@@ -55,7 +55,7 @@ class TestAuthService(unittest.TestCase):
         credentials = UserCredentials(account="test@example.com", password="password123")
         
         with patch.object(self.auth_service.session, 'post', side_effect=Exception("Network error")):
-            with patch('main.logger') as mock_logger:
+            with patch('zuvio_api.logger') as mock_logger:
                 result = self.auth_service.login(credentials)
                 
                 self.assertIsNone(result)
@@ -80,7 +80,7 @@ class TestAuthService(unittest.TestCase):
         """Test token extraction when no scripts found"""
         html_content = b'<html><body>No scripts here</body></html>'
         
-        with patch('main.logger') as mock_logger:
+        with patch('zuvio_api.logger') as mock_logger:
             result = self.auth_service._extract_tokens(html_content)
             
             self.assertIsNone(result)
@@ -90,7 +90,7 @@ class TestAuthService(unittest.TestCase):
         """Test token extraction with exception"""
         html_content = b'invalid html content'
         
-        with patch('main.logger') as mock_logger:
+        with patch('zuvio_api.logger') as mock_logger:
             result = self.auth_service._extract_tokens(html_content)
             
             self.assertIsNone(result)
@@ -120,7 +120,7 @@ class TestAuthService(unittest.TestCase):
         mock_response.raise_for_status.side_effect = Exception("Unauthorized")
         
         with patch.object(self.auth_service.session, 'post', return_value=mock_response):
-            with patch('main.logger') as mock_logger:
+            with patch('zuvio_api.logger') as mock_logger:
                 result = self.auth_service.login(credentials)
                 
                 self.assertIsNone(result)
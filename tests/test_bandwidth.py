@@ -0,0 +1,141 @@
+"""
+Unit tests for bandwidth accounting
+"""
+
+import unittest
+from unittest.mock import patch
+import gzip
+import importlib.util
+import threading
+import sys
+import os
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# Add parent directory to path to import main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bandwidth import BandwidthMeter, accept_encoding, endpoint_name
+from clock import SimulatedClock
+from transport import create_transport
+
+
+PAGE = b"<html>" + b"<p>rollcall</p>" * 2000 + b"</html>"
+
+
+class _GzipHandler(BaseHTTPRequestHandler):
+    """Serve a gzip-compressed page, chunked when the path asks for it"""
+    protocol_version = 'HTTP/1.1'
+    
+    def do_GET(self):
+        data = gzip.compress(PAGE)
+        self.send_response(200)
+        self.send_header('Content-Encoding', 'gzip')
+        if 'chunked' in self.path:
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            self.wfile.write(b"%x\r\n%s\r\n0\r\n\r\n" % (len(data), data))
+        else:
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+    
+    def log_message(self, *args):
+        pass
+
+
+class TestBandwidthMeter(unittest.TestCase):
+    """Test cases for BandwidthMeter class"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.clock = SimulatedClock(datetime(2024, 9, 2, 8, 0))
+        self.meter = BandwidthMeter(self.clock)
+    
+    def test_endpoint_name(self):
+        """Test URLs map to stable endpoint names"""
+        self.assertEqual(endpoint_name("https://irs.zuvio.com.tw/student5/irs/rollcall/123"), 'rollcall')
+        self.assertEqual(endpoint_name("https://irs.zuvio.com.tw/app_v2/makeRollcall"), 'checkin')
+        self.assertEqual(endpoint_name("https://irs.zuvio.com.tw/other/42/page"), '/other/{id}/page')
+    
+    def test_accept_encoding_includes_gzip(self):
+        """Test compression is always negotiated"""
+        self.assertTrue(accept_encoding().startswith('gzip, deflate'))
+    
+    def test_record_and_report(self):
+        """Test counters are aggregated per endpoint"""
+        self.meter.record('rollcall', 100, 1000)
+        self.meter.record('rollcall', 100, 1000)
+        
+        usage = self.meter.days[self.clock.now().date()]['rollcall']
+        self.assertEqual(usage.requests, 2)
+        self.assertEqual(usage.ratio, 10.0)
+        self.assertIn('rollcall', self.meter.report())
+    
+    def test_previous_day_reported_on_rollover(self):
+        """Test the previous day's report is logged on the first response of a new day"""
+        self.meter.record('rollcall', 100, 1000)
+        self.clock.advance(timedelta(days=1).total_seconds())
+        
+        with patch('bandwidth.logger') as mock_logger:
+            self.meter.record('rollcall', 100, 1000)
+            
+            mock_logger.info.assert_called_once()
+            self.assertIn('2024-09-02', mock_logger.info.call_args[0][0])
+    
+    def test_counts_wire_and_decoded_bytes(self):
+        """Test compressed responses report wire bytes below decoded bytes"""
+        server = ThreadingHTTPServer(('127.0.0.1', 0), _GzipHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        
+        session = requests.Session()
+        self.meter.attach(session)
+        base = f"http://127.0.0.1:{server.server_port}"
+        
+        plain = session.get(f"{base}/student5/irs/rollcall/1")
+        chunked = session.get(f"{base}/student5/irs/rollcall/2?chunked=1")
+        
+        self.assertEqual(plain.content, PAGE)
+        self.assertEqual(chunked.content, PAGE)
+        usage = self.meter.days[self.clock.now().date()]['rollcall']
+        self.assertEqual(usage.requests, 2)
+        self.assertEqual(usage.decoded_bytes, 2 * len(PAGE))
+        self.assertEqual(usage.wire_bytes, 2 * len(gzip.compress(PAGE)))
+    
+    def test_counts_other_transports(self):
+        """Test the httpx and aiohttp transports report wire and decoded bytes"""
+        server = ThreadingHTTPServer(('127.0.0.1', 0), _GzipHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = f"http://127.0.0.1:{server.server_port}/student5/irs/rollcall/1"
+        
+        for name in ('httpx', 'aiohttp'):
+            if importlib.util.find_spec(name) is None:
+                continue
+            with self.subTest(transport=name):
+                meter = BandwidthMeter(self.clock)
+                transport = create_transport(name)
+                self.addCleanup(transport.close)
+                meter.attach(transport)
+                
+                self.assertEqual(transport.get(url).content, PAGE)
+                usage = meter.days[self.clock.now().date()]['rollcall']
+                self.assertEqual(usage.decoded_bytes, len(PAGE))
+                self.assertEqual(usage.wire_bytes, len(gzip.compress(PAGE)))
+    
+    def test_session_without_hooks_warns(self):
+        """Test attaching to a client without response hooks logs that it is not counted"""
+        class Plain:
+            headers = {}
+        
+        with self.assertLogs('bandwidth', 'WARNING'):
+            self.meter.attach(Plain())
+
+
+if __name__ == '__main__':
+    unittest.main()
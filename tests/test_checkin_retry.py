@@ -0,0 +1,54 @@
+"""
+Unit tests for the check-in retry policy
+"""
+
+import unittest
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add parent directory to path to import main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from checkin_retry import CheckinRetries, is_transient
+
+
+class TestCheckinRetries(unittest.TestCase):
+    """Test cases for CheckinRetries class"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.now = datetime(2025, 3, 3, 9, 0, 0)
+        self.retries = CheckinRetries(max_attempts=3, base_delay=5, max_delay=60)
+    
+    def test_backoff_until_attempts_are_used_up(self):
+        """Test retries wait twice as long each time and stop at the attempt limit"""
+        self.assertTrue(self.retries.ready('rc1', self.now))
+        
+        retry_at = self.retries.record_failure('rc1', self.now)
+        self.assertEqual(retry_at, self.now + timedelta(seconds=5))
+        self.assertFalse(self.retries.ready('rc1', self.now + timedelta(seconds=4)))
+        self.assertTrue(self.retries.ready('rc1', retry_at))
+        
+        self.assertEqual(self.retries.record_failure('rc1', retry_at), retry_at + timedelta(seconds=10))
+        self.assertIsNone(self.retries.record_failure('rc1', retry_at + timedelta(seconds=10)))
+        self.assertTrue(self.retries.ready('rc1', retry_at + timedelta(seconds=10)))
+    
+    def test_rollcalls_are_tracked_separately(self):
+        """Test a failing rollcall does not hold back another one"""
+        self.retries.record_failure('rc1', self.now)
+        
+        self.assertTrue(self.retries.ready('rc2', self.now))
+        self.retries.clear('rc1')
+        self.assertTrue(self.retries.ready('rc1', self.now))
+    
+    def test_transient_causes(self):
+        """Test only failures before the server answered are retried"""
+        for cause in ('timeout', 'connection', 'http_503', 'http_429'):
+            self.assertTrue(is_transient(cause), cause)
+        for cause in (None, 'rejected', 'invalid_response', 'http_403'):
+            self.assertFalse(is_transient(cause), cause)
+
+
+if __name__ == '__main__':
+    unittest.main()
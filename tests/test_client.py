@@ -0,0 +1,112 @@
+"""
+Unit tests for the async ZuvioClient
+"""
+
+import unittest
+from unittest.mock import patch
+import asyncio
+import subprocess
+import sys
+import os
+import tempfile
+
+# Add parent directory to path to import main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from client import ZuvioClient, auto_check_in
+from main import Location, UserCredentials
+from scheduler import UniformPollScheduler
+from stub_server import StubZuvioServer, make_courses
+
+
+class TestZuvioClient(unittest.TestCase):
+    """Test cases for ZuvioClient class"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.stub = StubZuvioServer(make_courses(3), seed=0).start()
+        self.addCleanup(self.stub.stop)
+        self.credentials = UserCredentials("test@example.com", "password123")
+        self.location = Location(latitude="22.1", longitude="120.3")
+    
+    def test_login_and_list_courses(self):
+        """Test login stores the token and courses are listed"""
+        async def scenario():
+            async with ZuvioClient(self.stub.base_url, timeout=2) as client:
+                auth_token = await client.login(self.credentials)
+                courses = await client.list_courses()
+                return auth_token, courses
+        
+        auth_token, courses = asyncio.run(scenario())
+        
+        self.assertIsNotNone(auth_token)
+        self.assertEqual(len(courses), 3)
+    
+    def test_list_courses_requires_login(self):
+        """Test calls needing a token fail before login"""
+        async def scenario():
+            async with ZuvioClient(self.stub.base_url, timeout=2) as client:
+                await client.list_courses()
+        
+        with self.assertRaises(RuntimeError):
+            asyncio.run(scenario())
+    
+    def test_watch_rollcalls_and_check_in(self):
+        """Test an opened rollcall is yielded once and can be checked in"""
+        rollcall = self.stub.schedule_rollcall('100001', opens_in=0.2, duration=30)
+        
+        async def scenario():
+            async with ZuvioClient(self.stub.base_url, timeout=2) as client:
+                await client.login(self.credentials)
+                scheduler = UniformPollScheduler(0.05, 0.1)
+                async for event in client.watch_rollcalls(scheduler=scheduler):
+                    result = await client.check_in(event.rollcall_id, self.location)
+                    return event, result
+        
+        event, result = asyncio.run(asyncio.wait_for(scenario(), timeout=10))
+        
+        self.assertEqual(event.rollcall_id, rollcall.rollcall_id)
+        self.assertEqual(event.course['course_id'], '100001')
+        self.assertTrue(result[0])
+        self.assertIsNotNone(rollcall.checked_in_at)
+    
+    def test_auto_check_in_reports_without_printing(self):
+        """Test check-in results go to the callback, not to stdout"""
+        self.stub.schedule_rollcall('100001', opens_in=0.2, duration=30)
+        results = []
+        
+        async def scenario():
+            async with ZuvioClient(self.stub.base_url, timeout=2) as client:
+                await client.login(self.credentials)
+                courses = await client.list_courses()
+                await auto_check_in(client, courses, self.location, UniformPollScheduler(0.05, 0.1),
+                                    on_result=lambda *result: results.append(result))
+        
+        async def until_checked_in():
+            task = asyncio.ensure_future(scenario())
+            while not results:
+                await asyncio.sleep(0.05)
+            task.cancel()
+        
+        with patch('builtins.print') as mock_print:
+            asyncio.run(asyncio.wait_for(until_checked_in(), timeout=10))
+        
+        event, success, message = results[0]
+        self.assertEqual(event.course['course_id'], '100001')
+        self.assertTrue(success)
+        mock_print.assert_not_called()
+    
+    def test_import_leaves_logging_alone(self):
+        """Test importing the client neither creates zuvio.log nor configures the root logger"""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        with tempfile.TemporaryDirectory() as cwd:
+            output = subprocess.run(
+                [sys.executable, '-c', 'import logging, client; print(len(logging.getLogger().handlers))'],
+                cwd=cwd, env=dict(os.environ, PYTHONPATH=root), capture_output=True, text=True, check=True
+            ).stdout
+            self.assertEqual(output.strip(), '0')
+            self.assertFalse(os.path.exists(os.path.join(cwd, 'zuvio.log')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+"""
+Unit tests for clock classes
+"""
+
+import unittest
+from unittest.mock import patch
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add parent directory to path to import main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clock import SimulatedClock, SystemClock
+
+
+class TestSimulatedClock(unittest.TestCase):
+    """Test cases for SimulatedClock class"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.start = datetime(2024, 9, 2, 8, 0, 0)
+        self.clock = SimulatedClock(self.start)
+    
+    def test_sleep_advances_time(self):
+        """Test sleeping moves virtual time forward"""
+        self.clock.sleep(90)
+        
+        self.assertEqual(self.clock.now(), self.start + timedelta(seconds=90))
+        self.assertEqual(self.clock.monotonic(), 90)
+    
+    def test_advance_backwards_raises(self):
+        """Test virtual time cannot move backwards"""
+        with self.assertRaises(ValueError):
+            self.clock.advance(-1)
+
+
+class TestSystemClock(unittest.TestCase):
+    """Test cases for SystemClock class"""
+    
+    def test_sleep_uses_time_sleep(self):
+        """Test sleeping delegates to time.sleep"""
+        with patch('time.sleep') as mock_sleep:
+            SystemClock().sleep(2)
+            mock_sleep.assert_called_once_with(2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,7 @@ Unit tests for ConfigManager class
 """
 
 import unittest
-from unittest.mock import patch, mock_open, MagicMock
+from unittest.mock import patch, MagicMock
 import tempfile
 import os
 import sys
@@ -73,9 +73,104 @@ lng = 120.456
         self.config_manager.config.add_section('test')
         self.config_manager.config['test']['key'] = 'value'
         
-        with patch('builtins.open', mock_open()) as mock_file:
-            self.config_manager.save_config()
-            mock_file.assert_called_once_with(self.temp_file.name, 'w', encoding='utf-8')
+        self.config_manager.save_config()
+        
+        with open(self.temp_file.name, encoding='utf-8') as f:
+            self.assertIn('key = value', f.read())
+        self.assertEqual(os.stat(self.temp_file.name).st_mode & 0o777, 0o600)
+        leftovers = [name for name in os.listdir(os.path.dirname(self.temp_file.name))
+                     if name.startswith('.config-') and name.endswith('.tmp')]
+        self.assertEqual(leftovers, [])
+    
+    def test_save_config_failure_keeps_original_file(self):
+        """Test a failed write leaves the previous file intact"""
+        with open(self.temp_file.name, 'w', encoding='utf-8') as f:
+            f.write("[user]\naccount = old\n")
+        self.config_manager.load_config()
+        
+        with patch('main.os.replace', side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.config_manager.save_config()
+        
+        with open(self.temp_file.name, encoding='utf-8') as f:
+            self.assertEqual(f.read(), "[user]\naccount = old\n")
+    
+    def test_batch_coalesces_saves(self):
+        """Test saves inside batch() produce a single write"""
+        with patch('main.os.replace', wraps=os.replace) as mock_replace:
+            with self.config_manager.batch():
+                self.config_manager.save_user_credentials(UserCredentials('a@example.com', 'pw'))
+                self.config_manager.save_location(Location(latitude='22.1', longitude='120.2'))
+                mock_replace.assert_not_called()
+            mock_replace.assert_called_once()
+        
+        reloaded = ConfigManager(self.temp_file.name)
+        self.assertEqual(reloaded.get_user_credentials().account, 'a@example.com')
+        self.assertEqual(reloaded.get_location().latitude, '22.1')
+    
+    def test_reload_if_changed(self):
+        """Test edits to the file are picked up on the next access only when it changed"""
+        listener = MagicMock()
+        self.config_manager.add_reload_listener(listener)
+        self.config_manager.save_location(Location(latitude='22.1', longitude='120.2'))
+        self.assertFalse(self.config_manager.reload_if_changed())
+        
+        with open(self.temp_file.name, 'w', encoding='utf-8') as f:
+            f.write("[schedule]\npolicy = predictive\n")
+        
+        self.assertEqual(self.config_manager.get_schedule_settings().policy, 'predictive')
+        self.assertIsNone(self.config_manager.get_location())
+        # Getters reload on whatever thread calls them but leave the listeners to reload_if_changed
+        listener.assert_not_called()
+        
+        self.assertTrue(self.config_manager.reload_if_changed())
+        self.assertFalse(self.config_manager.reload_if_changed())
+        listener.assert_called_once()
+    
+    def test_unparsable_edit_keeps_previous_config(self):
+        """Test a file that no longer parses leaves the loaded settings in place"""
+        with open(self.temp_file.name, 'w', encoding='utf-8') as f:
+            f.write("[schedule]\npolicy = predictive\n")
+        self.config_manager.reload_if_changed()
+        
+        with open(self.temp_file.name, 'w', encoding='utf-8') as f:
+            f.write("policy = uniform\n")
+        with self.assertLogs('main', 'WARNING'):
+            self.assertEqual(self.config_manager.get_schedule_settings().policy, 'predictive')
+        self.assertFalse(self.config_manager.reload_if_changed())
+    
+    def test_invalid_value_keeps_previous_settings(self):
+        """Test a value that does not parse keeps the last valid settings"""
+        with open(self.temp_file.name, 'w', encoding='utf-8') as f:
+            f.write("[schedule]\nmin_interval = 2\n")
+        self.assertEqual(self.config_manager.get_schedule_settings().min_interval, 2)
+        
+        with open(self.temp_file.name, 'w', encoding='utf-8') as f:
+            f.write("[schedule]\nmin_interval = 1s\n")
+        with self.assertLogs('main', 'WARNING'):
+            self.assertEqual(self.config_manager.get_schedule_settings().min_interval, 2)
+    
+    def test_failing_listener_does_not_raise(self):
+        """Test an edit a listener rejects is logged instead of stopping the loop"""
+        self.config_manager.add_reload_listener(MagicMock(side_effect=ValueError("bad interval")))
+        with open(self.temp_file.name, 'w', encoding='utf-8') as f:
+            f.write("[schedule]\nmin_interval = 9\n")
+        
+        with self.assertLogs('main', 'ERROR'):
+            self.assertTrue(self.config_manager.reload_if_changed())
+    
+    def test_reload_swaps_in_a_fully_loaded_parser(self):
+        """Test a reader holding the previous parser keeps a complete view"""
+        self.config_manager.save_location(Location(latitude='22.1', longitude='120.2'))
+        previous = self.config_manager.config
+        
+        with open(self.temp_file.name, 'w', encoding='utf-8') as f:
+            f.write("[schedule]\npolicy = predictive\n")
+        self.config_manager.reload_if_changed()
+        
+        self.assertIsNot(self.config_manager.config, previous)
+        self.assertEqual(previous['location']['lat'], '22.1')
+        self.assertEqual(self.config_manager.config.sections(), ['schedule'])
     
     def test_get_user_credentials_success(self):
         """Test getting user credentials when they exist"""
@@ -135,6 +230,51 @@ lng = 120.456
             self.assertEqual(self.config_manager.config['location']['lng'], '120.456')
             mock_save.assert_called_once()
 
+    
+    def test_get_schedule_settings_defaults(self):
+        """Test schedule settings fall back to defaults"""
+        settings = self.config_manager.get_schedule_settings()
+        
+        self.assertEqual(settings.policy, 'uniform')
+        self.assertEqual(settings.min_interval, 1.0)
+        self.assertEqual(settings.max_interval, 5.0)
+    
+    def test_get_schedule_settings_from_config(self):
+        """Test schedule settings are read from the schedule section"""
+        self.config_manager.config.add_section('schedule')
+        self.config_manager.config['schedule']['policy'] = 'predictive'
+        self.config_manager.config['schedule']['cold_interval'] = '120'
+        
+        settings = self.config_manager.get_schedule_settings()
+        
+        self.assertEqual(settings.policy, 'predictive')
+        self.assertEqual(settings.cold_interval, 120.0)
+
+    
+    def test_get_notify_settings(self):
+        """Test notification backends are read from the notify section"""
+        self.assertEqual(self.config_manager.get_notify_settings().webhook_url, '')
+        
+        self.config_manager.config.add_section('notify')
+        self.config_manager.config['notify']['webhook_url'] = 'https://hooks.example.com/zuvio'
+        self.config_manager.config['notify']['batch_window'] = '5'
+        
+        settings = self.config_manager.get_notify_settings()
+        
+        self.assertEqual(settings.webhook_url, 'https://hooks.example.com/zuvio')
+        self.assertEqual(settings.command, '')
+        self.assertEqual(settings.batch_window, 5.0)
+    
+    def test_get_course_filter_from_config(self):
+        """Test course rules are read from the courses section and cached"""
+        self.config_manager.config.add_section('courses')
+        self.config_manager.config['courses']['include'] = 'id:101'
+        
+        course_filter = self.config_manager.get_course_filter()
+        
+        self.assertEqual(len(course_filter.include), 1)
+        self.assertIs(self.config_manager.get_course_filter(), course_filter)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,71 @@
+"""
+Unit tests for course selection rules
+"""
+
+import unittest
+import sys
+import os
+
+# Add parent directory to path to import main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course_rules import CourseFilter, CourseRule
+
+
+class TestCourseFilter(unittest.TestCase):
+    """Test cases for CourseRule and CourseFilter classes"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.courses = [
+            {'course_id': '101', 'course_name': '資料結構', 'teacher_name': '王老師'},
+            {'course_id': '102', 'course_name': '體育（籃球）', 'teacher_name': '李老師'},
+            {'course_id': '103', 'course_name': 'Zuvio 公告', 'teacher_name': 'Zuvio 官方'}
+        ]
+    
+    def test_default_excludes_zuvio(self):
+        """Test the default filter drops Zuvio official activities"""
+        result = CourseFilter.from_text().apply(self.courses)
+        
+        self.assertEqual([c['course_id'] for c in result], ['101', '102'])
+    
+    def test_include_by_id(self):
+        """Test include rules restrict the poll set"""
+        result = CourseFilter.from_text(include="id:102").apply(self.courses)
+        
+        self.assertEqual([c['course_id'] for c in result], ['102'])
+    
+    def test_exclude_by_name_pattern(self):
+        """Test exclude rules match course names as patterns"""
+        result = CourseFilter.from_text(exclude="teacher:zuvio\nname:^體育").apply(self.courses)
+        
+        self.assertEqual([c['course_id'] for c in result], ['101'])
+    
+    def test_exclude_wins_over_include(self):
+        """Test a course matching both lists is excluded"""
+        result = CourseFilter.from_text(include="teacher:老師", exclude="id:101").apply(self.courses)
+        
+        self.assertEqual([c['course_id'] for c in result], ['102'])
+    
+    def test_rules_compiled_once(self):
+        """Test pattern rules are compiled at parse time"""
+        rule = CourseRule.parse("name:結構$")
+        
+        self.assertIsNotNone(rule.pattern)
+        self.assertTrue(rule.matches(self.courses[0]))
+    
+    def test_invalid_rules_are_skipped(self):
+        """Test invalid rules are ignored instead of failing the load"""
+        course_filter = CourseFilter.from_text(include="room:A1\nname:(", exclude="")
+        
+        self.assertEqual(course_filter.include, [])
+        self.assertEqual(len(course_filter.apply(self.courses)), 3)
+    
+    def test_parse_invalid_rule_raises(self):
+        """Test parsing an unknown rule kind raises ValueError"""
+        with self.assertRaises(ValueError):
+            CourseRule.parse("room:A1")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,11 +2,14 @@
 Unit tests for CourseService class
 """
 
+import json
 import unittest
 from unittest.mock import patch, MagicMock
 import sys
 import os
 
+import requests
+
 # Add parent directory to path to import main module
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -32,7 +35,7 @@ class TestCourseService(unittest.TestCase):
         """Test successful course retrieval"""
         mock_response = MagicMock()
         mock_response.raise_for_status.return_value = None
-        mock_response.json.return_value = {
+        mock_response.content = json.dumps({
             'status': True,
             'courses': [
                 {
@@ -51,7 +54,7 @@ class TestCourseService(unittest.TestCase):
                     'course_id': 'course2'
                 }
             ]
-        }
+        }).encode()
         
         self.mock_session.get.return_value = mock_response
         
@@ -62,14 +65,80 @@ class TestCourseService(unittest.TestCase):
         self.assertEqual(result[0]['course_name'], 'Test Course 1')
         self.assertEqual(result[1]['course_name'], 'Test Course 2')
     
+    def test_get_courses_returns_course_records(self):
+        """Test course list entries are decoded with the configured decoder into Course records"""
+        from courses import Course
+        self.course_service = CourseService(self.mock_session, json_loads=json.loads)
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers = {}
+        mock_response.content = json.dumps({
+            'status': True,
+            'courses': [{'course_name': '計算機概論', 'teacher_name': '王老師', 'course_id': 101, 'extra': 'x'}]
+        }).encode()
+        self.mock_session.get.return_value = mock_response
+        
+        result = self.course_service.get_courses(self.auth_token)
+        
+        self.assertEqual(result, [Course('101')])
+        self.assertEqual(result[0].teacher_name, '王老師')
+    
+    def test_get_courses_not_modified_uses_cache(self):
+        """Test an unchanged course list is served from the conditional-fetch cache"""
+        first = MagicMock()
+        first.status_code = 200
+        first.headers = {'ETag': '"v1"'}
+        first.content = json.dumps({
+            'status': True,
+            'courses': [{'course_name': 'Test Course 1', 'teacher_name': 'Teacher 1', 'course_id': 'course1'}]
+        }).encode()
+        not_modified = MagicMock()
+        not_modified.status_code = 304
+        
+        self.mock_session.get.side_effect = [first, not_modified]
+        
+        self.course_service.get_courses(self.auth_token)
+        result = self.course_service.get_courses(self.auth_token)
+        
+        self.assertEqual(result[0]['course_id'], 'course1')
+        _, kwargs = self.mock_session.get.call_args
+        self.assertEqual(kwargs['headers'], {'If-None-Match': '"v1"'})
+        not_modified.json.assert_not_called()
+        self.assertEqual(self.course_service.metrics.get('courses.cache_hits'), 1)
+        self.assertEqual(self.course_service.metrics.get('courses.cache_misses'), 1)
+        self.assertEqual(self.course_service.metrics.get('http.requests'), 2)
+    
+    def test_set_course_filter_drops_cache(self):
+        """Test new course rules force a full fetch instead of a conditional one"""
+        from course_rules import CourseFilter
+        response = MagicMock()
+        response.status_code = 200
+        response.headers = {'ETag': '"v1"'}
+        response.content = json.dumps({
+            'status': True,
+            'courses': [
+                {'course_name': 'Test Course 1', 'teacher_name': 'Teacher 1', 'course_id': 'course1'},
+                {'course_name': 'Test Course 2', 'teacher_name': 'Teacher 2', 'course_id': 'course2'}
+            ]
+        }).encode()
+        self.mock_session.get.return_value = response
+        self.course_service.get_courses(self.auth_token)
+        
+        self.course_service.set_course_filter(CourseFilter.from_text(include='id:course2'))
+        result = self.course_service.get_courses(self.auth_token)
+        
+        _, kwargs = self.mock_session.get.call_args
+        self.assertEqual(kwargs['headers'], {})
+        self.assertEqual([course['course_id'] for course in result], ['course2'])
+    
     def test_get_courses_failed_status(self):
         """Test course retrieval with failed status"""
         mock_response = MagicMock()
-        mock_response.json.return_value = {'status': False}
+        mock_response.content = b'{"status": false}'
         
         self.mock_session.get.return_value = mock_response
         
-        with patch('main.logger') as mock_logger:
+        with patch('zuvio_api.logger') as mock_logger:
             result = self.course_service.get_courses(self.auth_token)
             
             self.assertIsNone(result)
@@ -80,7 +149,7 @@ class TestCourseService(unittest.TestCase):
         import requests
         self.mock_session.get.side_effect = requests.RequestException("Network error")
         
-        with patch('main.logger') as mock_logger:
+        with patch('zuvio_api.logger') as mock_logger:
             result = self.course_service.get_courses(self.auth_token)
             
             self.assertIsNone(result)
@@ -88,15 +157,13 @@ class TestCourseService(unittest.TestCase):
     
     def test_get_courses_json_decode_error(self):
         """Test course retrieval with JSON decode error"""
-        import json
-        
         mock_response = MagicMock()
         mock_response.raise_for_status.return_value = None
-        mock_response.json.side_effect = json.JSONDecodeError("Invalid JSON", "doc", 0)
+        mock_response.content = b'not json'
         
         self.mock_session.get.return_value = mock_response
         
-        with patch('main.logger') as mock_logger:
+        with patch('zuvio_api.logger') as mock_logger:
             result = self.course_service.get_courses(self.auth_token)
             
             self.assertIsNone(result)
@@ -133,7 +200,7 @@ class TestCourseService(unittest.TestCase):
         """Test rollcall availability check with exception"""
         self.mock_session.get.side_effect = Exception("Network error")
         
-        with patch('main.logger') as mock_logger:
+        with patch('zuvio_api.logger') as mock_logger:
             result = self.course_service.check_rollcall_availability('course1')
             
             self.assertIsNone(result)
@@ -147,7 +214,7 @@ class TestCourseService(unittest.TestCase):
         
         self.mock_session.post.return_value = mock_response
         
-        with patch('main.logger') as mock_logger:
+        with patch('zuvio_api.logger') as mock_logger:
             success, message = self.course_service.perform_checkin(
                 self.auth_token, 'rollcall123', self.location
             )
@@ -167,7 +234,7 @@ class TestCourseService(unittest.TestCase):
         
         self.mock_session.post.return_value = mock_response
         
-        with patch('main.logger') as mock_logger:
+        with patch('zuvio_api.logger') as mock_logger:
             success, message = self.course_service.perform_checkin(
                 self.auth_token, 'rollcall123', self.location
             )
@@ -175,12 +242,37 @@ class TestCourseService(unittest.TestCase):
             self.assertFalse(success)
             self.assertEqual(message, "簽到失敗：簽到已結束")
             mock_logger.warning.assert_called_with("簽到失敗: 簽到已結束")
+        self.assertEqual(self.course_service.last_checkin_error, 'rejected')
+    
+    def test_perform_checkin_non_object_response(self):
+        """Test a JSON body that is not an object is reported as an invalid response"""
+        mock_response = MagicMock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = ['unexpected']
+        self.mock_session.post.return_value = mock_response
+        
+        with patch('zuvio_api.logger'):
+            success, message = self.course_service.perform_checkin(self.auth_token, 'rollcall123', self.location)
+        
+        self.assertFalse(success)
+        self.assertIn("解析簽到回應失敗", message)
+        self.assertEqual(self.course_service.last_checkin_error, 'invalid_response')
+    
+    def test_perform_checkin_timeout_cause(self):
+        """Test a timed-out check-in is classified as a transport failure"""
+        self.mock_session.post.side_effect = requests.Timeout("Read timed out")
+        
+        with patch('zuvio_api.logger'):
+            success, _ = self.course_service.perform_checkin(self.auth_token, 'rollcall123', self.location)
+        
+        self.assertFalse(success)
+        self.assertEqual(self.course_service.last_checkin_error, 'timeout')
     
     def test_perform_checkin_request_exception(self):
         """Test check-in with request exception"""
         self.mock_session.post.side_effect = Exception("Network error")
         
-        with patch('main.logger') as mock_logger:
+        with patch('zuvio_api.logger') as mock_logger:
             success, message = self.course_service.perform_checkin(
                 self.auth_token, 'rollcall123', self.location
             )
@@ -199,7 +291,7 @@ class TestCourseService(unittest.TestCase):
         
         self.mock_session.post.return_value = mock_response
         
-        with patch('main.logger') as mock_logger:
+        with patch('zuvio_api.logger') as mock_logger:
             success, message = self.course_service.perform_checkin(
                 self.auth_token, 'rollcall123', self.location
             )
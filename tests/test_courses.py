@@ -0,0 +1,60 @@
+"""
+Unit tests for Course records and course list decoding
+"""
+
+import json
+import sys
+import os
+import unittest
+
+# Add parent directory to path to import main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from courses import Course, decode_json
+
+
+class TestCourse(unittest.TestCase):
+    """Test cases for Course"""
+
+    def test_from_dict_keeps_known_fields(self):
+        """Test unused API fields are dropped and ids normalized to strings"""
+        course = Course.from_dict({'course_id': 101, 'course_name': '體育', 'teacher_name': None, 'unread': 3})
+
+        self.assertEqual(course.to_dict(), {'course_id': '101', 'course_name': '體育', 'teacher_name': ''})
+        self.assertFalse(hasattr(course, '__dict__'))
+
+    def test_hashed_and_compared_by_course_id(self):
+        """Test courses with the same id are interchangeable as dict and set keys"""
+        first = Course('101', '體育', '王老師')
+        renamed = Course('101', '體育（一）', '王老師')
+
+        self.assertEqual(first, renamed)
+        self.assertEqual(len({first, renamed, Course('102')}), 2)
+        self.assertEqual({first: 1}[renamed], 1)
+
+    def test_mapping_access(self):
+        """Test field access by name matches plain course dicts"""
+        course = Course('101', '體育', '王老師')
+
+        self.assertEqual(course['course_name'], '體育')
+        self.assertEqual(course.get('teacher_name'), '王老師')
+        self.assertEqual(course.get('missing', 'default'), 'default')
+        with self.assertRaises(KeyError):
+            course['missing']
+
+
+class TestDecodeJson(unittest.TestCase):
+    """Test cases for decode_json"""
+
+    def test_decodes_bytes(self):
+        """Test response bodies decode without a separate text step"""
+        self.assertEqual(decode_json(b'{"status": true, "courses": []}'), {'status': True, 'courses': []})
+
+    def test_invalid_input_raises_json_decode_error(self):
+        """Test invalid bodies are reported as JSONDecodeError whichever decoder is installed"""
+        with self.assertRaises(json.JSONDecodeError):
+            decode_json(b'not json')
+
+
+if __name__ == '__main__':
+    unittest.main()
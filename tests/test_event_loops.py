@@ -0,0 +1,54 @@
+"""
+Unit tests for event loop selection
+"""
+
+import unittest
+from unittest.mock import patch
+import asyncio
+import sys
+import os
+
+# Add parent directory to path to import main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import event_loops
+
+
+class TestEventLoops(unittest.TestCase):
+    """Test cases for event loop selection"""
+    
+    def test_asyncio_loop(self):
+        """Test the stdlib loop can always be selected"""
+        name, factory = event_loops.select_event_loop('asyncio')
+        
+        self.assertEqual(name, 'asyncio')
+        self.assertIs(factory, asyncio.new_event_loop)
+    
+    def test_missing_uvloop_falls_back(self):
+        """Test asking for uvloop without it installed falls back with a warning"""
+        with patch.dict(sys.modules, {'uvloop': None}), \
+             patch('event_loops.logger') as mock_logger:
+            self.assertEqual(event_loops.select_event_loop('uvloop')[0], 'asyncio')
+            mock_logger.warning.assert_called_once()
+            
+            mock_logger.reset_mock()
+            self.assertEqual(event_loops.select_event_loop('auto')[0], 'asyncio')
+            mock_logger.warning.assert_not_called()
+    
+    def test_unknown_loop(self):
+        """Test unknown loop names are rejected"""
+        with self.assertRaises(ValueError):
+            event_loops.select_event_loop('trio')
+    
+    def test_run(self):
+        """Test a coroutine runs to completion on the selected loop"""
+        async def answer():
+            await asyncio.sleep(0)
+            return 42
+        
+        self.assertEqual(event_loops.run(answer(), 'asyncio'), 42)
+        self.assertIn('asyncio', event_loops.available_event_loops())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Unit tests for the NDJSON event stream
+"""
+
+import unittest
+from unittest.mock import patch
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+from datetime import datetime
+
+# Add parent directory to path to import main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clock import SimulatedClock
+from events import EventStream
+
+
+class TestEventStream(unittest.TestCase):
+    """Test cases for EventStream class"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.clock = SimulatedClock(datetime(2025, 3, 3, 9, 0, 0))
+    
+    def test_writes_ndjson_to_file(self):
+        """Test events are written one JSON object per line"""
+        path = os.path.join(self.temp_dir.name, 'events.ndjson')
+        stream = EventStream(path, self.clock).start()
+        stream.emit('poll_started', course_id='101')
+        stream.emit('checkin', course_id='101', course_name='計算機概論', success=True)
+        stream.close()
+        
+        with open(path, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(records[0], {'ts': '2025-03-03T09:00:00', 'event': 'poll_started', 'course_id': '101'})
+        self.assertEqual(records[1]['course_name'], '計算機概論')
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o600)
+    
+    def test_writes_to_unix_socket(self):
+        """Test a subscriber listening on a Unix socket receives the stream"""
+        path = os.path.join(self.temp_dir.name, 'events.sock')
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(path)
+        server.listen(1)
+        self.addCleanup(server.close)
+        received = []
+        
+        def subscriber():
+            conn, _ = server.accept()
+            with conn, conn.makefile('r', encoding='utf-8') as lines:
+                received.extend(json.loads(line) for line in lines)
+        
+        reader = threading.Thread(target=subscriber)
+        reader.start()
+        stream = EventStream(f"unix:{path}", self.clock).start()
+        stream.emit('auth_refresh', success=True)
+        stream.close()
+        reader.join(5)
+        
+        self.assertEqual([record['event'] for record in received], ['auth_refresh'])
+    
+    def test_emit_never_blocks_when_full(self):
+        """Test events beyond the queue bound are dropped, not waited on"""
+        stream = EventStream(os.path.join(self.temp_dir.name, 'events.ndjson'), self.clock, max_pending=2)
+        for _ in range(5):
+            stream.emit('poll_started', course_id='101')
+        
+        self.assertEqual(stream.dropped, 3)
+    
+    def test_unreachable_target_is_logged_once(self):
+        """Test a missing subscriber drops events without raising"""
+        stream = EventStream(f"unix:{os.path.join(self.temp_dir.name, 'missing.sock')}", self.clock,
+                             retry_interval=0.01)
+        with patch('events.logger') as mock_logger:
+            stream.start()
+            stream.emit('poll_started', course_id='101')
+            stream.close()
+            stream._write([{'event': 'poll_started'}])
+        
+        self.assertEqual(stream.dropped, 2)
+        mock_logger.warning.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
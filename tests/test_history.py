@@ -0,0 +1,71 @@
+"""
+Unit tests for RollcallHistory class
+"""
+
+import unittest
+import tempfile
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add parent directory to path to import main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history import RollcallHistory, week_offset
+
+
+class TestRollcallHistory(unittest.TestCase):
+    """Test cases for RollcallHistory class"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'history.json')
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.temp_dir.cleanup()
+    
+    def test_week_offset(self):
+        """Test week offsets count from Monday midnight"""
+        self.assertEqual(week_offset(datetime(2024, 9, 3, 1, 0)), 86400 + 3600)
+    
+    def test_record_open_persists(self):
+        """Test recorded open times survive a reload"""
+        history = RollcallHistory(self.path)
+        history.record_open('course1', datetime(2024, 9, 2, 9, 15))
+        
+        reloaded = RollcallHistory(self.path)
+        
+        self.assertEqual(reloaded.opens['course1'], [datetime(2024, 9, 2, 9, 15)])
+    
+    def test_record_open_keeps_recent_observations(self):
+        """Test only the most recent observations are kept"""
+        history = RollcallHistory(max_observations=2)
+        for week in range(3):
+            history.record_open('course1', datetime(2024, 9, 2, 9, 15) + timedelta(weeks=week))
+        
+        self.assertEqual(len(history.opens['course1']), 2)
+        self.assertEqual(history.opens['course1'][0], datetime(2024, 9, 9, 9, 15))
+    
+    def test_open_probability_peaks_at_observed_time(self):
+        """Test probability mass concentrates around observed open times next week"""
+        history = RollcallHistory()
+        history.record_open('course1', datetime(2024, 9, 2, 9, 15))
+        
+        near = history.open_probability('course1', datetime(2024, 9, 9, 9, 5), datetime(2024, 9, 9, 9, 25))
+        far = history.open_probability('course1', datetime(2024, 9, 10, 9, 5), datetime(2024, 9, 10, 9, 25))
+        
+        self.assertGreater(near, 0.9)
+        self.assertLess(far, 0.01)
+    
+    def test_corrupt_file_is_ignored(self):
+        """Test an unreadable history file starts an empty history"""
+        with open(self.path, 'w') as f:
+            f.write('not json')
+        
+        self.assertEqual(RollcallHistory(self.path).opens, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -22,6 +22,37 @@ class TestMain(unittest.TestCase):
             main()
             mock_run.assert_called_once()
     
+    def test_main_watch_command(self):
+        """Test the watch subcommand uses the non-interactive client"""
+        with patch('main.watch', return_value=0) as mock_watch, \
+             patch.object(ZuvioAutoChecker, 'run') as mock_run:
+            self.assertEqual(main(['watch']), 0)
+            mock_watch.assert_called_once()
+            mock_run.assert_not_called()
+    
+    @patch('builtins.print')
+    def test_watch_requires_saved_settings(self, mock_print):
+        """Test watch exits when credentials have not been set up"""
+        import main as main_module
+        config_manager = MagicMock()
+        config_manager.get_user_credentials.return_value = None
+        
+        self.assertEqual(main_module.watch(config_manager), 1)
+    
+    @patch('builtins.print')
+    def test_report_command(self, mock_print):
+        """Test the report subcommand prints a report from the history file"""
+        import json
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'run_history.jsonl')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps({'type': 'polls', 'course_id': '1', 'at': '2025-01-01T08:00:00',
+                                    'count': 9}) + "\n")
+            
+            self.assertEqual(main(['report', '--history', path]), 0)
+            self.assertEqual(main(['report', '--history', os.path.join(tmp, 'missing.jsonl')]), 1)
+    
     def test_main_module_imports(self):
         """Test that main module can be imported without errors"""
         try:
@@ -0,0 +1,166 @@
+"""
+Unit tests for check-in result notifications
+"""
+
+import unittest
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+# Add parent directory to path to import main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notifier import CommandBackend, Notifier, WebhookBackend
+
+
+class WebhookStandIn:
+    """Local HTTP endpoint recording webhook bodies
+
+    Answers with the queued status codes first, then 200; `delay` holds
+    every response back to simulate a slow endpoint.
+    """
+
+    def __init__(self, statuses=(), delay=0.0):
+        self.bodies = []
+        self.statuses = list(statuses)
+        self.delay = delay
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers['Content-Length']))
+                time.sleep(stand_in.delay)
+                status = stand_in.statuses.pop(0) if stand_in.statuses else 200
+                if status == 200:
+                    stand_in.bodies.append(json.loads(body))
+                self.send_response(status)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = HTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/hook"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def result(course_id, message="簽到成功！"):
+    return {'course_id': course_id, 'course_name': f"課程 {course_id}", 'rollcall_id': 'r1',
+            'success': True, 'message': message}
+
+
+class TestNotifier(unittest.TestCase):
+    """Test cases for Notifier with its backends"""
+    
+    def stand_in(self, **kwargs):
+        stand_in = WebhookStandIn(**kwargs)
+        self.addCleanup(stand_in.close)
+        return stand_in
+    
+    def test_batches_a_burst_into_one_webhook_call(self):
+        """Test results arriving together are delivered in one request"""
+        stand_in = self.stand_in()
+        notifier = Notifier(WebhookBackend(stand_in.url), batch_window=0.2).start()
+        for course_id in ('101', '102', '103'):
+            notifier.notify(result(course_id))
+        notifier.close()
+        
+        self.assertEqual(len(stand_in.bodies), 1)
+        self.assertEqual([r['course_id'] for r in stand_in.bodies[0]['results']], ['101', '102', '103'])
+        self.assertIn("課程 101 - 簽到成功！", stand_in.bodies[0]['text'])
+        self.assertEqual(notifier.sent, 3)
+    
+    def test_retries_failed_delivery_with_backoff(self):
+        """Test a failing endpoint is retried until it accepts the batch"""
+        stand_in = self.stand_in(statuses=[500, 503])
+        notifier = Notifier(WebhookBackend(stand_in.url), batch_window=0, retry_base=0.05).start()
+        notifier.notify(result('101'))
+        
+        deadline = time.monotonic() + 5
+        while notifier.sent == 0 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        notifier.close()
+        
+        self.assertEqual(len(stand_in.bodies), 1)
+        self.assertEqual(notifier.dropped, 0)
+    
+    def test_gives_up_after_max_retries(self):
+        """Test a batch is dropped once the retries are used up"""
+        stand_in = self.stand_in(statuses=[500] * 3)
+        notifier = Notifier(WebhookBackend(stand_in.url), batch_window=0, max_retries=2,
+                            retry_base=0.01).start()
+        notifier.notify(result('101'))
+        
+        deadline = time.monotonic() + 5
+        while notifier.dropped == 0 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        notifier.close()
+        
+        self.assertEqual(notifier.dropped, 1)
+        self.assertEqual(stand_in.bodies, [])
+    
+    def test_slow_endpoint_does_not_block_notify(self):
+        """Test queueing a result returns immediately while the endpoint is slow"""
+        stand_in = self.stand_in(delay=0.5)
+        notifier = Notifier(WebhookBackend(stand_in.url), batch_window=0).start()
+        
+        started = time.monotonic()
+        for course_id in range(20):
+            notifier.notify(result(str(course_id)))
+        elapsed = time.monotonic() - started
+        notifier.close()
+        
+        self.assertLess(elapsed, 0.1)
+    
+    def test_full_queue_drops_results(self):
+        """Test results beyond the pending limit are counted and dropped"""
+        notifier = Notifier(WebhookBackend("http://127.0.0.1:9/hook"), max_pending=2)
+        for course_id in ('101', '102', '103'):
+            notifier.notify(result(course_id))
+        
+        self.assertEqual(notifier.dropped, 1)
+    
+    def test_command_backend_receives_json_on_stdin(self):
+        """Test the command backend pipes each batch to the command"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'out.json')
+            script = f"import shutil, sys; shutil.copyfileobj(sys.stdin, open({path!r}, 'w'))"
+            backend = CommandBackend(f"{sys.executable} -c \"{script}\"")
+            notifier = Notifier(backend, batch_window=0).start()
+            notifier.notify(result('101'))
+            notifier.close()
+            
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(json.load(f), [result('101')])
+    
+    def test_command_backend_failure_is_retried(self):
+        """Test a non-zero exit status counts as a failed delivery"""
+        notifier = Notifier(CommandBackend(f"{sys.executable} -c \"raise SystemExit(1)\""),
+                            batch_window=0, max_retries=1, retry_base=0.01).start()
+        notifier.notify(result('101'))
+        
+        deadline = time.monotonic() + 5
+        while notifier.dropped == 0 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        notifier.close()
+        
+        self.assertEqual(notifier.dropped, 1)
+    
+    def test_empty_command_rejected(self):
+        """Test an empty command is rejected"""
+        with self.assertRaises(ValueError):
+            CommandBackend("  ")
+
+
+if __name__ == '__main__':
+    unittest.main()
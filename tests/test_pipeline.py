@@ -0,0 +1,281 @@
+"""
+Unit tests for PollingPipeline class
+"""
+
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+import threading
+from datetime import datetime, timedelta
+
+import requests
+
+# Add parent directory to path to import main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clock import SimulatedClock
+from main import CourseService, Location, failure_cause
+from metrics import Metrics
+from pipeline import PollingPipeline
+from scheduler import UniformPollScheduler
+
+
+class TestPollingPipeline(unittest.TestCase):
+    """Test cases for PollingPipeline class"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.now = datetime(2025, 3, 3, 9, 0, 0)
+        self.course_service = MagicMock()
+        self.course_service.extract_rollcall_id.side_effect = CourseService.extract_rollcall_id
+        self.course_service.fetch_rollcall_page.return_value = b'<html></html>'
+        self.course_service.perform_checkin.return_value = (True, "簽到成功！")
+        self.scheduler = MagicMock(wraps=UniformPollScheduler(0.1, 0.1))
+        self.run_history = MagicMock()
+        self.courses = [
+            {'course_id': f'course{i}', 'course_name': f'Course {i}'} for i in range(5)
+        ]
+    
+    def make_pipeline(self, **kwargs):
+        return PollingPipeline(
+            self.course_service, self.scheduler, Location('22.1', '120.3'), lambda: 'token',
+            run_history=self.run_history, describe_error=failure_cause, **kwargs
+        )
+    
+    def test_polls_flow_through_all_stages(self):
+        """Test an open rollcall is fetched, extracted, checked in and reported"""
+        def fetch(course_id):
+            if course_id == 'course1':
+                return b"<script>var rollcall_id = 'rc1';</script>"
+            return b'<html></html>'
+        self.course_service.fetch_rollcall_page.side_effect = fetch
+        pipeline = self.make_pipeline()
+        
+        pipeline.start()
+        with patch('builtins.print') as mock_print:
+            self.assertEqual(pipeline.dispatch(self.courses, self.now), 5)
+            pipeline.wait_idle()
+            pipeline.stop()
+        
+        self.course_service.perform_checkin.assert_called_once_with('token', 'rc1', pipeline.location)
+        mock_print.assert_called_once_with("Course 1 - 簽到成功！")
+        self.assertEqual(self.scheduler.record_poll.call_count, 5)
+        self.run_history.record_checkin.assert_called_once()
+        self.assertEqual(pipeline.metrics.get('polls.completed'), 5)
+        self.assertEqual(pipeline.metrics.get('checkins'), 1)
+        
+        # The checked-in course is deferred for the cooldown instead of polled again
+        self.assertEqual(pipeline.dispatch(self.courses, self.now + timedelta(seconds=5)), 4)
+        self.scheduler.defer.assert_called_once_with('course1', unittest.mock.ANY)
+    
+    def test_rejected_checkin_is_final(self):
+        """Test a failure the server reports is reported once and starts the cooldown"""
+        self.course_service.fetch_rollcall_page.return_value = b"<script>var rollcall_id = 'rc';</script>"
+        self.course_service.perform_checkin.return_value = (False, "簽到失敗：不在範圍內")
+        self.course_service.last_checkin_error = 'rejected'
+        emit = MagicMock()
+        pipeline = self.make_pipeline(emit=emit)
+        
+        pipeline.start()
+        with patch('builtins.print'):
+            pipeline.dispatch(self.courses[:1], self.now)
+            pipeline.wait_idle()
+            self.assertEqual(pipeline.dispatch(self.courses[:1], self.now + timedelta(seconds=1)), 0)
+            pipeline.stop()
+        
+        self.course_service.perform_checkin.assert_called_once()
+        self.assertEqual([call.args[0] for call in emit.call_args_list].count('checkin'), 1)
+        self.assertEqual(self.run_history.record_checkin.call_args.args[-1], 'rejected')
+    
+    def test_checkin_exception_releases_course(self):
+        """Test a check-in that raises is reported as failed and the course is polled again later"""
+        self.course_service.fetch_rollcall_page.return_value = b"<script>var rollcall_id = 'rc';</script>"
+        self.course_service.perform_checkin.side_effect = AttributeError("'list' object has no attribute 'get'")
+        emit = MagicMock()
+        pipeline = self.make_pipeline(emit=emit)
+        
+        pipeline.start()
+        with patch('builtins.print'), patch('pipeline.logger'):
+            pipeline.dispatch(self.courses[:1], self.now)
+            pipeline.wait_idle()
+            pipeline.stop()
+        
+        self.assertEqual(pipeline._in_flight, set())
+        checkin = next(call for call in emit.call_args_list if call.args[0] == 'checkin')
+        self.assertFalse(checkin.kwargs['success'])
+        # The failure was final, so the course now waits out the cooldown instead of hanging in flight
+        self.assertIn('course0', pipeline._checked)
+    
+    def test_transient_checkin_failure_is_retried_with_backoff(self):
+        """Test a check-in that timed out is retried after a backoff, up to the attempt limit"""
+        self.course_service.fetch_rollcall_page.return_value = b"<script>var rollcall_id = 'rc';</script>"
+        self.course_service.perform_checkin.return_value = (False, "簽到請求失敗：timed out")
+        self.course_service.last_checkin_error = 'timeout'
+        clock = SimulatedClock(self.now)
+        emit = MagicMock()
+        pipeline = self.make_pipeline(clock=clock, emit=emit)
+        
+        pipeline.start()
+        with patch('builtins.print'):
+            for _ in range(30):
+                pipeline.dispatch(self.courses[:1], clock.now())
+                pipeline.wait_idle()
+                clock.advance(1)
+            pipeline.stop()
+        
+        # Attempts at 0s, 5s and 15s, then the failure is final
+        self.assertEqual(self.course_service.perform_checkin.call_count, 3)
+        events = [call.args[0] for call in emit.call_args_list]
+        self.assertEqual(events.count('checkin'), 1)
+        self.assertIn('course0', pipeline._checked)
+    
+    def test_poll_finished_reports_fetch_duration(self):
+        """Test poll_finished carries the fetch time like the sequential loop"""
+        clock = SimulatedClock(self.now)
+        
+        def fetch(course_id):
+            clock.advance(0.25)
+            return b'<html></html>'
+        self.course_service.fetch_rollcall_page.side_effect = fetch
+        emit = MagicMock()
+        pipeline = self.make_pipeline(clock=clock, emit=emit)
+        
+        pipeline.start()
+        pipeline.dispatch(self.courses[:1], clock.now())
+        pipeline.wait_idle()
+        pipeline.stop()
+        
+        emit.assert_any_call('poll_finished', course_id='course0', rollcall_open=False,
+                             error=None, duration_ms=250.0)
+    
+    def test_cooldown_backoff_is_published_once(self):
+        """Test later cycles skip a checked-in course without publishing another backoff"""
+        self.course_service.fetch_rollcall_page.return_value = b"<script>var rollcall_id = 'rc';</script>"
+        emit = MagicMock()
+        pipeline = self.make_pipeline(emit=emit)
+        courses = self.courses[:1]
+        
+        pipeline.start()
+        with patch('builtins.print'):
+            pipeline.dispatch(courses, self.now)
+            pipeline.wait_idle()
+            for cycle in range(1, 10):
+                self.assertEqual(pipeline.dispatch(courses, self.now + timedelta(seconds=cycle)), 0)
+            pipeline.stop()
+        
+        backoffs = [call for call in emit.call_args_list if call.args[0] == 'backoff']
+        self.assertEqual(len(backoffs), 1)
+        self.assertEqual(backoffs[0].kwargs['reason'], 'cooldown')
+    
+    def test_full_queue_drops_and_in_flight_polls_merge(self):
+        """Test the dispatcher never queues more than the bound"""
+        pipeline = self.make_pipeline(queue_size=2)
+        
+        with patch('pipeline.logger') as mock_logger:
+            self.assertEqual(pipeline.dispatch(self.courses, self.now), 2)
+            self.assertEqual(pipeline.dispatch(self.courses, self.now), 0)
+            mock_logger.warning.assert_called_once()
+        
+        self.assertEqual(pipeline.queues['fetch'].qsize(), 2)
+        
+        # Dropped courses go first once the queue has room again
+        pipeline.queues['fetch'].get_nowait()
+        pipeline.queues['fetch'].get_nowait()
+        pipeline._in_flight.clear()
+        pipeline.dispatch(self.courses, self.now + timedelta(seconds=1))
+        queued = [pipeline.queues['fetch'].get_nowait().course['course_id'] for _ in range(2)]
+        self.assertEqual(queued, ['course2', 'course3'])
+        metrics = pipeline.metrics.snapshot()
+        self.assertEqual(metrics['polls.dropped'], 9)
+        self.assertEqual(metrics['polls.merged'], 2)
+        self.assertEqual(metrics['queue.fetch.depth'], 0)
+        self.assertEqual(metrics['queue.fetch.max_depth'], 2)
+    
+    def test_statistics_logged_while_running(self):
+        """Test queue statistics reach the log periodically, not only at stop"""
+        clock = SimulatedClock(self.now)
+        self.scheduler = UniformPollScheduler(10, 10)
+        pipeline = self.make_pipeline(clock=clock, stats_interval=60)
+        cycles = []
+        
+        def is_running():
+            cycles.append(clock.now())
+            return len(cycles) <= 30
+        
+        with patch('pipeline.logger') as mock_logger, patch('builtins.print'):
+            pipeline.run(self.courses, is_running)
+        
+        # 30 cycles of 10 seconds: every 60 seconds, plus once at stop
+        stats = [call for call in mock_logger.info.call_args_list if 'queue.fetch.max_depth' in call.args[0]]
+        self.assertEqual(len(stats), 5)
+    
+    def test_slow_checkin_applies_backpressure(self):
+        """Test a blocked stage holds back its producers instead of buffering"""
+        self.course_service.fetch_rollcall_page.return_value = b"<script>var rollcall_id = 'rc';</script>"
+        release = threading.Event()
+        self.course_service.perform_checkin.side_effect = lambda *args: (release.wait(5), "ok")
+        pipeline = self.make_pipeline(fetch_workers=2, queue_size=1)
+        
+        pipeline.start()
+        with patch('builtins.print'):
+            pipeline.dispatch(self.courses, self.now)
+            self.assertLessEqual(pipeline.queues['checkin'].qsize(), 1)
+            self.assertLessEqual(pipeline.queues['extract'].qsize(), 1)
+            release.set()
+            pipeline.stop()
+        
+        self.assertGreater(pipeline.metrics.get('polls.dropped'), 0)
+    
+    def test_fetch_failure_is_reported_with_cause(self):
+        """Test a failed fetch reaches the run history with its cause"""
+        self.course_service.fetch_rollcall_page.side_effect = requests.Timeout("slow")
+        pipeline = self.make_pipeline()
+        
+        pipeline.start()
+        with patch('pipeline.logger'):
+            pipeline.dispatch(self.courses[:1], self.now)
+            pipeline.wait_idle()
+            pipeline.stop()
+        
+        self.run_history.record_poll.assert_called_once_with('course0', self.now, None, 'timeout')
+        self.assertEqual(pipeline.metrics.get('polls.failed'), 1)
+    
+    def test_invalid_settings(self):
+        """Test empty worker pools and queues are rejected"""
+        with self.assertRaises(ValueError):
+            self.make_pipeline(queue_size=0)
+
+
+class TestMetrics(unittest.TestCase):
+    """Test cases for Metrics class"""
+    
+    def test_counters_gauges_and_samplers(self):
+        """Test every kind of value appears in a snapshot"""
+        metrics = Metrics()
+        metrics.inc('polls')
+        metrics.inc('polls', 2)
+        metrics.set_gauge('depth', 3)
+        metrics.max_gauge('peak', 5)
+        metrics.max_gauge('peak', 4)
+        metrics.register('sampled', lambda: 7)
+        
+        self.assertEqual(metrics.snapshot(), {'polls': 3, 'depth': 3, 'peak': 5, 'sampled': 7})
+        self.assertEqual(metrics.format(), 'depth=3 peak=5 polls=3 sampled=7')
+    
+    def test_timed_adds_elapsed_monotonic_seconds(self):
+        """Test timers accumulate clock time, including blocks that raise"""
+        clock = SimulatedClock(datetime(2025, 3, 3, 9, 0))
+        metrics = Metrics(clock)
+        with metrics.timed('time.network'):
+            clock.advance(0.25)
+        with self.assertRaises(RuntimeError):
+            with metrics.timed('time.network'):
+                clock.advance(0.5)
+                raise RuntimeError("boom")
+        
+        self.assertEqual(metrics.get('time.network'), 0.75)
+
+
+if __name__ == '__main__':
+    unittest.main()
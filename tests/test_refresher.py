@@ -0,0 +1,69 @@
+"""
+Unit tests for CourseRefresher class
+"""
+
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Add parent directory to path to import main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import AuthToken
+from refresher import CourseRefresher
+
+
+class TestCourseRefresher(unittest.TestCase):
+    """Test cases for CourseRefresher class"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.course_service = MagicMock()
+        self.auth_token = AuthToken(user_id='12345', access_token='abc123')
+        self.courses = [
+            {'course_id': 'course1', 'course_name': 'Course 1'},
+            {'course_id': 'course2', 'course_name': 'Course 2'}
+        ]
+        self.refresher = CourseRefresher(
+            self.course_service, lambda: self.auth_token, self.courses, interval=60
+        )
+    
+    def test_refresh_updates_list_in_place(self):
+        """Test added and dropped courses are applied to the running list"""
+        running = self.courses
+        self.course_service.get_courses.return_value = [
+            {'course_id': 'course2', 'course_name': 'Course 2'},
+            {'course_id': 'course3', 'course_name': 'Course 3'}
+        ]
+        
+        added, removed = self.refresher.refresh_once()
+        
+        self.assertIs(self.refresher.courses, running)
+        self.assertEqual([c['course_id'] for c in running], ['course2', 'course3'])
+        self.assertEqual([c['course_id'] for c in added], ['course3'])
+        self.assertEqual([c['course_id'] for c in removed], ['course1'])
+        self.course_service.get_courses.assert_called_once_with(self.auth_token)
+    
+    def test_refresh_unchanged_list_is_noop(self):
+        """Test an unchanged list leaves the running set untouched"""
+        self.course_service.get_courses.return_value = list(self.courses)
+        
+        self.assertEqual(self.refresher.refresh_once(), ([], []))
+        self.assertEqual(len(self.courses), 2)
+    
+    def test_refresh_failure_keeps_current_set(self):
+        """Test a failed fetch keeps polling the current courses"""
+        self.course_service.get_courses.return_value = None
+        
+        self.assertEqual(self.refresher.refresh_once(), ([], []))
+        self.assertEqual(len(self.courses), 2)
+    
+    def test_invalid_interval(self):
+        """Test non-positive intervals are rejected"""
+        with self.assertRaises(ValueError):
+            CourseRefresher(self.course_service, lambda: self.auth_token, [], interval=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
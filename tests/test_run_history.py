@@ -0,0 +1,119 @@
+"""
+Unit tests for the run history store and latency report
+"""
+
+import unittest
+import csv
+import io
+import os
+import stat
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+# Add parent directory to path to import main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from run_history import RunHistory, build_report, format_csv, format_text, load_records, percentile
+
+
+class TestRunHistory(unittest.TestCase):
+    """Test cases for RunHistory and the report built from it"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'run_history.jsonl')
+        self.history = RunHistory(self.path, flush_interval=60)
+        self.start = datetime(2025, 3, 3, 9, 0, 0)
+        self.course = {'course_id': '1', 'course_name': '計算機概論'}
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def _run_rollcall(self, start, closed_polls=3, poll_every=10, checkin_delay=1):
+        now = start
+        for _ in range(closed_polls):
+            self.history.record_poll('1', now, None)
+            now += timedelta(seconds=poll_every)
+        self.history.record_poll('1', now, 'rc')
+        self.history.record_checkin(self.course, 'rc', now + timedelta(seconds=checkin_delay), True, '簽到成功')
+        return now
+    
+    def test_percentile(self):
+        """Test linear interpolation between ranks"""
+        self.assertIsNone(percentile([], 50))
+        self.assertEqual(percentile([4.0], 90), 4.0)
+        self.assertEqual(percentile([1.0, 2.0, 3.0, 4.0], 50), 2.5)
+        self.assertEqual(percentile([3.0, 1.0, 2.0], 100), 3.0)
+    
+    def test_checkin_latency_uses_midpoint_of_last_closed_poll(self):
+        """Test latency is measured from the estimated open time to the check-in"""
+        self._run_rollcall(self.start, poll_every=10, checkin_delay=1)
+        report = build_report(load_records(self.path))
+        
+        stats = report.courses['1']
+        self.assertEqual(stats.course_name, '計算機概論')
+        self.assertEqual(stats.successes, 1)
+        self.assertEqual(stats.latencies, [6.0])
+    
+    def test_polls_are_buffered_until_flush(self):
+        """Test poll counts are written in batches, not per poll"""
+        self.history.record_poll('1', self.start, None)
+        self.history.record_poll('1', self.start + timedelta(seconds=5), None)
+        self.assertEqual(load_records(self.path), [])
+        
+        self.history.record_poll('1', self.start + timedelta(seconds=61), None)
+        records = load_records(self.path)
+        self.assertEqual(records, [{'type': 'polls', 'course_id': '1',
+                                    'at': (self.start + timedelta(seconds=61)).isoformat(), 'count': 3}])
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+    
+    def test_report_counts_requests_and_failures(self):
+        """Test request efficiency and failure causes"""
+        self._run_rollcall(self.start)
+        later = self.start + timedelta(hours=1)
+        self.history.record_poll('1', later, None, error='timeout')
+        self.history.record_poll('1', later, 'rc2')
+        self.history.record_checkin(self.course, 'rc2', later, False, '簽到失敗：已超過簽到時間', 'rejected')
+        self.history.record_checkin(self.course, 'rc3', later, False, '簽到失敗：距離過遠', 'rejected')
+        self.history.flush(later)
+        
+        report = build_report(load_records(self.path))
+        stats = report.courses['1']
+        self.assertEqual(stats.requests, 9)
+        self.assertEqual(stats.requests_per_success, 9.0)
+        self.assertEqual(report.failures['poll:timeout'], 1)
+        self.assertEqual(report.failures['checkin:rejected'], 2)
+    
+    def test_load_records_skips_damaged_lines(self):
+        """Test a truncated line does not hide the rest of the history"""
+        self._run_rollcall(self.start)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('{"type": "che\n')
+        
+        self.assertEqual([record["type"] for record in load_records(self.path)], ["checkin", "polls"])
+        self.assertEqual(load_records(os.path.join(self.temp_dir.name, 'missing.jsonl')), [])
+    
+    def test_format_text_and_csv(self):
+        """Test both output formats include the per-course and overall rows"""
+        self._run_rollcall(self.start)
+        self.history.record_poll('2', self.start, None, error='http_500')
+        self.history.flush(self.start)
+        report = build_report(load_records(self.path))
+        
+        text = format_text(report)
+        self.assertIn('計算機概論', text)
+        self.assertIn('全部課程', text)
+        self.assertIn('poll:http_500: 1', text)
+        
+        rows = list(csv.reader(io.StringIO(format_csv(report))))
+        self.assertEqual(rows[0][:3], ['course_id', 'course_name', 'requests'])
+        self.assertEqual([row[0] for row in rows[1:]], ['1', '2', 'ALL'])
+        self.assertEqual(rows[2][5], '')
+        
+        failures = list(csv.reader(io.StringIO(format_csv(report, 'failures'))))
+        self.assertEqual(failures, [['cause', 'count'], ['poll:http_500', '1']])
+
+
+if __name__ == '__main__':
+    unittest.main()
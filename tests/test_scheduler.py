@@ -0,0 +1,224 @@
+"""
+Unit tests for polling scheduler classes
+"""
+
+import unittest
+from unittest.mock import patch
+import random
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add parent directory to path to import main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clock import SimulatedClock
+from history import RollcallHistory
+from resource_budget import ResourceBudget
+from scheduler import DemotingScheduler, PredictiveScheduler, ThrottlingScheduler, UniformPollScheduler
+
+
+class TestUniformPollScheduler(unittest.TestCase):
+    """Test cases for UniformPollScheduler class"""
+    
+    def test_next_delay_within_range(self):
+        """Test delays stay within the configured range"""
+        scheduler = UniformPollScheduler(1, 5, rng=random.Random(0))
+        now = datetime(2024, 9, 2)
+        
+        for _ in range(100):
+            delay = scheduler.next_delay(now)
+            self.assertGreaterEqual(delay, 1)
+            self.assertLessEqual(delay, 5)
+    
+    def test_all_courses_due(self):
+        """Test every course is polled each cycle"""
+        courses = [{'course_id': 'a'}, {'course_id': 'b'}]
+        
+        self.assertEqual(UniformPollScheduler().due_courses(courses, datetime(2024, 9, 2)), courses)
+    
+    def test_invalid_range(self):
+        """Test invalid interval range is rejected"""
+        with self.assertRaises(ValueError):
+            UniformPollScheduler(5, 1)
+
+
+class TestPredictiveScheduler(unittest.TestCase):
+    """Test cases for PredictiveScheduler class"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.history = RollcallHistory()
+        # Rollcall usually opens Monday 09:15
+        self.history.record_open('course1', datetime(2024, 9, 2, 9, 15))
+        self.scheduler = PredictiveScheduler(self.history, 1, 5, 60, rng=random.Random(0))
+    
+    def test_hot_interval_near_predicted_open(self):
+        """Test polling is frequent around the predicted open time"""
+        interval = self.scheduler.interval_for('course1', datetime(2024, 9, 9, 9, 12))
+        
+        self.assertLessEqual(interval, 5)
+    
+    def test_cold_interval_far_from_predicted_open(self):
+        """Test polling is sparse away from predicted open times"""
+        interval = self.scheduler.interval_for('course1', datetime(2024, 9, 10, 14, 0))
+        
+        self.assertEqual(interval, 60)
+    
+    def test_cold_interval_stops_at_next_window(self):
+        """Test a cold poll never skips past the next predicted window"""
+        now = datetime(2024, 9, 9, 9, 4)
+        interval = self.scheduler.interval_for('course1', now)
+        
+        self.assertLessEqual(now + timedelta(seconds=interval), datetime(2024, 9, 9, 9, 5, 1))
+    
+    def test_single_outlier_does_not_create_hot_window(self):
+        """Test one stray open time among many regular ones stays cold"""
+        for week in range(1, 10):
+            self.history.record_open('course1', datetime(2024, 9, 2, 9, 15) + timedelta(weeks=week))
+        self.history.record_open('course1', datetime(2024, 9, 4, 14, 0))
+        
+        self.assertEqual(self.scheduler.interval_for('course1', datetime(2024, 11, 13, 14, 0)), 60)
+        self.assertLessEqual(self.scheduler.interval_for('course1', datetime(2024, 11, 11, 9, 12)), 5)
+    
+    def test_unknown_course_polled_uniformly(self):
+        """Test courses without history use the hot interval"""
+        self.assertLessEqual(self.scheduler.interval_for('other', datetime(2024, 9, 10, 14, 0)), 5)
+    
+    def test_record_poll_learns_open_time(self):
+        """Test a newly open rollcall is recorded at the midpoint since the last closed poll"""
+        self.scheduler.record_poll('other', datetime(2024, 9, 3, 10, 0, 0), False)
+        self.scheduler.record_poll('other', datetime(2024, 9, 3, 10, 0, 4), True)
+        
+        self.assertEqual(self.history.opens['other'], [datetime(2024, 9, 3, 10, 0, 2)])
+    
+    def test_due_courses_respects_next_poll(self):
+        """Test a recently polled cold course is not due"""
+        now = datetime(2024, 9, 10, 14, 0)
+        courses = [{'course_id': 'course1'}, {'course_id': 'other'}]
+        self.scheduler.record_poll('course1', now, False)
+        
+        due = self.scheduler.due_courses(courses, now + timedelta(seconds=10))
+        
+        self.assertEqual(due, [{'course_id': 'other'}])
+
+
+
+class TestDemotingScheduler(unittest.TestCase):
+    """Test cases for DemotingScheduler class"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.history = RollcallHistory()
+        self.start = datetime(2024, 9, 2, 9, 0)
+        self.scheduler = DemotingScheduler(
+            UniformPollScheduler(rng=random.Random(0)), self.history,
+            stale_after=timedelta(weeks=2), stale_interval=120
+        )
+        self.courses = [{'course_id': 'course1'}]
+    
+    def test_new_course_not_demoted(self):
+        """Test a recently seen course keeps the normal rate"""
+        self.scheduler.record_poll('course1', self.start, False)
+        
+        self.assertEqual(self.scheduler.due_courses(self.courses, self.start + timedelta(seconds=3)), self.courses)
+    
+    def test_stale_course_demoted(self):
+        """Test a course without a rollcall for the stale period is polled slowly"""
+        self.scheduler.record_poll('course1', self.start, False)
+        later = self.start + timedelta(weeks=3)
+        self.scheduler.record_poll('course1', later, False)
+        
+        self.assertEqual(self.scheduler.due_courses(self.courses, later + timedelta(seconds=60)), [])
+        self.assertEqual(self.scheduler.due_courses(self.courses, later + timedelta(seconds=120)), self.courses)
+    
+    def test_rollcall_promotes_course(self):
+        """Test seeing a rollcall brings a demoted course back to the normal rate"""
+        self.scheduler.record_poll('course1', self.start, False)
+        later = self.start + timedelta(weeks=3)
+        self.scheduler.record_poll('course1', later, True)
+        
+        self.assertFalse(self.scheduler.is_stale('course1', later))
+        self.assertEqual(self.scheduler.due_courses(self.courses, later + timedelta(seconds=1)), self.courses)
+
+
+
+class TestThrottlingScheduler(unittest.TestCase):
+    """Test cases for ThrottlingScheduler class"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.start = datetime(2024, 9, 2, 9, 0)
+        self.clock = SimulatedClock(self.start)
+        self.history = RollcallHistory()
+        self.history.record_open('hot', self.start - timedelta(weeks=1))
+        self.rss_kb = 50 * 1024
+        self.budget = ResourceBudget(
+            max_rss_mb=100, sample_interval=1, clock=self.clock,
+            cpu_time=lambda: 0.0, rss_kb=lambda: self.rss_kb
+        )
+        self.scheduler = ThrottlingScheduler(
+            UniformPollScheduler(rng=random.Random(0)), self.history, self.budget, throttle_interval=60
+        )
+        self.courses = [{'course_id': 'hot'}, {'course_id': 'cold'}]
+    
+    def poll_all(self, seconds):
+        self.clock.advance(seconds)
+        now = self.clock.now()
+        due = self.scheduler.due_courses(self.courses, now)
+        for course in due:
+            self.scheduler.record_poll(course['course_id'], now, False)
+        return [course['course_id'] for course in due]
+    
+    def test_under_budget_polls_everything(self):
+        """Test nothing is throttled while within budget"""
+        self.assertEqual(self.poll_all(2), ['hot', 'cold'])
+        self.assertEqual(self.poll_all(2), ['hot', 'cold'])
+        self.assertFalse(self.scheduler.throttling)
+    
+    def test_over_budget_slows_only_out_of_window_courses(self):
+        """Test out-of-window courses rest in proportion to the overage while in-window ones keep polling"""
+        self.rss_kb = 200 * 1024
+        with patch('scheduler.logger') as mock_logger:
+            self.assertEqual(self.poll_all(2), ['hot', 'cold'])
+            self.assertEqual(self.poll_all(60), ['hot'])
+            self.assertEqual(self.poll_all(59), ['hot'])
+            self.assertEqual(self.poll_all(1), ['hot', 'cold'])
+            mock_logger.warning.assert_called_once()
+            
+            self.rss_kb = 50 * 1024
+            self.poll_all(2)
+            mock_logger.info.assert_called_once()
+        self.assertFalse(self.scheduler.throttling)
+        self.assertEqual(self.poll_all(2), ['hot', 'cold'])
+    
+    def test_budget_pressure(self):
+        """Test CPU percentage is averaged over the sample interval"""
+        cpu = [0.0]
+        budget = ResourceBudget(max_cpu_percent=20, sample_interval=5, clock=self.clock,
+                                cpu_time=lambda: cpu[0], rss_kb=lambda: 0)
+        cpu[0] = 2.0
+        self.clock.advance(4)
+        budget.sample()
+        self.assertEqual(budget.pressure(), 0.0)
+        
+        self.clock.advance(1)
+        budget.sample()
+        self.assertAlmostEqual(budget.cpu_percent, 40.0)
+        self.assertAlmostEqual(budget.pressure(), 2.0)
+        self.assertFalse(ResourceBudget(clock=self.clock).enabled)
+    
+    def test_unknown_rss_skips_memory_ceiling(self):
+        """Test the memory ceiling is skipped where the current RSS cannot be read"""
+        budget = ResourceBudget(max_rss_mb=100, sample_interval=1, clock=self.clock,
+                                cpu_time=lambda: 0.0, rss_kb=lambda: None)
+        self.clock.advance(1)
+        with self.assertLogs('resource_budget', 'WARNING'):
+            budget.sample()
+        
+        self.assertIsNone(budget.rss_mb)
+        self.assertEqual(budget.pressure(), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
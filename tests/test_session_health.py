@@ -0,0 +1,95 @@
+"""
+Unit tests for SessionMonitor class
+"""
+
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add parent directory to path to import main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clock import SimulatedClock
+from session_health import SessionMonitor
+
+
+class TestSessionMonitor(unittest.TestCase):
+    """Test cases for SessionMonitor class"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.clock = SimulatedClock(datetime(2025, 3, 3, 8, 0, 0))
+        self.probe = MagicMock(return_value=True)
+        self.relogin = MagicMock(return_value=True)
+        self.window = None
+        self.monitor = SessionMonitor(
+            self.probe, self.relogin, interval=600, next_window=lambda now: self.window,
+            lead_time=300, clock=self.clock
+        )
+    
+    def test_valid_session_is_left_alone(self):
+        """Test a valid session does not trigger a login"""
+        self.assertEqual(self.monitor.check_once(), 'valid')
+        self.relogin.assert_not_called()
+    
+    def test_expired_session_logs_in_again(self):
+        """Test an expired session is refreshed by the probe"""
+        self.probe.return_value = False
+        self.clock.advance(60)
+        
+        self.assertEqual(self.monitor.check_once(), 'relogin')
+        self.assertEqual(self.monitor.last_login, self.clock.now())
+    
+    def test_unknown_probe_result_does_not_log_in(self):
+        """Test a network failure is not mistaken for an expired session"""
+        self.probe.return_value = None
+        
+        self.assertEqual(self.monitor.check_once(), 'unknown')
+        self.relogin.assert_not_called()
+    
+    def test_failed_login_is_retried_next_time(self):
+        """Test a failed login keeps the old login time"""
+        self.probe.return_value = False
+        self.relogin.return_value = False
+        started = self.monitor.last_login
+        self.clock.advance(60)
+        
+        self.assertEqual(self.monitor.check_once(), 'failed')
+        self.assertEqual(self.monitor.last_login, started)
+    
+    def test_refreshes_once_before_predicted_window(self):
+        """Test the session is refreshed within the lead time of a window, but only once"""
+        self.window = self.clock.now() + timedelta(minutes=20)
+        self.assertEqual(self.monitor.check_once(), 'valid')
+        
+        self.clock.advance(timedelta(minutes=16).total_seconds())
+        self.assertEqual(self.monitor.check_once(), 'refreshed')
+        self.probe.assert_called_once()
+        
+        self.clock.advance(60)
+        self.assertEqual(self.monitor.check_once(), 'valid')
+        self.relogin.assert_called_once()
+    
+    def test_wakes_for_window_inside_probe_interval(self):
+        """Test a window starting between lead time and interval after a check is refreshed in time"""
+        self.window = self.clock.now() + timedelta(seconds=500)
+        refreshed_at = None
+        while self.clock.now() < self.window:
+            self.clock.advance(self.monitor.next_wait(self.clock.now()))
+            if self.monitor.check_once() == 'refreshed':
+                refreshed_at = self.clock.now()
+        
+        self.assertIsNotNone(refreshed_at)
+        self.assertLess(refreshed_at, self.window)
+        self.assertEqual(self.monitor.next_wait(self.clock.now()), 600)
+    
+    def test_invalid_interval(self):
+        """Test a non-positive interval is rejected"""
+        with self.assertRaises(ValueError):
+            SessionMonitor(self.probe, self.relogin, interval=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Unit tests for the scheduling simulation
+"""
+
+import unittest
+import random
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add parent directory to path to import main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler import UniformPollScheduler
+from simulation import RollcallWindow, generate_week, run_simulation
+
+
+class TestSimulation(unittest.TestCase):
+    """Test cases for simulation helpers"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.start = datetime(2024, 9, 2)
+        self.courses = [{'course_id': 'course1', 'course_name': 'Course 1'}]
+    
+    def test_run_simulation_detects_window(self):
+        """Test a rollcall window is detected with bounded latency"""
+        opens_at = self.start + timedelta(minutes=30)
+        windows = [RollcallWindow('course1', 'r1', opens_at, opens_at + timedelta(minutes=5))]
+        
+        result = run_simulation(
+            'uniform', UniformPollScheduler(rng=random.Random(1)), self.courses,
+            windows, self.start, self.start + timedelta(hours=1)
+        )
+        
+        self.assertEqual(result.detected, 1)
+        self.assertEqual(result.missed, 0)
+        self.assertLessEqual(result.max_latency, 5)
+        self.assertGreater(result.requests, 0)
+    
+    def test_run_simulation_is_deterministic(self):
+        """Test identical seeds give identical results"""
+        windows = generate_week(['course1'], self.start, seed=3)
+        end = self.start + timedelta(days=2)
+        
+        first = run_simulation('a', UniformPollScheduler(rng=random.Random(7)), self.courses, windows, self.start, end)
+        second = run_simulation('b', UniformPollScheduler(rng=random.Random(7)), self.courses, windows, self.start, end)
+        
+        self.assertEqual(first.requests, second.requests)
+        self.assertEqual(first.latencies, second.latencies)
+    
+    def test_generate_week_one_window_per_course_per_week(self):
+        """Test generated schedule has a weekly rollcall per course"""
+        windows = generate_week(['a', 'b'], self.start, weeks=2, seed=0)
+        
+        self.assertEqual(len(windows), 4)
+        for window in windows:
+            self.assertLess(window.opens_at, window.closes_at)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+"""
+Unit tests for warm-restart state snapshots
+"""
+
+import unittest
+from unittest.mock import patch, MagicMock
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+# Add parent directory to path to import main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course_rules import CourseFilter
+from courses import Course
+from history import RollcallHistory
+from main import AuthToken, CourseService, Location, ZuvioAutoChecker
+from scheduler import DemotingScheduler, PredictiveScheduler
+from snapshot import SnapshotError, StateSnapshot, decode_snapshot, encode_snapshot
+
+IDENTITY = {'user_id': '12345', 'base_url': 'https://irs.zuvio.com.tw'}
+
+
+class TestSnapshotFormat(unittest.TestCase):
+    """Test cases for the on-disk snapshot format"""
+    
+    def test_round_trip(self):
+        """Test an envelope survives encoding"""
+        envelope = {'saved_at': '2025-03-03T09:00:00', 'identity': IDENTITY, 'state': {'checked_in': {'101': 'x'}}}
+        
+        self.assertEqual(decode_snapshot(encode_snapshot(envelope)), envelope)
+    
+    def test_rejects_damaged_files(self):
+        """Test truncation, corruption and foreign or future formats are detected"""
+        data = encode_snapshot({'saved_at': '2025-03-03T09:00:00', 'state': {}})
+        corrupted = data[:-1] + bytes([data[-1] ^ 0xFF])
+        other_version = data[:4] + bytes([99]) + data[5:]
+        
+        for damaged in (data[:5], corrupted, other_version, b'PK\x03\x04' + data[4:]):
+            with self.assertRaises(SnapshotError):
+                decode_snapshot(damaged)
+
+
+class TestStateSnapshot(unittest.TestCase):
+    """Test cases for StateSnapshot"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.path = os.path.join(self.temp_dir.name, 'runtime_state.snap')
+        self.now = datetime(2025, 3, 3, 9, 0)
+    
+    def test_save_and_load(self):
+        """Test a saved state loads back with restricted permissions"""
+        snapshot = StateSnapshot(self.path, IDENTITY)
+        self.assertTrue(snapshot.save({'checked_in': {'101': '2025-03-03T08:00:00'}}, self.now))
+        
+        state = StateSnapshot(self.path, IDENTITY).load(self.now + timedelta(minutes=5))
+        
+        self.assertEqual(state, {'checked_in': {'101': '2025-03-03T08:00:00'}})
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+    
+    def test_load_validity_checks(self):
+        """Test snapshots for another account, stale or from the future are ignored"""
+        StateSnapshot(self.path, IDENTITY).save({}, self.now)
+        
+        self.assertIsNone(StateSnapshot(self.path, dict(IDENTITY, user_id='other')).load(self.now))
+        self.assertIsNone(StateSnapshot(self.path, IDENTITY).load(self.now + timedelta(days=2)))
+        self.assertIsNone(StateSnapshot(self.path, IDENTITY).load(self.now - timedelta(minutes=1)))
+        self.assertIsNone(StateSnapshot(os.path.join(self.temp_dir.name, 'missing'), IDENTITY).load(self.now))
+    
+    def test_corrupt_file_is_ignored(self):
+        """Test a damaged snapshot is logged and skipped"""
+        with open(self.path, 'wb') as f:
+            f.write(b'garbage')
+        
+        with self.assertLogs('snapshot', 'WARNING'):
+            self.assertIsNone(StateSnapshot(self.path, IDENTITY).load(self.now))
+    
+    def test_save_if_due(self):
+        """Test periodic saves wait for the interval"""
+        snapshot = StateSnapshot(self.path, IDENTITY, save_interval=300)
+        collect = MagicMock(return_value={})
+        
+        self.assertFalse(snapshot.save_if_due(collect, self.now))
+        self.assertFalse(snapshot.save_if_due(collect, self.now + timedelta(seconds=299)))
+        self.assertTrue(snapshot.save_if_due(collect, self.now + timedelta(seconds=300)))
+        collect.assert_called_once()
+
+
+class TestComponentState(unittest.TestCase):
+    """Test cases for the state each component contributes"""
+    
+    def test_scheduler_timing_round_trip(self):
+        """Test per-course next polls and rests are restored into a fresh scheduler"""
+        def make_scheduler():
+            history = RollcallHistory()
+            history.record_open('course1', datetime(2024, 9, 2, 9, 15))
+            return DemotingScheduler(PredictiveScheduler(history, rng=random.Random(0)), history,
+                                     stale_after=timedelta(weeks=2))
+        now = datetime(2024, 9, 9, 12, 0)
+        courses = [{'course_id': 'course1'}, {'course_id': 'course2'}]
+        scheduler = make_scheduler()
+        scheduler.record_poll('course1', now, False)
+        
+        restored = make_scheduler()
+        restored.restore_state(scheduler.snapshot_state())
+        
+        self.assertEqual(restored.due_courses(courses, now + timedelta(seconds=10)),
+                         scheduler.due_courses(courses, now + timedelta(seconds=10)))
+        self.assertEqual(restored.due_courses(courses, now + timedelta(seconds=10)), [{'course_id': 'course2'}])
+    
+    def test_course_cache_requires_same_rules(self):
+        """Test the conditional-fetch cache is only restored under the same course rules"""
+        service = CourseService(MagicMock())
+        service._cached_courses = [Course('101', '體育', '王老師')]
+        service._courses_etag = '"v1"'
+        state = service.snapshot_state()
+        
+        same = CourseService(MagicMock())
+        same.restore_state(state)
+        changed = CourseService(MagicMock(), CourseFilter.from_text(include='id:102'))
+        changed.restore_state(state)
+        
+        self.assertEqual(same._cached_courses, [Course('101')])
+        self.assertEqual(same._courses_etag, '"v1"')
+        self.assertIsNone(changed._cached_courses)
+
+
+class TestWarmRestart(unittest.TestCase):
+    """Test cases for ZuvioAutoChecker snapshots"""
+    
+    def make_checker(self):
+        with patch('main.ConfigManager'), patch('main.AuthService'):
+            checker = ZuvioAutoChecker()
+        checker.course_service = MagicMock()
+        checker.course_service.snapshot_state.return_value = {}
+        checker.course_service.last_error = None
+        return checker
+    
+    def test_checkin_cooldown_survives_restart(self):
+        """Test a course checked in before the restart is not polled again after it"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'runtime_state.snap')
+            before = self.make_checker()
+            before.checked_in['course1'] = before.clock.now()
+            StateSnapshot(path, IDENTITY).save(before.snapshot_state(), before.clock.now())
+            
+            after = self.make_checker()
+            after.snapshot = StateSnapshot(path, IDENTITY)
+            self.assertTrue(after.restore_snapshot())
+        
+        def stop_loop(seconds):
+            after.running = False
+        
+        with patch.object(after.clock, 'sleep', side_effect=stop_loop), patch('builtins.print'):
+            after.run_checkin_loop(AuthToken('12345', 'abc123'), [{'course_name': 'Test Course', 'course_id': 'course1'}],
+                                   Location('22.1', '120.3'))
+        
+        after.course_service.check_rollcall_availability.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Unit tests for the console status line
+"""
+
+import unittest
+from unittest.mock import patch
+import os
+import sys
+from datetime import datetime
+
+# Add parent directory to path to import main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clock import SimulatedClock
+from metrics import Metrics
+from status_line import StatusLine
+
+
+class TestStatusLine(unittest.TestCase):
+    """Test cases for StatusLine class"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.clock = SimulatedClock(datetime(2025, 3, 3, 9, 0, 0))
+        self.metrics = Metrics(self.clock)
+        self.status = StatusLine(self.metrics, self.clock)
+    
+    def run_cycle(self, network, parse, sleep, polls):
+        """Simulate one loop cycle: timed polls followed by a sleep"""
+        self.status.start_cycle()
+        for course_name, seconds in polls:
+            self.metrics.inc('http.requests')
+            with self.metrics.timed('time.network'):
+                self.clock.advance(network)
+            with self.metrics.timed('time.parse'):
+                self.clock.advance(parse)
+            self.status.course_polled(course_name, seconds)
+        self.status.record_sleep(sleep)
+        self.clock.sleep(sleep)
+    
+    def test_cycle_breakdown(self):
+        """Test the last cycle is split into network, parse and sleep time"""
+        self.run_cycle(0.2, 0.05, 2.0, [('計算機概論', 0.25), ('體育', 0.4)])
+        self.status.start_cycle()
+        
+        cycle = self.status.last_cycle
+        self.assertAlmostEqual(cycle.duration, 2.5)
+        self.assertAlmostEqual(cycle.network, 0.4)
+        self.assertAlmostEqual(cycle.parse, 0.1)
+        self.assertEqual(cycle.sleep, 2.0)
+        self.assertEqual((cycle.slowest_course, cycle.slowest_seconds), ('體育', 0.4))
+    
+    def test_render(self):
+        """Test the line shows the breakdown, slowest course, cache hit rate and request rate"""
+        self.metrics.inc('courses.cache_hits', 3)
+        self.metrics.inc('courses.cache_misses', 1)
+        for _ in range(3):
+            self.run_cycle(0.5, 0.0, 9.5, [('體育', 0.5), ('計算機概論', 0.5)])
+        self.status.start_cycle()
+        
+        line = self.status.render(self.clock.now())
+        
+        self.assertEqual(
+            line,
+            "09:00:31 尚未有課程開放簽到 | 上輪 10.50s（網路 1.00s 解析 0.00s 休眠 9.50s） | "
+            "最慢 體育 0.50s | 快取命中 75% | 11 次請求/分"
+        )
+    
+    def test_render_pipeline_queue(self):
+        """Test the fetch queue depth, high-water mark and drops are shown when the pipeline is used"""
+        self.metrics.register('queue.fetch.depth', lambda: 3)
+        self.metrics.max_gauge('queue.fetch.max_depth', 16)
+        self.metrics.inc('polls.dropped', 7)
+        self.status.start_cycle()
+        
+        self.assertEqual(self.status.render(self.clock.now()), "09:00:00 尚未有課程開放簽到 | 佇列 3（最高 16） 略過 7")
+    
+    def test_render_before_first_cycle(self):
+        """Test only the timestamp is shown until a cycle has completed"""
+        self.status.start_cycle()
+        
+        self.assertEqual(self.status.render(self.clock.now()), "09:00:00 尚未有課程開放簽到")
+    
+    def test_request_rate_window(self):
+        """Test requests per minute only covers roughly the last minute"""
+        for _ in range(10):
+            self.run_cycle(0.0, 0.0, 10.0, [('體育', 0.1)] * 6)
+        self.run_cycle(0.0, 0.0, 10.0, [])
+        self.run_cycle(0.0, 0.0, 10.0, [])
+        self.status.start_cycle()
+        
+        self.assertAlmostEqual(self.status.requests_per_minute(), 6 * 4 * 60 / 60)
+    
+    def test_draw_at_most_once_per_second(self):
+        """Test redraws are throttled and shorter lines erase longer ones"""
+        self.run_cycle(0.0, 0.0, 1.0, [('計算機概論', 0.1)])
+        self.status.start_cycle()
+        with patch('builtins.print') as mock_print:
+            self.assertTrue(self.status.draw(self.clock.now()))
+            self.clock.advance(0.5)
+            self.assertFalse(self.status.draw(self.clock.now()))
+            self.clock.advance(0.5)
+            self.status.last_cycle = None
+            self.assertTrue(self.status.draw(self.clock.now()))
+        
+        first, second = (call.args[0] for call in mock_print.call_args_list)
+        self.assertEqual(len(second), len(first))
+        self.assertEqual(mock_print.call_args.kwargs, {'end': '\r'})
+
+
+if __name__ == '__main__':
+    unittest.main()
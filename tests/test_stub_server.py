@@ -0,0 +1,111 @@
+"""
+Unit tests for the local stub server and its fault profiles
+"""
+
+import unittest
+import sys
+import os
+
+import requests
+
+# Add parent directory to path to import main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import AuthService, CourseService, UserCredentials, Location
+from stub_server import FaultProfile, StubZuvioServer, make_courses
+
+
+class TestStubZuvioServer(unittest.TestCase):
+    """Test cases for StubZuvioServer class"""
+    
+    def start_stub(self, profile=None):
+        stub = StubZuvioServer(make_courses(2), profile, seed=0).start()
+        self.addCleanup(stub.stop)
+        return stub
+    
+    def login(self, stub):
+        auth_service = AuthService(stub.base_url, timeout=2)
+        auth_token = auth_service.login(UserCredentials("test@example.com", "password123"))
+        course_service = CourseService(auth_service.session, base_url=stub.base_url, timeout=0.5)
+        return auth_token, course_service
+    
+    def test_full_checkin_flow(self):
+        """Test login, course list, rollcall detection and check-in against the stub"""
+        stub = self.start_stub()
+        rollcall = stub.schedule_rollcall('100000', opens_in=0, duration=60)
+        auth_token, course_service = self.login(stub)
+        
+        courses = course_service.get_courses(auth_token)
+        rollcall_id = course_service.check_rollcall_availability('100000')
+        success, _ = course_service.perform_checkin(auth_token, rollcall_id, Location('22.1', '120.3'))
+        
+        self.assertEqual(len(courses), 2)
+        self.assertEqual(rollcall_id, rollcall.rollcall_id)
+        self.assertTrue(success)
+        self.assertIsNotNone(rollcall.checked_in_at)
+        self.assertEqual(stub.stats.requests, {'login': 1, 'courses': 1, 'rollcall': 1, 'checkin': 1})
+    
+    def test_closed_rollcall(self):
+        """Test no rollcall is reported before it opens"""
+        stub = self.start_stub()
+        stub.schedule_rollcall('100000', opens_in=60, duration=60)
+        _, course_service = self.login(stub)
+        
+        self.assertIsNone(course_service.check_rollcall_availability('100000'))
+    
+    def test_error_burst(self):
+        """Test a 5xx burst fails consecutive requests"""
+        stub = self.start_stub(FaultProfile("burst", error_burst_rate=1.0, error_burst_length=3))
+        auth_token, course_service = self.login(stub)
+        
+        self.assertIsNone(course_service.get_courses(auth_token))
+        self.assertEqual(stub.stats.faults['5xx'], 1)
+    
+    def test_truncated_body_raises_request_exception(self):
+        """Test a truncated body surfaces as a requests exception"""
+        stub = self.start_stub(FaultProfile("truncated", truncate_rate=1.0))
+        session = requests.Session()
+        
+        with self.assertRaises(requests.RequestException):
+            session.get(f"{stub.base_url}/student5/irs/rollcall/100000", timeout=2)
+    
+    def test_stalled_connection_times_out(self):
+        """Test a stalled connection is cut off by the client timeout"""
+        stub = self.start_stub(FaultProfile("stalls", stall_rate=1.0, stall_seconds=5))
+        _, course_service = self.login(stub)
+        
+        self.assertIsNone(course_service.check_rollcall_availability('100000'))
+        self.assertEqual(stub.stats.faults['stall'], 1)
+    
+    def test_login_redirect_hides_rollcall(self):
+        """Test a mid-session login redirect returns the login page"""
+        stub = self.start_stub(FaultProfile("expiry", login_redirect_rate=1.0))
+        stub.schedule_rollcall('100000', opens_in=0, duration=60)
+        _, course_service = self.login(stub)
+        
+        self.assertIsNone(course_service.check_rollcall_availability('100000'))
+        self.assertEqual(stub.stats.faults['login-redirect'], 1)
+    
+    def test_session_probe(self):
+        """Test the HEAD session probe sees an expired session and a fresh login"""
+        stub = self.start_stub()
+        auth_service = AuthService(stub.base_url, timeout=2)
+        credentials = UserCredentials("test@example.com", "password123")
+        auth_service.login(credentials)
+        url = f"{stub.base_url}/student5/irs/rollcall/100000"
+        
+        self.assertTrue(auth_service.check_session(url))
+        stub.expire_session()
+        self.assertFalse(auth_service.check_session(url))
+        auth_service.login(credentials)
+        self.assertTrue(auth_service.check_session(url))
+    
+    def test_page_padding(self):
+        """Test large-page profiles inflate the rollcall page"""
+        stub = self.start_stub(FaultProfile("huge", page_padding=100000))
+        
+        self.assertGreater(len(stub.rollcall_page(None)), 100000)
+
+
+if __name__ == '__main__':
+    unittest.main()
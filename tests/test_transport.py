@@ -0,0 +1,151 @@
+"""
+Unit tests for the pluggable HTTP transports
+"""
+
+import unittest
+from unittest.mock import patch
+import importlib.util
+import os
+import sys
+
+import requests
+
+# Add parent directory to path to import main module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import AuthService, CourseService, Location, UserCredentials, failure_cause
+from stub_server import FaultProfile, StubZuvioServer, make_courses
+from transport import Transport, TransportResponse, create_transport
+
+HAS_HTTPX = importlib.util.find_spec('httpx') is not None
+HAS_AIOHTTP = importlib.util.find_spec('aiohttp') is not None
+
+
+class RecordingTransport(Transport):
+    """Transport answering every request with one canned response"""
+
+    def __init__(self, response):
+        self.headers = {}
+        self.response = response
+        self.calls = []
+
+    def request(self, method, url, headers=None, data=None, timeout=None, allow_redirects=True):
+        self.calls.append((method, url, allow_redirects))
+        return self.response
+
+
+class TestTransportResponse(unittest.TestCase):
+    """Test cases for TransportResponse"""
+    
+    def test_raise_for_status_raises_requests_error(self):
+        """Test HTTP errors surface as requests.HTTPError carrying the response"""
+        response = TransportResponse(503, {}, b'', 'http://stub/course', 'Service Unavailable')
+        
+        with self.assertRaises(requests.HTTPError) as context:
+            response.raise_for_status()
+        self.assertEqual(failure_cause(context.exception), 'http_503')
+        self.assertFalse(response.ok)
+    
+    def test_redirect_and_json(self):
+        """Test redirect detection and JSON decoding match requests"""
+        redirect = TransportResponse(302, {'Location': '/irs/login'}, b'', 'http://stub/rollcall')
+        body = TransportResponse(200, {'Content-Type': 'application/json'}, b'{"status": true}', 'http://stub/')
+        
+        self.assertTrue(redirect.is_redirect)
+        self.assertFalse(body.is_redirect)
+        self.assertEqual(body.json(), {'status': True})
+        self.assertEqual(body.headers['content-type'], 'application/json')
+
+
+class TestCreateTransport(unittest.TestCase):
+    """Test cases for create_transport"""
+    
+    def test_requests_is_a_pooled_session(self):
+        """Test the default transport is a requests session with the requested pool size"""
+        session = create_transport('requests', pool_size=25)
+        
+        self.assertIsInstance(session, requests.Session)
+        self.assertEqual(session.get_adapter('http://stub/')._pool_maxsize, 25)
+    
+    def test_missing_client_falls_back_to_requests(self):
+        """Test asking for an uninstalled client falls back to requests"""
+        with patch.dict(sys.modules, {'httpx': None, 'aiohttp': None}):
+            for name in ('httpx', 'aiohttp'):
+                with self.assertLogs('transport', 'WARNING'):
+                    self.assertIsInstance(create_transport(name), requests.Session)
+    
+    def test_unknown_transport(self):
+        """Test unknown transport names are rejected"""
+        with self.assertRaises(ValueError):
+            create_transport('pycurl')
+    
+    def test_services_use_transport_interface(self):
+        """Test the services only rely on the Transport interface"""
+        transport = RecordingTransport(TransportResponse(302, {'Location': '/irs/login'}, b'', 'http://stub/'))
+        auth_service = AuthService('http://stub', transport=transport)
+        
+        self.assertFalse(auth_service.check_session('http://stub/student5/irs/rollcall/1'))
+        self.assertEqual(transport.calls, [('HEAD', 'http://stub/student5/irs/rollcall/1', False)])
+        self.assertIs(CourseService(auth_service.session).session, transport)
+
+
+class TransportFlowMixin:
+    """Full check-in flow against the stub server through one transport"""
+    
+    transport_name = 'requests'
+    
+    def make_transport(self):
+        transport = create_transport(self.transport_name)
+        self.addCleanup(transport.close)
+        return transport
+    
+    def start_stub(self, profile=None):
+        stub = StubZuvioServer(make_courses(2), profile, seed=0).start()
+        self.addCleanup(stub.stop)
+        return stub
+    
+    def test_full_checkin_flow(self):
+        """Test login, course list, rollcall detection and check-in"""
+        stub = self.start_stub()
+        rollcall = stub.schedule_rollcall('100000', opens_in=0, duration=60)
+        auth_service = AuthService(stub.base_url, timeout=2, transport=self.make_transport())
+        course_service = CourseService(auth_service.session, base_url=stub.base_url, timeout=2)
+        
+        auth_token = auth_service.login(UserCredentials("test@example.com", "password123"))
+        courses = course_service.get_courses(auth_token)
+        rollcall_id = course_service.check_rollcall_availability('100000')
+        success, _ = course_service.perform_checkin(auth_token, rollcall_id, Location('22.1', '120.3'))
+        
+        self.assertEqual(len(courses), 2)
+        self.assertEqual(rollcall_id, rollcall.rollcall_id)
+        self.assertTrue(success)
+        self.assertTrue(auth_service.check_session(f"{stub.base_url}/student5/irs/rollcall/100000"))
+    
+    def test_truncated_body_raises_request_exception(self):
+        """Test a truncated body surfaces as a requests exception"""
+        stub = self.start_stub(FaultProfile("truncated", truncate_rate=1.0))
+        transport = self.make_transport()
+        
+        with self.assertRaises(requests.RequestException):
+            transport.get(f"{stub.base_url}/student5/irs/rollcall/100000", timeout=2)
+
+
+class TestRequestsTransport(TransportFlowMixin, unittest.TestCase):
+    """Test cases for the requests transport"""
+    transport_name = 'requests'
+
+
+@unittest.skipUnless(HAS_HTTPX, "httpx is not installed")
+class TestHttpxTransport(TransportFlowMixin, unittest.TestCase):
+    """Test cases for the httpx transport"""
+    transport_name = 'httpx'
+
+
+@unittest.skipUnless(HAS_AIOHTTP, "aiohttp is not installed")
+class TestAiohttpTransport(TransportFlowMixin, unittest.TestCase):
+    """Test cases for the aiohttp transport"""
+    transport_name = 'aiohttp'
+
+
+if __name__ == '__main__':
+    unittest.main()
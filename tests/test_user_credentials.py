@@ -23,7 +23,7 @@ class TestUserCredentials(unittest.TestCase):
             password="password123"
         )
         
-        with patch('main.logger') as mock_logger:
+        with patch('zuvio_api.logger') as mock_logger:
             result = credentials.email
             
             self.assertEqual(result, "test@example.com")
@@ -36,7 +36,7 @@ class TestUserCredentials(unittest.TestCase):
             password="password123"
         )
         
-        with patch('main.logger') as mock_logger:
+        with patch('zuvio_api.logger') as mock_logger:
             result = credentials.email
             
             expected = "12345678@nkust.edu.tw"
@@ -50,7 +50,7 @@ class TestUserCredentials(unittest.TestCase):
             password="password123"
         )
         
-        with patch('main.logger') as mock_logger:
+        with patch('zuvio_api.logger') as mock_logger:
             result = credentials.email
             
             self.assertEqual(result, "student@ntu.edu.tw")
@@ -63,7 +63,7 @@ class TestUserCredentials(unittest.TestCase):
             password="password123"
         )
         
-        with patch('main.logger') as mock_logger:
+        with patch('zuvio_api.logger') as mock_logger:
             result = credentials.email
             
             expected = "@nkust.edu.tw"
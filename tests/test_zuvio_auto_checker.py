@@ -6,10 +6,12 @@ import unittest
 from unittest.mock import patch, MagicMock
 import sys
 import os
+from datetime import datetime
 
 # Add parent directory to path to import main module
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from clock import SimulatedClock
 from main import ZuvioAutoChecker, UserCredentials, AuthToken, Location
 
 
@@ -128,6 +130,154 @@ class TestZuvioAutoChecker(unittest.TestCase):
             self.assertEqual(location.latitude, '22.123')
             self.assertEqual(location.longitude, '120.456')
     
+    def test_apply_config_changes(self):
+        """Test edited course rules re-filter the running list and new schedule settings rebuild the scheduler"""
+        self.checker.course_service = MagicMock()
+        self.checker.course_refresher = MagicMock()
+        self.checker.course_refresher.refresh_once.return_value = ([], [])
+        self.checker.schedule_settings = MagicMock()
+        
+        with patch.object(self.checker, 'create_scheduler') as mock_create:
+            self.checker.apply_config_changes()
+        
+        self.checker.course_service.set_course_filter.assert_called_once_with(
+            self.checker.config_manager.get_course_filter.return_value
+        )
+        self.checker.course_refresher.refresh_once.assert_called_once()
+        self.assertIs(self.checker.scheduler, mock_create.return_value)
+    
+    def test_apply_config_changes_without_refresher(self):
+        """Test edited course rules re-filter the running list when background refresh is off"""
+        self.checker.course_service = MagicMock()
+        self.checker.course_service.get_courses.return_value = [{'course_name': 'Kept', 'course_id': 'course1'}]
+        self.checker.courses = [
+            {'course_name': 'Kept', 'course_id': 'course1'},
+            {'course_name': 'Excluded', 'course_id': 'course2'},
+        ]
+        running = self.checker.courses
+        self.checker.scheduler_configured = True
+        
+        self.checker.apply_config_changes()
+        
+        self.assertIs(self.checker.courses, running)
+        self.assertEqual([course['course_id'] for course in running], ['course1'])
+    
+    def test_apply_config_changes_updates_location(self):
+        """Test an edited location is used for later check-ins without a restart"""
+        self.checker.location = Location('22.1', '120.3')
+        self.checker.pipeline = MagicMock()
+        self.checker.scheduler_configured = True
+        edited = Location('23.0', '121.0')
+        self.checker.config_manager.get_location.return_value = edited
+        
+        self.checker.apply_config_changes()
+        
+        self.assertEqual(self.checker.location, edited)
+        self.assertEqual(self.checker.pipeline.location, edited)
+    
+    def test_relogin_replaces_token(self):
+        """Test a successful re-login replaces the token used by the loop"""
+        new_token = AuthToken(user_id='12345', access_token='fresh')
+        self.checker.auth_service.login.return_value = new_token
+        
+        self.assertTrue(self.checker.relogin())
+        self.assertIs(self.checker.auth_token, new_token)
+        
+        self.checker.auth_service.login.return_value = None
+        self.assertFalse(self.checker.relogin())
+        self.assertIs(self.checker.auth_token, new_token)
+    
+    def test_run_checkin_loop_publishes_events(self):
+        """Test polls and check-ins are published to the event stream"""
+        auth_token = AuthToken(user_id='12345', access_token='abc123')
+        courses = [{'course_name': 'Test Course', 'course_id': 'course1'}]
+        self.checker.course_service = MagicMock()
+        self.checker.course_service.check_rollcall_availability.return_value = 'rollcall123'
+        self.checker.course_service.perform_checkin.return_value = (True, "簽到成功！")
+        self.checker.course_service.last_error = None
+        self.checker.events = MagicMock()
+        
+        def stop_loop(seconds):
+            self.checker.running = False
+        
+        with patch.object(self.checker.clock, 'sleep', side_effect=stop_loop), \
+             patch('builtins.print'):
+            self.checker.run_checkin_loop(auth_token, courses, Location('22.1', '120.3'))
+        
+        events = [call.args[0] for call in self.checker.events.emit.call_args_list]
+        self.assertEqual(events, ['poll_started', 'poll_finished', 'rollcall_detected', 'checkin', 'backoff'])
+    
+    def test_cooldown_backoff_is_published_once(self):
+        """Test a checked-in course is skipped silently in later cycles"""
+        with patch('main.ConfigManager'), \
+             patch('main.AuthService'):
+            checker = ZuvioAutoChecker(clock=SimulatedClock(datetime(2025, 3, 3, 9, 0, 0)))
+        checker.course_service = MagicMock()
+        checker.course_service.check_rollcall_availability.return_value = 'rollcall123'
+        checker.course_service.perform_checkin.return_value = (True, "簽到成功！")
+        checker.course_service.last_error = None
+        checker.events = MagicMock()
+        cycles = []
+        
+        def sleep(seconds):
+            cycles.append(seconds)
+            checker.clock.advance(seconds)
+            if len(cycles) == 10:
+                checker.running = False
+        
+        with patch.object(checker.clock, 'sleep', side_effect=sleep), \
+             patch('builtins.print'):
+            checker.run_checkin_loop(AuthToken(user_id='12345', access_token='abc123'),
+                                     [{'course_name': 'Test Course', 'course_id': 'course1'}],
+                                     Location('22.1', '120.3'))
+        
+        events = [call.args[0] for call in checker.events.emit.call_args_list]
+        self.assertEqual(events.count('backoff'), 1)
+        self.assertEqual(events.count('poll_started'), 1)
+    
+    def test_rejected_checkin_is_attempted_once(self):
+        """Test a failure the server reports is not retried while the rollcall stays open"""
+        with patch('main.ConfigManager'), \
+             patch('main.AuthService'):
+            checker = ZuvioAutoChecker(clock=SimulatedClock(datetime(2025, 3, 3, 9, 0, 0)))
+        checker.course_service = MagicMock()
+        checker.course_service.check_rollcall_availability.return_value = 'rollcall123'
+        checker.course_service.perform_checkin.return_value = (False, "簽到失敗：不在範圍內")
+        checker.course_service.last_checkin_error = 'rejected'
+        checker.course_service.last_error = None
+        notifier = MagicMock()
+        checker.notifiers = [notifier]
+        cycles = []
+        
+        def sleep(seconds):
+            cycles.append(seconds)
+            checker.clock.advance(seconds)
+            if len(cycles) == 100:
+                checker.running = False
+        
+        with patch.object(checker.clock, 'sleep', side_effect=sleep), \
+             patch('builtins.print'):
+            checker.run_checkin_loop(AuthToken(user_id='12345', access_token='abc123'),
+                                     [{'course_name': 'Test Course', 'course_id': 'course1'}],
+                                     Location('22.1', '120.3'))
+        
+        checker.course_service.perform_checkin.assert_called_once()
+        notifier.notify.assert_called_once()
+    
+    def test_emit_forwards_checkins_to_notifiers(self):
+        """Test check-in events reach the notifiers and other events do not"""
+        notifier = MagicMock()
+        self.checker.notifiers = [notifier]
+        
+        self.checker.emit('poll_started', course_id='course1')
+        self.checker.emit('checkin', course_id='course1', course_name='Test Course', rollcall_id='r1',
+                          success=True, message="簽到成功！")
+        
+        notifier.notify.assert_called_once()
+        sent = notifier.notify.call_args.args[0]
+        self.assertEqual(sent['course_name'], 'Test Course')
+        self.assertIn('checked_in_at', sent)
+    
     @patch('builtins.print')
     def test_display_courses(self, mock_print):
         """Test displaying course list"""
@@ -0,0 +1,238 @@
+"""
+Pluggable HTTP transports for the Zuvio endpoints
+
+AuthService and CourseService only call get/post/head on their session
+and set default headers, the subset of requests.Session described by
+Transport. `requests` is used as-is; `httpx` (optionally over HTTP/2)
+and `aiohttp` are adapted to it, with their responses wrapped to look
+like requests responses and their errors translated to requests
+exceptions so callers keep one error-handling path. Like a requests
+session, every transport runs its `hooks['response']` callbacks on each
+response, which is how BandwidthMeter counts their traffic. Neither
+client is a hard dependency: create_transport() logs a warning and
+returns a requests session when the requested client is missing.
+"""
+
+import asyncio
+import importlib
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Mapping, MutableMapping, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+TRANSPORTS = ('requests', 'httpx', 'aiohttp')
+
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+
+class TransportResponse:
+    """requests-like view of a response received by another HTTP client"""
+
+    def __init__(self, status_code: int, headers: Mapping[str, str], content: bytes, url: str,
+                 reason: str = '', wire_bytes: Optional[int] = None):
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.url = url
+        self.reason = reason
+        # Body bytes received before decompression, when the client reports them
+        self.wire_bytes = wire_bytes
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def is_redirect(self) -> bool:
+        return 'location' in self.headers and self.status_code in REDIRECT_STATUSES
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if 400 <= self.status_code < 600:
+            kind = "Client" if self.status_code < 500 else "Server"
+            raise requests.HTTPError(
+                f"{self.status_code} {kind} Error: {self.reason} for url: {self.url}", response=self
+            )
+
+
+class Transport:
+    """The HTTP client interface the services use
+
+    Subclasses implement request(); `allow_redirects` follows the
+    requests defaults (on for GET/POST, off for HEAD).
+    """
+
+    headers: MutableMapping[str, str]
+
+    def __init__(self):
+        self.headers = {}
+        self.hooks: Dict[str, List[Callable[[TransportResponse], Any]]] = {'response': []}
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                data: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None,
+                allow_redirects: bool = True) -> TransportResponse:
+        raise NotImplementedError
+
+    def get(self, url: str, **kwargs) -> TransportResponse:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, data: Optional[Dict[str, Any]] = None, **kwargs) -> TransportResponse:
+        return self.request('POST', url, data=data, **kwargs)
+
+    def head(self, url: str, **kwargs) -> TransportResponse:
+        kwargs.setdefault('allow_redirects', False)
+        return self.request('HEAD', url, **kwargs)
+
+    def close(self) -> None:
+        pass
+
+    def _dispatch(self, response: TransportResponse) -> TransportResponse:
+        for hook in self.hooks['response']:
+            hook(response)
+        return response
+
+
+class HttpxTransport(Transport):
+    """Transport over an httpx.Client, optionally negotiating HTTP/2
+
+    HTTP/2 multiplexes concurrent requests over one connection; it needs
+    the `h2` package and a TLS server, and quietly stays on HTTP/1.1
+    otherwise.
+    """
+
+    def __init__(self, pool_size: int = 10, http2: bool = False):
+        super().__init__()
+        self._httpx = importlib.import_module('httpx')
+        limits = self._httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        try:
+            self.client = self._httpx.Client(http2=http2, limits=limits)
+        except ImportError:
+            logger.warning("未安裝 h2，httpx 改用 HTTP/1.1")
+            self.client = self._httpx.Client(limits=limits)
+        self.headers = self.client.headers
+
+    def request(self, method, url, headers=None, data=None, timeout=None, allow_redirects=True):
+        httpx = self._httpx
+        try:
+            response = self.client.request(
+                method, url, headers=headers, data=data, follow_redirects=allow_redirects,
+                timeout=httpx.USE_CLIENT_DEFAULT if timeout is None else timeout
+            )
+        except httpx.ConnectTimeout as e:
+            raise requests.ConnectTimeout(str(e)) from e
+        except httpx.TimeoutException as e:
+            raise requests.ReadTimeout(str(e)) from e
+        except httpx.RemoteProtocolError as e:
+            # e.g. the body ended early, which requests reports the same way
+            raise requests.exceptions.ChunkedEncodingError(str(e)) from e
+        except httpx.NetworkError as e:
+            raise requests.ConnectionError(str(e)) from e
+        except httpx.HTTPError as e:
+            raise requests.RequestException(str(e)) from e
+        return self._dispatch(TransportResponse(
+            response.status_code, response.headers, response.content, str(response.url), response.reason_phrase,
+            wire_bytes=response.num_bytes_downloaded
+        ))
+
+    def close(self) -> None:
+        self.client.close()
+
+
+class AiohttpTransport(Transport):
+    """Transport over an aiohttp.ClientSession running on a private event loop
+
+    Calls block the calling thread until the response body is read, so
+    the services can use it from any number of threads.
+    """
+
+    def __init__(self, pool_size: int = 10):
+        super().__init__()
+        self._aiohttp = importlib.import_module('aiohttp')
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="aiohttp-transport", daemon=True)
+        self._thread.start()
+        self._session = self._call(self._open_session(pool_size))
+
+    async def _open_session(self, pool_size: int):
+        aiohttp = self._aiohttp
+        # Accept cookies from IP-address hosts too (e.g. the local stub server)
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=pool_size), cookie_jar=aiohttp.CookieJar(unsafe=True)
+        )
+
+    def _call(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    async def _request(self, method, url, headers, data, timeout, allow_redirects):
+        aiohttp = self._aiohttp
+        client_timeout = aiohttp.ClientTimeout(sock_connect=timeout, sock_read=timeout)
+        async with self._session.request(
+            method, url, headers={**self.headers, **(headers or {})}, data=data,
+            timeout=client_timeout, allow_redirects=allow_redirects
+        ) as response:
+            content = await response.read()
+            # aiohttp only exposes the decoded body; Content-Length gives the wire size when sent
+            length = response.headers.get('Content-Length', '')
+            return TransportResponse(response.status, response.headers, content, str(response.url),
+                                     response.reason or '', int(length) if length.isdigit() else None)
+
+    def request(self, method, url, headers=None, data=None, timeout=None, allow_redirects=True):
+        aiohttp = self._aiohttp
+        try:
+            response = self._call(self._request(method, url, headers, data, timeout, allow_redirects))
+        except asyncio.TimeoutError as e:
+            raise requests.Timeout(str(e) or "Request timed out") from e
+        except aiohttp.ClientPayloadError as e:
+            raise requests.exceptions.ChunkedEncodingError(str(e)) from e
+        except aiohttp.ClientConnectionError as e:
+            raise requests.ConnectionError(str(e)) from e
+        except aiohttp.ClientError as e:
+            raise requests.RequestException(str(e)) from e
+        return self._dispatch(response)
+
+    def close(self) -> None:
+        if self._loop.is_closed():
+            return
+        self._call(self._session.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+def requests_session(pool_size: int = 10) -> requests.Session:
+    """Create a requests session whose connection pool holds `pool_size` connections"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def create_transport(name: str = 'requests', pool_size: int = 10, http2: bool = False):
+    """Create a transport by name
+
+    'requests' returns a plain requests.Session, which already provides
+    the Transport interface.
+    """
+    if name not in TRANSPORTS:
+        raise ValueError(f"Unknown transport: {name}")
+    try:
+        if name == 'httpx':
+            return HttpxTransport(pool_size, http2)
+        if name == 'aiohttp':
+            return AiohttpTransport(pool_size)
+    except ImportError:
+        logger.warning(f"未安裝 {name}，改用 requests")
+    return requests_session(pool_size)
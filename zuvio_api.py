@@ -0,0 +1,322 @@
+"""
+Zuvio service layer
+
+Login, course listing and check-in against the Zuvio endpoints, shared by
+the interactive program (main) and the embeddable client (client).
+"""
+
+import json
+import logging
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+from bs4 import BeautifulSoup
+from bandwidth import accept_encoding
+from course_rules import CourseFilter
+from courses import Course, decode_json
+from metrics import Metrics
+from transport import create_transport
+
+logger = logging.getLogger(__name__)
+
+ZUVIO_BASE_URL = "https://irs.zuvio.com.tw"
+# Seconds to wait for the server before giving up on a request
+REQUEST_TIMEOUT = 10.0
+
+
+@dataclass
+class UserCredentials:
+    """User credentials data class"""
+    account: str
+    password: str
+    
+    @property
+    def email(self) -> str:
+        """Get complete email address"""
+        if '@' not in self.account:
+            email = f"{self.account}@nkust.edu.tw"
+            logger.info(f"Auto-appended default domain: {email}")
+            return email
+        logger.info(f"使用完整 mail：{self.account}")
+        return self.account
+
+
+@dataclass
+class Location:
+    """Location information data class"""
+    latitude: str
+    longitude: str
+
+
+@dataclass
+class AuthToken:
+    """Authentication token data class"""
+    user_id: str
+    access_token: str
+
+
+def failure_cause(error: Exception) -> str:
+    """Classify a request failure for run-history accounting"""
+    if isinstance(error, requests.Timeout):
+        return "timeout"
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return f"http_{error.response.status_code}"
+    if isinstance(error, requests.ConnectionError):
+        return "connection"
+    if isinstance(error, requests.RequestException):
+        return "request"
+    return type(error).__name__
+
+
+class AuthService:
+    """Authentication service class"""
+    
+    def __init__(self, base_url: str = ZUVIO_BASE_URL, timeout: float = REQUEST_TIMEOUT, transport=None):
+        # A requests.Session or another transport.Transport; CourseService shares it
+        self.session = transport if transport is not None else create_transport()
+        # Negotiate compression on every request (brotli when a decoder is installed)
+        self.session.headers['Accept-Encoding'] = accept_encoding()
+        self.login_url = f"{base_url}/irs/submitLogin"
+        self.timeout = timeout
+    
+    def login(self, credentials: UserCredentials) -> Optional[AuthToken]:
+        """Perform login"""
+        try:
+            data = {
+                'email': credentials.email,
+                'password': credentials.password,
+                'current_language': "zh-TW"
+            }
+            
+            logger.info("嘗試登入...")
+            response = self.session.post(self.login_url, data=data, timeout=self.timeout)
+            response.raise_for_status()
+            
+            return self._extract_tokens(response.content)
+            
+        except requests.RequestException as e:
+            logger.error(f"登入請求失敗: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"登入過程中發生錯誤: {e}")
+            return None
+    
+    def check_session(self, url: str) -> Optional[bool]:
+        """Check whether an authenticated page still accepts the session
+        
+        Uses a HEAD request (falling back to GET when the server rejects
+        HEAD); an expired session is redirected to the login page. Returns
+        None when the answer is unknown.
+        """
+        try:
+            response = self.session.head(url, allow_redirects=False, timeout=self.timeout)
+            if response.status_code in (405, 501):
+                response = self.session.get(url, allow_redirects=False, timeout=self.timeout)
+        except requests.RequestException as e:
+            logger.warning(f"檢查登入狀態請求失敗: {e}")
+            return None
+        
+        if response.is_redirect or response.status_code in (401, 403):
+            return False
+        if response.status_code >= 500:
+            return None
+        return response.ok
+    
+    def _extract_tokens(self, html_content: bytes) -> Optional[AuthToken]:
+        """Extract authentication tokens from HTML response"""
+        try:
+            soup = BeautifulSoup(html_content, 'html.parser')
+            scripts = soup.find_all("script", string=re.compile('var accessToken = "(.*?)";'))
+            
+            if not scripts:
+                logger.error("無法找到認證Token")
+                return None
+            
+            script_content = str(scripts[0])
+            user_id = script_content.split('var user_id = ')[1].split(";")[0].strip('"')
+            access_token = script_content.split('var accessToken = "')[1].split("\";")[0]
+            
+            logger.info("成功取得認證Token")
+            return AuthToken(user_id=user_id, access_token=access_token)
+            
+        except Exception as e:
+            logger.error(f"提取認證Token失敗: {e}")
+            return None
+
+
+class CourseService:
+    """Course management service class"""
+    
+    def __init__(self, session: requests.Session, course_filter: Optional[CourseFilter] = None,
+                 base_url: str = ZUVIO_BASE_URL, timeout: float = REQUEST_TIMEOUT,
+                 json_loads: Optional[Callable[[bytes], object]] = None, metrics: Optional[Metrics] = None):
+        self.session = session
+        self.base_url = base_url
+        self.timeout = timeout
+        self.course_filter = course_filter or CourseFilter.from_text()
+        # Decoder for course list bodies; orjson when installed
+        self.json_loads = json_loads or decode_json
+        # Request counts and network/parse timers for the status line
+        self.metrics = metrics or Metrics()
+        self.signed_courses: set = set()
+        # Validators and result of the last course-list fetch for conditional requests
+        self._courses_etag: Optional[str] = None
+        self._courses_last_modified: Optional[str] = None
+        self._cached_courses: Optional[List[Course]] = None
+        # Cause of the last failed rollcall check, None after a successful check
+        self.last_error: Optional[str] = None
+        # Cause of the last failed check-in ('rejected' when the server refused it), None after a success
+        self.last_checkin_error: Optional[str] = None
+    
+    def set_course_filter(self, course_filter: CourseFilter) -> None:
+        """Replace the course rules and drop the course list cached under the old ones"""
+        self.course_filter = course_filter
+        self._courses_etag = None
+        self._courses_last_modified = None
+        self._cached_courses = None
+    
+    def snapshot_state(self) -> Dict:
+        """Get the conditional-fetch cache, tagged with the rules it was filtered by"""
+        if self._cached_courses is None:
+            return {}
+        return {
+            'etag': self._courses_etag,
+            'last_modified': self._courses_last_modified,
+            'courses': [course.to_dict() for course in self._cached_courses],
+            'filter': self.course_filter.fingerprint(),
+        }
+    
+    def restore_state(self, state: Dict) -> None:
+        """Restore the conditional-fetch cache unless the course rules have changed"""
+        if not state or state.get('filter') != self.course_filter.fingerprint():
+            return
+        self._cached_courses = [Course.from_dict(course) for course in state['courses']]
+        self._courses_etag = state.get('etag')
+        self._courses_last_modified = state.get('last_modified')
+    
+    def get_courses(self, auth_token: AuthToken) -> Optional[List[Course]]:
+        """Get course list"""
+        try:
+            url = f"{self.base_url}/course/listStudentCurrentCourses?user_id={auth_token.user_id}&accessToken={auth_token.access_token}"
+            
+            headers = {}
+            if self._cached_courses is not None:
+                if self._courses_etag:
+                    headers['If-None-Match'] = self._courses_etag
+                if self._courses_last_modified:
+                    headers['If-Modified-Since'] = self._courses_last_modified
+            
+            self.metrics.inc('http.requests')
+            with self.metrics.timed('time.network'):
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            if response.status_code == 304 and self._cached_courses is not None:
+                self.metrics.inc('courses.cache_hits')
+                return list(self._cached_courses)
+            response.raise_for_status()
+            self.metrics.inc('courses.cache_misses')
+            
+            course_data = self.json_loads(response.content)
+            
+            if not course_data.get('status'):
+                logger.error("取得課程資料失敗")
+                return None
+            
+            courses = [Course.from_dict(course) for course in course_data.get('courses', [])]
+            # Apply include/exclude rules (Zuvio official activities are excluded by default)
+            valid_courses = self.course_filter.apply(courses)
+            
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            self._courses_etag = etag if isinstance(etag, str) else None
+            self._courses_last_modified = last_modified if isinstance(last_modified, str) else None
+            self._cached_courses = valid_courses
+            
+            logger.info(f"成功取得 {len(valid_courses)} 門課程")
+            return list(valid_courses)
+            
+        except requests.RequestException as e:
+            logger.error(f"取得課程資料請求失敗: {e}")
+            return None
+        except (json.JSONDecodeError, KeyError) as e:
+            logger.error(f"解析課程資料失敗: {e}")
+            return None
+    
+    def fetch_rollcall_page(self, course_id: str) -> bytes:
+        """Download the rollcall page of a course"""
+        url = f"{self.base_url}/student5/irs/rollcall/{course_id}"
+        
+        self.metrics.inc('http.requests')
+        with self.metrics.timed('time.network'):
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            return response.content
+    
+    @staticmethod
+    def extract_rollcall_id(content: bytes) -> Optional[str]:
+        """Find the open rollcall ID in a rollcall page"""
+        soup = BeautifulSoup(content, 'html.parser')
+        scripts = soup.find_all("script", string=re.compile("var rollcall_id = '(.*?)';"))
+        
+        if not scripts:
+            return None
+        
+        script_content = str(scripts[0])
+        rollcall_id = script_content.split("var rollcall_id = '")[1].split("';")[0]
+        
+        return rollcall_id if rollcall_id else None
+    
+    def check_rollcall_availability(self, course_id: str) -> Optional[str]:
+        """Check if course has rollcall available"""
+        self.last_error = None
+        try:
+            content = self.fetch_rollcall_page(course_id)
+            with self.metrics.timed('time.parse'):
+                return self.extract_rollcall_id(content)
+        except Exception as e:
+            self.last_error = failure_cause(e)
+            logger.error(f"檢查簽到可用性失敗 (課程ID: {course_id}): {e}")
+            return None
+    
+    def perform_checkin(self, auth_token: AuthToken, rollcall_id: str, location: Location) -> Tuple[bool, str]:
+        """Perform check-in"""
+        try:
+            url = f"{self.base_url}/app_v2/makeRollcall"
+            
+            data = {
+                'user_id': auth_token.user_id,
+                'accessToken': auth_token.access_token,
+                'rollcall_id': rollcall_id,
+                'device': 'WEB',
+                'lat': location.latitude,
+                'lng': location.longitude
+            }
+            
+            self.metrics.inc('http.requests')
+            with self.metrics.timed('time.network'):
+                response = self.session.post(url, data=data, timeout=self.timeout)
+            response.raise_for_status()
+            
+            result = response.json()
+            if not isinstance(result, dict):
+                raise json.JSONDecodeError("Expected a JSON object", response.text, 0)
+            
+            if result.get('status'):
+                logger.info(f"簽到成功 (Rollcall ID: {rollcall_id})")
+                self.last_checkin_error = None
+                return True, "簽到成功！"
+            else:
+                error_msg = result.get('msg', '未知錯誤')
+                logger.warning(f"簽到失敗: {error_msg}")
+                self.last_checkin_error = 'rejected'
+                return False, f"簽到失敗：{error_msg}"
+                
+        except requests.RequestException as e:
+            logger.error(f"簽到請求失敗: {e}")
+            self.last_checkin_error = failure_cause(e)
+            return False, f"簽到請求失敗：{e}"
+        except json.JSONDecodeError as e:
+            logger.error(f"解析簽到回應失敗: {e}")
+            self.last_checkin_error = 'invalid_response'
+            return False, f"解析簽到回應失敗：{e}"